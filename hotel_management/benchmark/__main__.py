@@ -0,0 +1,50 @@
+"""
+Нагрузочные замеры на синтетической БД (BENCHMARK_CONFIG['database']):
+    python -m hotel_management.benchmark generate --scale large
+    python -m hotel_management.benchmark run --save-baseline
+    python -m hotel_management.benchmark run
+"""
+import argparse
+import sys
+from datetime import date
+from hotel_management.config import BENCHMARK_CONFIG
+from hotel_management.benchmark.generator import HotelDataGenerator, use_benchmark_database
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m hotel_management.benchmark')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="пересоздать БД замеров и заполнить ее")
+    generate.add_argument('--scale', default='small', choices=sorted(BENCHMARK_CONFIG['scales']))
+    generate.add_argument('--seed', type=int, default=BENCHMARK_CONFIG['seed'])
+    generate.add_argument('--anchor', type=date.fromisoformat, help="опорная дата ГГГГ-ММ-ДД")
+
+    run = commands.add_parser('run', help="выполнить замеры и сравнить с эталоном")
+    run.add_argument('--only', help="только замеры, имя которых содержит строку")
+    run.add_argument('--repeat', type=int, default=BENCHMARK_CONFIG['repeat'])
+    run.add_argument('--warmup', type=int, default=BENCHMARK_CONFIG['warmup'])
+    run.add_argument('--baseline', default=BENCHMARK_CONFIG['baseline_file'])
+    run.add_argument('--save-baseline', action='store_true', help="сохранить результаты как эталон")
+    run.add_argument('--scale', help="масштаб данных (записывается в эталон)")
+
+    args = parser.parse_args()
+    use_benchmark_database()
+
+    if args.command == 'generate':
+        HotelDataGenerator(args.scale, args.seed, args.anchor).generate()
+        return 0
+
+    # Модули замеров загружают модели приложения - нужны только для run
+    from hotel_management.benchmark.runner import BenchmarkRunner, format_report, load_baseline, save_baseline
+    results = BenchmarkRunner().run(args.only, args.warmup, args.repeat)
+    report, regressions = format_report(results, None if args.save_baseline else load_baseline(args.baseline))
+    print(report)
+    if args.save_baseline:
+        print(f"Эталон сохранен: {save_baseline(results, args.baseline, args.scale)}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import psycopg2
+from hotel_management.config import DB_CONFIG, BENCHMARK_CONFIG
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.migrations import migrator
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+TRIGGERS_FILE = BENCHMARK_DIR.parent / 'database' / 'triggers.sql'
+
+STATUSES = ((1, 'Свободен'), (2, 'Требует уборки'), (3, 'Занят'))
+CATEGORIES = ((1, 'Стандарт'), (2, 'Улучшенный'), (3, 'Полулюкс'), (4, 'Люкс'))
+ROLES = ((1, 'Администратор'), (2, 'Менеджер'), (3, 'Горничная'), (4, 'Портье'))
+SERVICES = (('Завтрак', 800), ('Трансфер', 2500), ('Прачечная', 600), ('SPA', 4000))
+
+SURNAMES = ('Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов',
+            'Новиков', 'Федоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семенов', 'Егоров',
+            'Павлов', 'Козлов', 'Степанов', 'Николаев', 'Орлов', 'Андреев', 'Макаров', 'Никитин',
+            'Захаров', 'Зайцев', 'Соловьев', 'Борисов', 'Яковлев', 'Григорьев', 'Романов', 'Воробьев')
+MALE_NAMES = ('Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Артем', 'Илья',
+              'Кирилл', 'Михаил', 'Никита', 'Матвей', 'Роман', 'Егор', 'Иван', 'Павел')
+FEMALE_NAMES = ('Анастасия', 'Мария', 'Анна', 'Виктория', 'Екатерина', 'Наталья', 'Марина', 'Полина',
+                'Дарья', 'Алина', 'Ксения', 'Елена', 'Ольга', 'Татьяна', 'Ирина', 'Юлия')
+PATRONYMICS = ('Александров', 'Дмитриев', 'Сергеев', 'Андреев', 'Алексеев', 'Михайлов', 'Иванов',
+               'Павлов', 'Николаев', 'Владимиров', 'Викторов', 'Петров')
+
+# Комнат на этаже: номер комнаты - этаж * 100 + порядковый номер
+ROOMS_PER_FLOOR = 50
+# Наибольшая длительность проживания и пауза между проживаниями в номере, дней
+MAX_STAY_NIGHTS = 7
+MAX_GAP_DAYS = 2
+# Горизонт будущих бронирований, дней
+FUTURE_DAYS = 60
+CANCELLED_SHARE = 0.05
+
+# Имя рабочей БД до переключения на БД замеров: ее генератор никогда не удаляет
+PRODUCTION_DATABASE = DB_CONFIG['dbname']
+
+
+def use_benchmark_database():
+    """Направляет DatabaseConnector на БД замеров; вызывается до первого обращения к БД"""
+    DB_CONFIG['dbname'] = BENCHMARK_CONFIG['database']
+
+
+class HotelDataGenerator:
+    """
+    Синтетический отель для нагрузочных замеров.
+    Данные детерминированы: одинаковые seed, масштаб и опорная дата дают
+    одинаковые строки. Таблицы загружаются через COPY без индексов и
+    триггеров, затем применяются database/triggers.sql и миграции - так
+    начальное заполнение сводок и построение индексов выполняются одним
+    проходом, как при переносе рабочей базы.
+    """
+
+    def __init__(self, scale='small', seed=None, anchor=None):
+        """
+        :param scale: Ключ BENCHMARK_CONFIG['scales'] или словарь с теми же полями
+        :param seed: Начальное значение генератора случайных чисел
+        :param anchor: Опорная дата ("сегодня" для статусов броней), по умолчанию текущая
+        """
+        self.sizes = BENCHMARK_CONFIG['scales'][scale] if isinstance(scale, str) else scale
+        self.seed = BENCHMARK_CONFIG['seed'] if seed is None else seed
+        self.anchor = anchor or date.today()
+        self.room_ids = [
+            (index // ROOMS_PER_FLOOR + 1) * 100 + index % ROOMS_PER_FLOOR + 1
+            for index in range(self.sizes['rooms'])
+        ]
+        # Комнаты, ожидающие уборки, выбираются заранее: от этого зависит их статус
+        self.pending_rooms = set(self._random('pending').sample(self.room_ids, len(self.room_ids) // 20))
+
+    def _random(self, stream):
+        """Отдельный поток случайных чисел на каждую таблицу: таблицы не зависят друг от друга"""
+        return random.Random(f"{self.seed}:{stream}")
+
+    def generate(self, log=print):
+        """Пересоздает БД замеров и заполняет ее"""
+        if DB_CONFIG['dbname'] != BENCHMARK_CONFIG['database']:
+            raise RuntimeError("Сначала вызовите use_benchmark_database()")
+        self.recreate_database()
+        self.run_script((BENCHMARK_DIR / 'schema.sql').read_text(encoding='utf-8'))
+        db = DatabaseConnector()
+
+        log("Справочники...")
+        db.execute_many("INSERT INTO statuses (status_id, name) VALUES %s", STATUSES)
+        db.execute_many("INSERT INTO room_categories (category_id, name) VALUES %s", CATEGORIES)
+        db.execute_many("INSERT INTO roles (role_id, name) VALUES %s", ROLES)
+        db.execute_many("INSERT INTO services (name, price) VALUES %s", SERVICES)
+
+        for table, columns, rows in (
+            ('rooms', ('room_id', 'floor', 'category_id', 'status_id'), self.rooms()),
+            ('guests', ('guest_id', 'full_name', 'phone_number', 'age'), self.guests()),
+            ('occupancy', ('occupancy_id', 'guest_id', 'room_id', 'check_in_date', 'check_out_date', 'status'),
+             self.occupancy()),
+            ('cleaning', ('cleaning_id', 'room_id', 'status_id', 'staff_id', 'cleaning_date', 'completed',
+                          'requested_at', 'cleaned_at'), self.cleaning()),
+        ):
+            log(f"{table}...")
+            if db.copy_in(table, columns, rows) is None:
+                raise RuntimeError(f"Не удалось загрузить {table}")
+
+        log("Пользователи...")
+        db.execute_query("""
+            INSERT INTO app_users (username, password_hash, role_id)
+            SELECT 'user' || lpad(n::text, 4, '0'), crypt(%s, gen_salt('bf')), (n - 1) %% 4 + 1
+            FROM generate_series(1, %s) AS n
+        """, (BENCHMARK_CONFIG['user_password'], self.sizes['users']))
+
+        log("Последовательности, триггеры и индексы...")
+        self.run_script("""
+            SELECT setval('guests_guest_id_seq', (SELECT MAX(guest_id) FROM guests));
+            SELECT setval('occupancy_occupancy_id_seq', (SELECT MAX(occupancy_id) FROM occupancy));
+            SELECT setval('cleaning_cleaning_id_seq', (SELECT MAX(cleaning_id) FROM cleaning));
+            UPDATE rooms SET status_id = 3
+            WHERE room_id IN (SELECT room_id FROM occupancy WHERE status = 'checked_in');
+        """)
+        self.run_script(TRIGGERS_FILE.read_text(encoding='utf-8'))
+        migrator.migrate()
+        self.run_script("VACUUM ANALYZE")
+        log("Готово")
+
+    def recreate_database(self):
+        """Удаляет и заново создает БД замеров (рабочая БД защищена от удаления)"""
+        database = BENCHMARK_CONFIG['database']
+        if database == PRODUCTION_DATABASE:
+            raise RuntimeError("БД замеров совпадает с рабочей БД - измените BENCHMARK_CONFIG['database']")
+        connection = psycopg2.connect(**{**DB_CONFIG, 'dbname': 'postgres'})
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP DATABASE IF EXISTS "{database}"')
+                cursor.execute(f'CREATE DATABASE "{database}"')
+        finally:
+            connection.close()
+
+    def run_script(self, script):
+        """Выполняет SQL-скрипт в БД замеров вне транзакции (скрипты сами управляют транзакциями)"""
+        connection = psycopg2.connect(**{**DB_CONFIG, 'dbname': BENCHMARK_CONFIG['database']})
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(script)
+        finally:
+            connection.close()
+
+    def guests(self):
+        rng = self._random('guests')
+        for guest_id in range(1, self.sizes['guests'] + 1):
+            surname = rng.choice(SURNAMES)
+            if rng.random() < 0.5:
+                full_name = f"{surname} {rng.choice(MALE_NAMES)} {rng.choice(PATRONYMICS)}ич"
+            else:
+                full_name = f"{surname}а {rng.choice(FEMALE_NAMES)} {rng.choice(PATRONYMICS)}на"
+            phone_number = f"+7{rng.randrange(900, 1000)}{rng.randrange(10 ** 7):07d}"
+            yield guest_id, full_name, phone_number, rng.randint(18, 85)
+
+    def occupancy(self):
+        """
+        Проживания каждого номера идут друг за другом без пересечений и
+        заканчиваются примерно через FUTURE_DAYS после опорной даты.
+        Статус следует из дат: прошлые - выселены, текущие - заселены,
+        будущие - забронированы; небольшая доля отменена.
+        """
+        rng = self._random('occupancy')
+        per_room, extra = divmod(self.sizes['occupancy'], len(self.room_ids))
+        average_days = (MAX_STAY_NIGHTS + 1) / 2 + MAX_GAP_DAYS / 2
+        occupancy_id = 0
+        for index, room_id in enumerate(self.room_ids):
+            stays = per_room + (1 if index < extra else 0)
+            day = self.anchor - timedelta(days=int(stays * average_days) - FUTURE_DAYS)
+            for _ in range(stays):
+                day += timedelta(days=rng.randint(0, MAX_GAP_DAYS))
+                check_out = day + timedelta(days=rng.randint(1, MAX_STAY_NIGHTS))
+                if rng.random() < CANCELLED_SHARE:
+                    status = 'cancelled'
+                elif check_out <= self.anchor:
+                    status = 'checked_out'
+                elif day <= self.anchor:
+                    status = 'checked_in'
+                else:
+                    status = 'booked'
+                occupancy_id += 1
+                yield occupancy_id, rng.randint(1, self.sizes['guests']), room_id, day, check_out, status
+                day = check_out
+
+    def rooms(self):
+        """Статус "Занят" выставляется после загрузки броней по текущим проживаниям"""
+        rng = self._random('rooms')
+        for room_id in self.room_ids:
+            status_id = 2 if room_id in self.pending_rooms else 1
+            yield room_id, room_id // 100, rng.choice(CATEGORIES)[0], status_id
+
+    def cleaning(self):
+        """Выполненные уборки за последний год и по одной незавершенной на каждую ожидающую комнату"""
+        rng = self._random('cleaning')
+        start = datetime.combine(self.anchor, datetime.min.time()) - timedelta(days=365)
+        pending = sorted(self.pending_rooms)
+        completed = max(0, self.sizes['cleaning'] - len(pending))
+        for cleaning_id in range(1, completed + 1):
+            requested_at = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            cleaned_at = requested_at + timedelta(minutes=rng.randint(20, 240))
+            yield cleaning_id, rng.choice(self.room_ids), 1, None, cleaned_at, True, requested_at, cleaned_at
+        now = datetime.combine(self.anchor, datetime.min.time())
+        for offset, room_id in enumerate(pending, completed + 1):
+            requested_at = now - timedelta(minutes=rng.randint(5, 600))
+            yield offset, room_id, 2, None, requested_at, False, requested_at, None
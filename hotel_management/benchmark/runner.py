@@ -0,0 +1,302 @@
+import json
+import math
+import random
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from psycopg2 import OperationalError
+from hotel_management.config import BENCHMARK_CONFIG
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.queries import UserQueries
+from hotel_management.database.availability import AvailabilityEngine
+from hotel_management.database.models import User
+from hotel_management.services.booking_service import BookingService
+from hotel_management.utils.auth import AuthManager
+
+# Замер: имя, вид ('query' или 'mutation'), функция (rng) -> число обработанных строк
+Case = namedtuple('Case', ['name', 'kind', 'run'])
+Result = namedtuple('Result', ['name', 'kind', 'runs', 'p50', 'p95', 'p99', 'max', 'rows_per_sec'])
+
+
+def percentile(sorted_values, percent):
+    """Процентиль по рангу (без интерполяции)"""
+    rank = max(1, math.ceil(len(sorted_values) * percent / 100))
+    return sorted_values[rank - 1]
+
+
+def rolled_back(work):
+    """
+    Выполняет work(cursor) и откатывает транзакцию: изменения замеряются,
+    но данные замеров остаются прежними и запуски сравнимы между собой
+    """
+    db = DatabaseConnector()
+    if not db.connect():
+        raise OperationalError("Не удалось подключиться к базе данных")
+    try:
+        with db.connection.cursor() as cursor:
+            return work(cursor)
+    finally:
+        db.connection.rollback()
+        db.disconnect()
+
+
+class BenchmarkRunner:
+    """
+    Замеры рабочих запросов и изменений на БД замеров (см. generator.py).
+    Каждый замер выполняется warmup раз без учета, затем repeat раз с
+    замером времени; результат - распределение задержек и строк в секунду.
+    Сравнение с сохраненным эталоном показывает изменение медианы и p95.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = BENCHMARK_CONFIG['seed'] if seed is None else seed
+        self.samples = {}
+        self.engine = AvailabilityEngine()
+
+    def prepare(self):
+        """Выбирает входные данные замеров из БД (детерминированно при одинаковых данных)"""
+        db = DatabaseConnector()
+        rng = random.Random(f"{self.seed}:runner")
+
+        def ids(query):
+            rows = db.execute_query(query, fetch=True)
+            if rows is None:
+                raise OperationalError("Не удалось прочитать данные замеров")
+            return [row[0] for row in rows]
+
+        self.samples = {
+            'rooms': ids("SELECT room_id FROM rooms ORDER BY room_id"),
+            'guest_names': ids("SELECT full_name FROM guests ORDER BY guest_id LIMIT 1000"),
+            'booked': ids("SELECT occupancy_id FROM occupancy WHERE status = 'booked' "
+                          "ORDER BY occupancy_id LIMIT 1000"),
+            'checked_in': ids("SELECT occupancy_id FROM occupancy WHERE status = 'checked_in' "
+                              "ORDER BY occupancy_id LIMIT 1000"),
+            'pending_rooms': ids("SELECT room_id FROM cleaning WHERE completed = FALSE ORDER BY room_id"),
+            'usernames': ids("SELECT username FROM app_users ORDER BY user_id"),
+        }
+        for values in self.samples.values():
+            rng.shuffle(values)
+        self.samples['max_guest_id'] = ids("SELECT MAX(guest_id) FROM guests")[0]
+        self.engine.load()
+
+    def cases(self):
+        """Рабочие запросы и изменения приложения"""
+        db = DatabaseConnector()
+        samples = self.samples
+        today = date.today()
+        password = BENCHMARK_CONFIG['user_password']
+
+        def prepared(name, params=None):
+            rows = db.execute_prepared(name, params)
+            if rows is None:
+                raise OperationalError(f"Ошибка запроса {name}")
+            return len(rows)
+
+        def name_prefix(rng):
+            return rng.choice(samples['guest_names'])[:3].lower() + '%'
+
+        def stay_period(rng):
+            check_in = today + timedelta(days=rng.randint(0, 60))
+            return check_in, check_in + timedelta(days=rng.randint(1, 7))
+
+        def create_booking(cursor, rng):
+            # Запрос Booking.create; даты далеко в будущем - пересечений нет
+            check_in = today + timedelta(days=3650 + rng.randint(0, 3650))
+            cursor.execute("""
+                INSERT INTO occupancy
+                (guest_id, room_id, check_in_date, check_out_date, status)
+                VALUES (%s, %s, %s, %s, 'booked')
+                RETURNING occupancy_id
+            """, (rng.randint(1, samples['max_guest_id']), rng.choice(samples['rooms']),
+                  check_in, check_in + timedelta(days=2)))
+            return cursor.rowcount
+
+        def set_status(cursor, booking_id, status, current):
+            # Отмена и заселение в списке бронирований
+            cursor.execute("""
+                UPDATE occupancy SET status = %s
+                WHERE occupancy_id = %s AND status = ANY(%s)
+            """, (status, booking_id, list(current)))
+            return cursor.rowcount
+
+        def check_out(cursor, booking_id):
+            # Выселение: бронь закрывается, номер ставится на уборку
+            cursor.execute("""
+                UPDATE occupancy
+                SET status = 'checked_out', check_out_date = GREATEST(check_in_date + 1, CURRENT_DATE)
+                WHERE occupancy_id = %s AND status = 'checked_in'
+                RETURNING room_id
+            """, (booking_id,))
+            room_id = cursor.fetchone()[0]
+            cursor.execute("""
+                INSERT INTO cleaning (room_id, cleaning_date, completed, requested_at)
+                VALUES (%s, NOW(), FALSE, NOW())
+            """, (room_id,))
+            return 2
+
+        def night_audit(cursor):
+            # Ночной аудит: все наступившие выезды парой запросов, а не запросами на каждую бронь
+            return sum(BookingService.apply_night_audit(cursor, today))
+
+        def add_cleaning(cursor, room_id):
+            now = datetime.now()
+            cursor.execute("""
+                INSERT INTO cleaning
+                (cleaning_id, room_id, status_id, staff_id, cleaning_date, completed, requested_at, cleaned_at)
+                VALUES (nextval('cleaning_cleaning_id_seq'), %s, 2, NULL, %s, FALSE, %s, NULL)
+            """, (room_id, now, now))
+            cursor.execute("UPDATE rooms SET status_id = 2 WHERE room_id = %s", (room_id,))
+            return 2
+
+        def mark_cleaned(cursor, room_id):
+            now = datetime.now()
+            cursor.execute("""
+                UPDATE cleaning
+                SET status_id = 1, cleaning_date = %s, completed = TRUE, cleaned_at = %s
+                WHERE room_id = %s AND completed = FALSE
+            """, (now, now, room_id))
+            updated = cursor.rowcount
+            cursor.execute("UPDATE rooms SET status_id = 1 WHERE room_id = %s", (room_id,))
+            return updated + 1
+
+        def authenticate(rng):
+            User.authenticate(rng.choice(samples['usernames']), password)
+            return 1
+
+        def check_locked(rng):
+            AuthManager().is_account_locked(rng.choice(samples['usernames']))
+            return 1
+
+        def failed_login(cursor, username):
+            cursor.execute(
+                "UPDATE app_users SET failed_attempts = failed_attempts + 1 WHERE username = %s", (username,))
+            cursor.execute("SELECT failed_attempts FROM app_users WHERE username = %s", (username,))
+            return len(cursor.fetchall()) + 1
+
+        window = (today, today + timedelta(days=60))
+        year = (date(today.year, 1, 1), date(today.year, 12, 31))
+        cases = [
+            Case('room_get_all', 'query', lambda rng: prepared('room_get_all')),
+            Case('room_get_free', 'query', lambda rng: prepared('room_get_free')),
+            Case('booking_get_active', 'query', lambda rng: prepared('booking_get_active')),
+            Case('booking_get_changed', 'query',
+                 lambda rng: prepared('booking_get_changed', (datetime.now().astimezone() - timedelta(minutes=5),))),
+            Case('booking_get_range (60 дней)', 'query', lambda rng: prepared('booking_get_range', window)),
+            Case('guest_lookup', 'query', lambda rng: prepared('guest_lookup', (name_prefix(rng), 20))),
+            Case('guest_page_first', 'query', lambda rng: prepared('guest_page_first', (200,))),
+            Case('guest_page_next', 'query',
+                 lambda rng: prepared('guest_page_next', (rng.choice(samples['guest_names']), 0, 200))),
+            Case('guest_search_first', 'query',
+                 lambda rng: prepared('guest_search_first', ('%' + name_prefix(rng), 200))),
+            Case('cleaning_get_pending', 'query', lambda rng: prepared('cleaning_get_pending')),
+            Case('report_daily (год)', 'query', lambda rng: prepared('report_daily', year)),
+            Case('user_get_all', 'query', lambda rng: len(db.execute_query(UserQueries.GET_ALL, fetch=True))),
+            Case('User.authenticate', 'query', authenticate),
+            Case('AuthManager.is_account_locked', 'query', check_locked),
+            Case('availability.load', 'query', lambda rng: int(AvailabilityEngine().load())),
+            Case('availability.free_rooms', 'query', lambda rng: len(self.engine.free_rooms(*stay_period(rng)))),
+            Case('booking_create', 'mutation', lambda rng: rolled_back(lambda cursor: create_booking(cursor, rng))),
+        ]
+        if samples['booked']:
+            cases.append(Case('booking_cancel', 'mutation', lambda rng: rolled_back(
+                lambda cursor: set_status(cursor, rng.choice(samples['booked']), 'cancelled',
+                                          ('booked', 'checked_in')))))
+            cases.append(Case('booking_check_in', 'mutation', lambda rng: rolled_back(
+                lambda cursor: set_status(cursor, rng.choice(samples['booked']), 'checked_in', ('booked',)))))
+        if samples['checked_in']:
+            cases.append(Case('booking_check_out', 'mutation', lambda rng: rolled_back(
+                lambda cursor: check_out(cursor, rng.choice(samples['checked_in'])))))
+        cases.append(Case('booking_night_audit', 'mutation', lambda rng: rolled_back(night_audit)))
+        cases.append(Case('cleaning_add', 'mutation', lambda rng: rolled_back(
+            lambda cursor: add_cleaning(cursor, rng.choice(samples['rooms'])))))
+        if samples['pending_rooms']:
+            cases.append(Case('cleaning_mark_done', 'mutation', lambda rng: rolled_back(
+                lambda cursor: mark_cleaned(cursor, rng.choice(samples['pending_rooms'])))))
+        cases.append(Case('auth_failed_attempt', 'mutation', lambda rng: rolled_back(
+            lambda cursor: failed_login(cursor, rng.choice(samples['usernames'])))))
+        return cases
+
+    def measure(self, case, warmup=None, repeat=None):
+        warmup = BENCHMARK_CONFIG['warmup'] if warmup is None else warmup
+        repeat = BENCHMARK_CONFIG['repeat'] if repeat is None else repeat
+        rng = random.Random(f"{self.seed}:{case.name}")
+        for _ in range(warmup):
+            case.run(rng)
+
+        latencies = []
+        rows = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows += case.run(rng) or 0
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        latencies.sort()
+        total_s = sum(latencies) / 1000
+        return Result(case.name, case.kind, repeat,
+                      round(percentile(latencies, 50), 3), round(percentile(latencies, 95), 3),
+                      round(percentile(latencies, 99), 3), round(latencies[-1], 3),
+                      round(rows / total_s, 1) if total_s else 0.0)
+
+    def run(self, only=None, warmup=None, repeat=None, log=print):
+        """
+        Выполняет замеры
+        :param only: Подстрока имени: выполнить только подходящие замеры
+        :return: Список Result
+        """
+        self.prepare()
+        results = []
+        for case in self.cases():
+            if only and only not in case.name:
+                continue
+            log(f"{case.name}...")
+            results.append(self.measure(case, warmup, repeat))
+        return results
+
+
+def save_baseline(results, path=None, scale=None):
+    """Сохраняет результаты как эталон для последующих сравнений"""
+    path = Path(path or BENCHMARK_CONFIG['baseline_file'])
+    data = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': scale,
+        'results': {result.name: result._asdict() for result in results}
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+
+def load_baseline(path=None):
+    """Эталонные результаты по имени замера (пустой словарь, если эталона нет)"""
+    path = Path(path or BENCHMARK_CONFIG['baseline_file'])
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))['results']
+
+
+def format_report(results, baseline=None):
+    """Таблица результатов; при наличии эталона - изменение медианы и p95 с отметкой регрессий"""
+    baseline = baseline or {}
+    threshold = BENCHMARK_CONFIG['regression_pct']
+    lines = [f"{'Замер':<32} {'Вид':<9} {'p50 мс':>9} {'p95 мс':>9} {'p99 мс':>9} {'max мс':>9} "
+             f"{'строк/с':>11} {'Δp50':>8} {'Δp95':>8}"]
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        delta_p50 = delta_p95 = ""
+        if previous:
+            change_p50 = _change(previous['p50'], result.p50)
+            change_p95 = _change(previous['p95'], result.p95)
+            delta_p50, delta_p95 = f"{change_p50:+.0f}%", f"{change_p95:+.0f}%"
+            if change_p50 > threshold:
+                regressions.append(result.name)
+        lines.append(f"{result.name:<32} {result.kind:<9} {result.p50:>9.2f} {result.p95:>9.2f} "
+                     f"{result.p99:>9.2f} {result.max:>9.2f} {result.rows_per_sec:>11.1f} "
+                     f"{delta_p50:>8} {delta_p95:>8}")
+    if regressions:
+        lines.append(f"Регрессия (медиана выросла больше чем на {threshold}%): {', '.join(regressions)}")
+    return "\n".join(lines), regressions
+
+
+def _change(before, after):
+    return (after - before) / before * 100 if before else 0.0
@@ -0,0 +1,69 @@
+-- Базовые таблицы для синтетической БД замеров в том виде, в каком их использует приложение.
+-- Индексы, триггеры и ограничения добавляются после загрузки данных
+-- (database/triggers.sql и миграции), как на рабочей базе.
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+CREATE TABLE statuses (
+    status_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE room_categories (
+    category_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE roles (
+    role_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    permissions TEXT[]
+);
+
+CREATE TABLE rooms (
+    room_id INTEGER PRIMARY KEY,
+    floor INTEGER NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES room_categories,
+    status_id INTEGER NOT NULL REFERENCES statuses
+);
+
+CREATE TABLE guests (
+    guest_id SERIAL PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    phone_number TEXT,
+    age INTEGER
+);
+
+CREATE TABLE occupancy (
+    occupancy_id SERIAL PRIMARY KEY,
+    guest_id INTEGER NOT NULL REFERENCES guests,
+    room_id INTEGER NOT NULL REFERENCES rooms,
+    check_in_date DATE NOT NULL,
+    check_out_date DATE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'booked'
+);
+
+CREATE TABLE cleaning (
+    cleaning_id SERIAL PRIMARY KEY,
+    room_id INTEGER NOT NULL REFERENCES rooms,
+    status_id INTEGER REFERENCES statuses,
+    staff_id INTEGER,
+    cleaning_date TIMESTAMP,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    requested_at TIMESTAMP,
+    cleaned_at TIMESTAMP
+);
+
+CREATE TABLE app_users (
+    user_id SERIAL PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    role_id INTEGER NOT NULL REFERENCES roles,
+    failed_attempts INTEGER NOT NULL DEFAULT 0,
+    locked_until TIMESTAMP
+);
+
+CREATE TABLE services (
+    service_id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    price NUMERIC(10, 2) NOT NULL
+);
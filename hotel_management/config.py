@@ -1,29 +1,108 @@
-# Конфигурация базы данных
-DB_CONFIG = {
-    'dbname': 'Hotel',
-    'user': 'postgres',
-    'password': '43512',  # Замените на ваш пароль
-    'host': 'localhost',
-    'port': '5432',
-    'connect_timeout': 5
-}
-
-# Настройки безопасности
-SECURITY_CONFIG = {
-    'max_login_attempts': 3,          # Максимальное количество попыток входа
-    'lock_time_minutes': 30,          # Время блокировки в минутах
-    'password_min_length': 8,         # Минимальная длина пароля
-    'password_requirements': {
-        'require_upper': True,        # Требовать заглавные буквы
-        'require_digit': True,        # Требовать цифры
-        'require_special': True       # Требовать спецсимволы
-    }
-}
-
-# Права доступа для ролей
-PERMISSIONS = {
-    'admin': ['all'],                 # Полный доступ
-    'manager': ['manage_bookings', 'manage_guests', 'view_reports'],
-    'maid': ['manage_cleaning'],
-    'receptionist': ['check_in_out', 'view_guests']
-}
\ No newline at end of file
+# Конфигурация базы данных
+DB_CONFIG = {
+    'dbname': 'Hotel',
+    'user': 'postgres',
+    'password': '43512',  # Замените на ваш пароль
+    'host': 'localhost',
+    'port': '5432',
+    'connect_timeout': 5,
+    # TCP keepalive: оборванное соединение обнаруживается за ~1 минуту, а не часы
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3
+}
+
+# Настройки пула соединений
+POOL_CONFIG = {
+    'min_size': 1,                    # Сколько соединений держать открытыми всегда
+    'max_size': 10,                   # Максимум одновременно открытых соединений
+    'max_idle_seconds': 300,          # Простаивающие дольше соединения закрываются
+    'checkout_timeout': 5,            # Время ожидания свободного соединения, сек
+    'health_check_after': 30,         # Проверять соединение, простаивавшее дольше, сек
+    'reconnect_attempts': 5,          # Попыток переподключения к серверу
+    'reconnect_backoff': 0.2,         # Начальная пауза между попытками, сек
+    'reconnect_backoff_max': 5        # Максимальная пауза между попытками, сек
+}
+
+# Мониторинг запросов
+METRICS_CONFIG = {
+    'enabled': True,                  # Собирать статистику по запросам
+    'slow_query_ms': 500,             # Порог медленного запроса, мс
+    'slow_query_log': 'slow_queries.log',
+    'log_max_bytes': 5 * 1024 * 1024, # Размер файла журнала до ротации
+    'log_backup_count': 3             # Сколько старых файлов журнала хранить
+}
+
+# Миграции схемы БД (database/migrations)
+MIGRATIONS_CONFIG = {
+    'auto_apply': True                # Применять недостающие миграции при запуске; False - только проверка
+}
+
+# Сервер приложения (python -m hotel_management.server)
+# Сервер говорит по HTTP без шифрования: пароли при входе и токены сессий идут открытым
+# текстом. Для рабочих мест в сети сервер слушает только 127.0.0.1, а снаружи
+# доступен через обратный прокси с TLS (nginx и т.п.); клиенты указывают адрес https://
+SERVER_CONFIG = {
+    'url': None,                      # Адрес сервера на клиенте ('https://hotel.local'); None - прямая работа с БД
+    'host': '127.0.0.1',              # На каком адресе слушает сервер (0.0.0.0 - только в доверенной сети)
+    'port': 8765,
+    'request_timeout': 15,            # Ожидание ответа сервера клиентом, сек
+    'events_wait_seconds': 25,        # Сколько сервер держит запрос изменений, если их нет (long polling)
+    'events_keep': 1000,              # Сколько последних изменений сервер хранит для отставших клиентов
+    'session_hours': 12,              # Время жизни сессии после входа
+    'cache_seconds': 30               # Общий кэш чтений на сервере (сбрасывается уведомлениями об изменениях)
+}
+
+# Главное окно
+DASHBOARD_CONFIG = {
+    'prefetch_tab': True,             # После показа окна заранее открыть самую используемую вкладку
+    'prefetch_delay_ms': 300,         # Пауза после первой отрисовки перед подгрузкой, мс
+    'settings_organization': 'GrandPlaza',  # Где QSettings хранит статистику открытия вкладок
+    'settings_application': 'HotelManagement'
+}
+
+# Настройки безопасности
+SECURITY_CONFIG = {
+    'max_login_attempts': 3,          # Максимальное количество попыток входа
+    'lock_time_minutes': 30,          # Время блокировки в минутах
+    'password_min_length': 8,         # Минимальная длина пароля
+    'password_requirements': {
+        'require_upper': True,        # Требовать заглавные буквы
+        'require_digit': True,        # Требовать цифры
+        'require_special': True       # Требовать спецсимволы
+    }
+}
+
+# Ключи ролей по role_id (1-Админ, 2-Менеджер, 3-Горничная, 4-Портье)
+ROLE_KEYS = {
+    1: 'admin',
+    2: 'manager',
+    3: 'maid',
+    4: 'receptionist'
+}
+
+# Права доступа для ролей по умолчанию: если роли нет или roles.permissions равен NULL
+# (пустой массив в roles.permissions - роль без прав)
+PERMISSIONS = {
+    'admin': ['all'],                 # Полный доступ
+    'manager': ['manage_bookings', 'manage_guests', 'view_reports'],
+    'maid': ['manage_cleaning'],
+    'receptionist': ['check_in_out', 'view_guests']
+}
+
+# Нагрузочные замеры (python -m hotel_management.benchmark)
+BENCHMARK_CONFIG = {
+    'database': 'Hotel_benchmark',    # Отдельная БД для синтетических данных (пересоздается генератором)
+    'seed': 42,                       # Одинаковые seed и масштаб дают одинаковые данные
+    'user_password': 'Bench#2024',    # Пароль всех сгенерированных пользователей
+    'scales': {
+        'small': {'rooms': 200, 'guests': 20000, 'occupancy': 200000, 'cleaning': 20000, 'users': 20},
+        'medium': {'rooms': 1000, 'guests': 200000, 'occupancy': 2000000, 'cleaning': 100000, 'users': 100},
+        'large': {'rooms': 5000, 'guests': 1000000, 'occupancy': 10000000, 'cleaning': 500000, 'users': 500}
+    },
+    'warmup': 3,                      # Прогревочных запусков каждого замера
+    'repeat': 30,                     # Измеряемых запусков каждого замера
+    'baseline_file': 'benchmark_baseline.json',
+    'regression_pct': 20              # Рост медианы сильнее этого порога считается регрессией
+}
@@ -0,0 +1,234 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import timedelta
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.queries import AvailabilityQueries
+
+
+class _RoomStays:
+    """
+    Проживания одного номера, отсортированные по дате заезда.
+    max_ends[i] - наибольшая дата выезда среди stays[0..i]: при поиске
+    пересечений обход назад останавливается, как только все более ранние
+    проживания гарантированно закончились до начала периода.
+    """
+    __slots__ = ('stays', 'max_ends')
+
+    def __init__(self):
+        self.stays = []
+        self.max_ends = []
+
+    def add(self, stay):
+        insort(self.stays, stay)
+        self._rebuild()
+
+    def set(self, stays):
+        self.stays = sorted(stays)
+        self._rebuild()
+
+    def remove(self, stay):
+        index = bisect_left(self.stays, stay)
+        if index < len(self.stays) and self.stays[index] == stay:
+            del self.stays[index]
+            self._rebuild()
+
+    def _rebuild(self):
+        self.max_ends = []
+        latest = None
+        for _, check_out, _ in self.stays:
+            latest = check_out if latest is None or check_out > latest else latest
+            self.max_ends.append(latest)
+
+    def overlapping(self, check_in, check_out):
+        """id проживаний, пересекающихся с периодом [check_in, check_out)"""
+        found = []
+        # Кандидаты - проживания с заездом раньше check_out
+        index = bisect_left(self.stays, (check_out,)) - 1
+        while index >= 0 and self.max_ends[index] > check_in:
+            stay_in, stay_out, occupancy_id = self.stays[index]
+            if stay_out > check_in:
+                found.append(occupancy_id)
+            index -= 1
+        return found
+
+
+class AvailabilityEngine:
+    """
+    Занятость номеров в памяти процесса: для каждого номера - отсортированный
+    список забронированных и заселенных проживаний. Загружается один раз,
+    затем дочитывает только измененные брони (по occupancy.updated_at) по
+    уведомлениям шины изменений. Проверка конфликта и поиск свободных номеров
+    на любой период выполняются без обращения к БД.
+    Период проживания полуоткрытый [заезд, выезд): в день выезда номер
+    свободен для нового заезда.
+    """
+    ACTIVE_STATUSES = ('booked', 'checked_in')
+    # Перекрытие при дочитывании по отметке времени (как в списке бронирований)
+    WATERMARK_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = {}
+        self._room_stays = {}
+        self._stays = {}
+        self._watermark = None
+        self._loaded = False
+        # Следующее чтение - полная загрузка (пересинхронизация, изменился состав номеров)
+        self._reload = False
+        # Удаленные брони: чтение, начатое до удаления, не должно вернуть их в память
+        self._deleted = set()
+        self._bus = None
+        self._executor = None
+
+    def track(self, bus, executor=None):
+        """
+        Подписывается на изменения номеров и бронирований
+        :param executor: QueryExecutor - дочитывание по уведомлениям выполняется в рабочем
+                         потоке, а результат применяется в потоке шины (GUI); без него
+                         (сервер приложения) - сразу в потоке шины
+        """
+        self._bus = bus
+        self._executor = executor
+        bus.subscribe(['occupancy', 'rooms'], self.apply_events, bus)
+
+    def load(self):
+        """
+        Полная загрузка номеров и действующих проживаний
+        :return: True при успехе
+        """
+        with self._lock:
+            self._reload = True
+        return self._store(self._fetch())
+
+    def refresh(self):
+        """Дочитывает брони, измененные после последней загрузки (до загрузки - полная загрузка)"""
+        return self._store(self._fetch())
+
+    def apply_events(self, events):
+        """Обработчик шины изменений"""
+        if not self._loaded:
+            # Еще не использовался - загрузится при первом запросе
+            return
+        with self._lock:
+            if any(event.table in ('*', 'rooms') and event.op in ('R', 'I', 'D') for event in events):
+                # Пересинхронизация или изменился состав номеров
+                self._reload = True
+            for event in events:
+                if event.table == 'occupancy' and event.op == 'D':
+                    self._deleted.add(event.row_id)
+                    self._drop(event.row_id)
+
+        if self._executor is None:
+            self.refresh()
+        else:
+            # Обновления, пришедшие во время чтения, сливаются в одно повторное чтение
+            self._executor.submit(self._fetch, on_result=self._store, key=(id(self), 'refresh'))
+
+    def _fetch(self):
+        """
+        Чтение из БД (может выполняться в рабочем потоке)
+        :return: (номера, проживания, None) при полной загрузке, (None, None, измененные брони)
+                 при дочитывании или None при ошибке
+        """
+        with self._lock:
+            full = self._reload or not self._loaded or self._watermark is None
+            self._reload = False
+            watermark = self._watermark
+
+        if full:
+            rooms = DatabaseConnector().execute_query(AvailabilityQueries.GET_ROOMS, fetch=True)
+            stays = DatabaseConnector().execute_query(AvailabilityQueries.GET_STAYS, fetch=True)
+            if rooms is not None and stays is not None:
+                return rooms, stays, None
+        else:
+            changed = DatabaseConnector().execute_prepared(
+                'booking_get_changed', (watermark - self.WATERMARK_OVERLAP,))
+            if changed is not None:
+                return None, None, changed
+
+        with self._lock:
+            # Загрузка не удалась - следующее чтение повторит ее
+            self._reload = self._reload or full
+        return None
+
+    def _store(self, data):
+        """Применяет результат _fetch; :return: True при успехе"""
+        if data is None:
+            return False
+        rooms, stays, changed = data
+
+        with self._lock:
+            if changed is None:
+                self._rooms = {room[0]: room for room in rooms}
+                self._stays = {}
+                self._watermark = None
+                by_room = {}
+                for occupancy_id, room_id, check_in, check_out, updated_at in stays:
+                    stay = (check_in, check_out, occupancy_id)
+                    by_room.setdefault(room_id, []).append(stay)
+                    self._stays[occupancy_id] = (room_id, stay)
+                    self._advance(updated_at)
+                self._room_stays = {}
+                for room_id, room_stays in by_room.items():
+                    self._room_stays[room_id] = _RoomStays()
+                    self._room_stays[room_id].set(room_stays)
+                self._loaded = True
+            else:
+                for occupancy_id, _, room_id, check_in, check_out, status, updated_at in changed:
+                    self._drop(occupancy_id)
+                    if status in self.ACTIVE_STATUSES:
+                        self._put(occupancy_id, room_id, check_in, check_out)
+                    self._advance(updated_at)
+
+            for occupancy_id in self._deleted:
+                self._drop(occupancy_id)
+            if changed is None:
+                # Брони, которых нет в полной загрузке, уже не вернутся из более старого чтения
+                self._deleted &= {occupancy_id for occupancy_id, *_ in stays}
+        return True
+
+    def ensure_current(self):
+        """Загружает данные при первом обращении; без шины изменений - дочитывает изменения"""
+        if not self._loaded:
+            self.load()
+        elif self._bus is None or not self._bus.active:
+            self.refresh()
+
+    def conflicts(self, room_id, check_in, check_out, exclude_id=None):
+        """id броней номера, пересекающихся с периодом [check_in, check_out)"""
+        self.ensure_current()
+        with self._lock:
+            room_stays = self._room_stays.get(room_id)
+            if room_stays is None:
+                return []
+            return [occupancy_id for occupancy_id in room_stays.overlapping(check_in, check_out)
+                    if occupancy_id != exclude_id]
+
+    def is_free(self, room_id, check_in, check_out):
+        return not self.conflicts(room_id, check_in, check_out)
+
+    def free_rooms(self, check_in, check_out):
+        """Номера (room_id, floor, category_id), свободные весь период [check_in, check_out)"""
+        self.ensure_current()
+        with self._lock:
+            return [room for room_id, room in self._rooms.items()
+                    if room_id not in self._room_stays
+                    or not self._room_stays[room_id].overlapping(check_in, check_out)]
+
+    def _put(self, occupancy_id, room_id, check_in, check_out):
+        stay = (check_in, check_out, occupancy_id)
+        self._room_stays.setdefault(room_id, _RoomStays()).add(stay)
+        self._stays[occupancy_id] = (room_id, stay)
+
+    def _drop(self, occupancy_id):
+        entry = self._stays.pop(occupancy_id, None)
+        if entry is not None:
+            room_id, stay = entry
+            self._room_stays[room_id].remove(stay)
+
+    def _advance(self, updated_at):
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+
+availability = AvailabilityEngine()
@@ -0,0 +1,146 @@
+import inspect
+import itertools
+from collections import namedtuple
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from hotel_management.config import POOL_CONFIG
+
+_Request = namedtuple('_Request', ['key', 'owner', 'on_result', 'on_error', 'on_batch'])
+
+
+class _JobSignals(QObject):
+    # Общий для всех задач объект сигналов: (id задачи, данные)
+    batch = pyqtSignal(int, object)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _Job(QRunnable):
+    def __init__(self, job_id, work, args, signals):
+        super().__init__()
+        self.job_id = job_id
+        self.work = work
+        self.args = args
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.work(*self.args)
+            if inspect.isgenerator(result):
+                # Генератор отдает результат пакетами - каждый пакет уходит в GUI сразу
+                for batch in result:
+                    self.signals.batch.emit(self.job_id, batch)
+                result = None
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, e)
+        else:
+            self.signals.finished.emit(self.job_id, result)
+
+
+class QueryExecutor(QObject):
+    """
+    Выполнение работы с БД в пуле рабочих потоков.
+    Каждый поток берет свое соединение из пула (DatabaseConnector хранит его
+    в локальной памяти потока), а результат или ошибка возвращаются в поток
+    GUI через сигналы и передаются обработчикам виджета.
+    Задачи с одинаковым ключом не выполняются одновременно: обновление,
+    запрошенное во время выполнения, запускается один раз после него (все
+    промежуточные запросы сливаются в этот повтор), а повторное действие
+    пользователя (rerun=False) отбрасывается.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pool = QThreadPool(self)
+        # Половина пула соединений: остальное - синхронным запросам (вход, миграции, аудит)
+        self._pool.setMaxThreadCount(max(1, POOL_CONFIG['max_size'] // 2))
+        self._signals = _JobSignals()
+        self._signals.batch.connect(self._on_batch)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._requests = {}
+        self._keys = {}
+        # Ключ -> (work, args, запрос) для повтора после выполняющейся задачи с этим ключом
+        self._trailing = {}
+        self._job_ids = itertools.count(1)
+
+    def submit(self, work, *args, on_result=None, on_error=None, on_batch=None, owner=None, key=None,
+               rerun=True):
+        """
+        Ставит work(*args) в очередь рабочих потоков
+        :param work: Функция; если она генератор - каждый его элемент передается в on_batch
+        :param on_result: Вызывается в потоке GUI с результатом work
+        :param on_error: Вызывается в потоке GUI с исключением
+        :param on_batch: Вызывается в потоке GUI с очередным пакетом генератора
+        :param owner: Виджет; если он удален до завершения, обработчики не вызываются
+        :param key: Ключ объединения задач (см. rerun)
+        :param rerun: Если задача с ключом уже выполняется: True - выполнить эту задачу один раз
+                      после нее (обновление данных, последний запрос заменяет предыдущие),
+                      False - отбросить (действие пользователя, например повторное нажатие кнопки)
+        :return: True, если задача поставлена в очередь или отложена до завершения текущей
+        """
+        request = _Request(key, owner, on_result, on_error, on_batch)
+        if key is not None and key in self._keys:
+            if not rerun:
+                return False
+            self._trailing[key] = (work, args, request)
+            return True
+        self._start(work, args, request)
+        return True
+
+    def _start(self, work, args, request):
+        job_id = next(self._job_ids)
+        self._requests[job_id] = request
+        if request.key is not None:
+            self._keys[request.key] = job_id
+        self._pool.start(_Job(job_id, work, args, self._signals))
+
+    def pending(self, key):
+        """Выполняется ли задача с ключом"""
+        return key in self._keys
+
+    def wait(self, timeout_ms=-1):
+        """Ожидает завершения всех задач (при выходе из приложения)"""
+        return self._pool.waitForDone(timeout_ms)
+
+    def _alive(self, request):
+        return request.owner is None or not sip.isdeleted(request.owner)
+
+    def _complete(self, job_id):
+        request = self._requests.pop(job_id, None)
+        if request is not None and request.key is not None:
+            self._keys.pop(request.key, None)
+            trailing = self._trailing.pop(request.key, None)
+            if trailing is not None and self._alive(trailing[2]):
+                self._start(*trailing)
+        return request
+
+    def _on_batch(self, job_id, batch):
+        request = self._requests.get(job_id)
+        if request is not None and request.on_batch and self._alive(request):
+            request.on_batch(batch)
+
+    def _on_finished(self, job_id, result):
+        request = self._complete(job_id)
+        if request is not None and request.on_result and self._alive(request):
+            request.on_result(result)
+
+    def _on_failed(self, job_id, error):
+        request = self._complete(job_id)
+        if request is None or not self._alive(request):
+            return
+        if request.on_error:
+            request.on_error(error)
+        else:
+            print(f"Ошибка фоновой задачи: {error}")
+
+
+_query_executor = None
+
+
+def query_executor():
+    """Исполнитель фоновых запросов приложения (создается при первом обращении, нужен QApplication)"""
+    global _query_executor
+    if _query_executor is None:
+        _query_executor = QueryExecutor()
+    return _query_executor
@@ -1,44 +1,628 @@
-import psycopg2
-from psycopg2 import OperationalError
-from hotel_management.config import DB_CONFIG
-
-class DatabaseConnector:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.connection = None
-        return cls._instance
-
-    def connect(self):
-        try:
-            if self.connection is None or self.connection.closed:
-                self.connection = psycopg2.connect(**DB_CONFIG)
-            return True
-        except OperationalError as e:
-            print(f"Ошибка подключения к базе данных: {e}")
-            return False
-
-    def disconnect(self):
-        if self.connection and not self.connection.closed:
-            self.connection.close()
-        self.connection = None
-
-    def execute_query(self, query, params=None, fetch=False):
-        try:
-            if not self.connect():
-                return None if fetch else False
-                
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params or ())
-                if fetch:
-                    return cursor.fetchall()
-                self.connection.commit()
-                return True
-                
-        except Exception as e:
-            if self.connection:
-                self.connection.rollback()
-            print(f"Ошибка выполнения запроса: {e}")
-            return None if fetch else False
\ No newline at end of file
+import csv
+import io
+import itertools
+import random
+import threading
+import time
+import psycopg2
+from psycopg2 import InterfaceError, OperationalError, sql
+from psycopg2.extras import execute_values
+from psycopg2.extensions import (connection as PgConnection, cursor as PgCursor,
+                                  TRANSACTION_STATUS_IDLE)
+from hotel_management.config import DB_CONFIG, POOL_CONFIG
+from hotel_management.database.metrics import metrics
+from hotel_management.database.queries import statements
+
+
+class PoolTimeoutError(Exception):
+    """Свободное соединение не появилось за отведенное время"""
+
+
+class InstrumentedCursor(PgCursor):
+    """Курсор, передающий время выполнения и выборки в статистику запросов"""
+
+    def _query_text(self, query):
+        if isinstance(query, bytes):
+            return query.decode('utf-8', 'replace')
+        if not isinstance(query, str):
+            return query.as_string(self)
+        return query
+
+    def _timed(self, method, query, params):
+        query = self._query_text(query)
+        self._metrics_query = query
+        connect_s = self.connection.take_connect_time()
+        started = time.perf_counter()
+        try:
+            result = method()
+        except Exception:
+            metrics.record_error(query)
+            raise
+        # У серверного курсора строки считаются при выборке
+        rows = 0 if self.name else self.rowcount
+        metrics.record_execute(query, connect_s, time.perf_counter() - started, rows, params)
+        return result
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        query = getattr(self, '_metrics_query', None)
+        if query is not None:
+            if self.name:
+                rows = len(result) if isinstance(result, list) else int(result is not None)
+            else:
+                rows = 0
+            metrics.record_fetch(query, time.perf_counter() - started, rows)
+        return result
+
+    def execute(self, query, vars=None):
+        return self._timed(lambda: super(InstrumentedCursor, self).execute(query, vars), query, vars)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._timed(lambda: super(InstrumentedCursor, self).copy_expert(sql, file, size), sql, None)
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+
+class PooledConnection(PgConnection):
+    """Соединение psycopg2 с метаданными, которые нужны пулу"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = InstrumentedCursor
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+        self.prepared_statements = set()
+        self.connect_time = 0.0
+
+    def take_connect_time(self):
+        """Время получения соединения из пула; относится к первому запросу после выдачи"""
+        connect_time, self.connect_time = self.connect_time, 0.0
+        return connect_time
+
+
+class ConnectionPool:
+    def __init__(self, connect_params, min_size=1, max_size=10,
+                 max_idle_seconds=300, checkout_timeout=5, health_check_after=30,
+                 reconnect_attempts=5, reconnect_backoff=0.2, reconnect_backoff_max=5):
+        """
+        Ограниченный потокобезопасный пул соединений с PostgreSQL
+        :param connect_params: Параметры psycopg2.connect
+        :param min_size: Сколько простаивающих соединений не закрывать
+        :param max_size: Максимум одновременно открытых соединений
+        :param max_idle_seconds: Через сколько секунд простоя соединение закрывается
+        :param checkout_timeout: Сколько секунд ждать свободного соединения
+        :param health_check_after: После скольких секунд простоя проверять соединение перед выдачей
+        :param reconnect_attempts: Попыток установить соединение
+        :param reconnect_backoff: Начальная пауза между попытками, сек (удваивается)
+        :param reconnect_backoff_max: Максимальная пауза между попытками, сек
+        """
+        self.connect_params = connect_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_backoff = reconnect_backoff
+        self.reconnect_backoff_max = reconnect_backoff_max
+
+        self._condition = threading.Condition()
+        self._idle = []           # Стек: последним вернули - первым выдадим
+        self._in_use = set()
+        self._opening = 0         # Соединения, которые сейчас устанавливаются
+        self._closed = False
+        self._stats = {
+            'created': 0, 'closed': 0, 'evicted': 0,
+            'checkouts': 0, 'checkins': 0, 'waits': 0, 'timeouts': 0,
+            'failed_probes': 0, 'reconnect_retries': 0
+        }
+
+    def _open(self, attempts=None):
+        """
+        Устанавливает соединение, повторяя попытки с экспоненциальной паузой и случайным разбросом
+        :param attempts: Число попыток (по умолчанию reconnect_attempts)
+        """
+        attempts = attempts or self.reconnect_attempts
+        attempt = 0
+        while True:
+            try:
+                return psycopg2.connect(connection_factory=PooledConnection, **self.connect_params)
+            except OperationalError:
+                attempt += 1
+                if attempt >= attempts or self._closed:
+                    raise
+                delay = min(self.reconnect_backoff_max, self.reconnect_backoff * 2 ** attempt)
+                with self._condition:
+                    self._stats['reconnect_retries'] += 1
+                time.sleep(random.uniform(delay / 2, delay))
+
+    def _is_alive(self, connection):
+        """Дешевая проверка соединения запросом SELECT 1"""
+        if connection.closed:
+            return False
+        try:
+            # Обычный курсор: проверки не попадают в статистику запросов
+            with connection.cursor(cursor_factory=PgCursor) as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close(self, connection):
+        """Закрывает соединение (вызывается под блокировкой)"""
+        try:
+            if not connection.closed:
+                connection.close()
+        except Exception:
+            pass
+        self._stats['closed'] += 1
+
+    def _evict_idle(self):
+        """Закрывает соединения, простаивающие дольше max_idle_seconds (под блокировкой)"""
+        deadline = time.monotonic() - self.max_idle_seconds
+        keep = []
+        # Самые старые лежат в начале стека
+        for index, connection in enumerate(self._idle):
+            surplus = len(self._idle) - index > self.min_size
+            if connection.closed or (surplus and connection.returned_at < deadline):
+                self._stats['evicted'] += 1
+                self._close(connection)
+            else:
+                keep.append(connection)
+        self._idle = keep
+
+    def checkout(self, timeout=None, attempts=None):
+        """
+        Выдает соединение из пула, при необходимости открывая новое
+        :param timeout: Сколько секунд ждать (по умолчанию checkout_timeout)
+        :param attempts: Попыток открыть новое соединение (по умолчанию reconnect_attempts)
+        :return: Соединение psycopg2
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            connection = self._reserve(deadline)
+            if connection is None:
+                break
+
+            # Долго простаивавшее соединение могло оборваться (сбой сети, перезапуск сервера)
+            idle_for = time.monotonic() - connection.returned_at
+            if idle_for < self.health_check_after or self._is_alive(connection):
+                connection.connect_time = time.monotonic() - started
+                return connection
+
+            with self._condition:
+                self._in_use.discard(connection)
+                self._stats['failed_probes'] += 1
+                self._close(connection)
+                self._condition.notify()
+
+        # Рукопожатие с сервером выполняется вне блокировки
+        try:
+            connection = self._open(attempts)
+        except Exception:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._opening -= 1
+            self._in_use.add(connection)
+            self._stats['created'] += 1
+            self._stats['checkouts'] += 1
+        connection.connect_time = time.monotonic() - started
+        return connection
+
+    def _reserve(self, deadline):
+        """
+        Занимает простаивающее соединение или место под новое
+        :return: Соединение из пула или None, если нужно открыть новое
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Пул соединений закрыт")
+
+                self._evict_idle()
+                if self._idle:
+                    connection = self._idle.pop()
+                    self._in_use.add(connection)
+                    self._stats['checkouts'] += 1
+                    return connection
+
+                if len(self._in_use) + self._opening < self.max_size:
+                    self._opening += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"Нет свободных соединений (занято {len(self._in_use)} из {self.max_size})"
+                    )
+                self._stats['waits'] += 1
+                self._condition.wait(remaining)
+
+    def checkin(self, connection, discard=False):
+        """
+        Возвращает соединение в пул
+        :param connection: Ранее выданное соединение
+        :param discard: Закрыть соединение вместо возврата
+        """
+        if not discard and not connection.closed:
+            try:
+                # Незавершенная транзакция не должна достаться следующему владельцу
+                if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._condition:
+            self._in_use.discard(connection)
+            self._stats['checkins'] += 1
+            if discard or connection.closed or self._closed:
+                self._close(connection)
+            else:
+                connection.returned_at = time.monotonic()
+                self._idle.append(connection)
+            self._condition.notify()
+
+    def stats(self):
+        """Снимок состояния пула"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'size': len(self._idle) + len(self._in_use),
+                'max_size': self.max_size
+            })
+            return stats
+
+    def close(self):
+        """Закрывает все простаивающие соединения; занятые закроются при возврате"""
+        with self._condition:
+            self._closed = True
+            for connection in self._idle:
+                self._close(connection)
+            self._idle = []
+            self._condition.notify_all()
+
+
+class _CopyBuffer:
+    """Файлоподобный источник для COPY: формирует CSV по мере чтения, не держа все строки в памяти"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._sink = io.StringIO()
+        self._writer = csv.writer(self._sink, lineterminator='\n')
+        self._pending = ''
+        self._exhausted = False
+
+    def read(self, size=-1):
+        while not self._exhausted and (size < 0 or len(self._pending) < size):
+            chunk = 0
+            for row in self._rows:
+                self._writer.writerow(row)
+                chunk += 1
+                if chunk == 1000:
+                    break
+            else:
+                self._exhausted = True
+            self._pending += self._sink.getvalue()
+            self._sink.seek(0)
+            self._sink.truncate()
+
+        if size < 0:
+            data, self._pending = self._pending, ''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class DatabaseConnector:
+    # Ориентировочный размер одного пакетного INSERT, байт
+    BATCH_STATEMENT_BYTES = 512 * 1024
+    MIN_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 10000
+    # Строк за одно обращение к серверному курсору
+    STREAM_ITERSIZE = 2000
+    # Сколько раз повторять чтение после обрыва соединения
+    READ_RETRIES = 2
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+                    instance._local = threading.local()
+                    instance._cursor_ids = itertools.count(1)
+                    cls._instance = instance
+        return cls._instance
+
+    @property
+    def connection(self):
+        """Соединение, выданное текущему потоку (None, если не подключены)"""
+        return getattr(self._local, 'connection', None)
+
+    def connect(self, attempts=None):
+        """
+        Берет соединение из пула для текущего потока.
+        Вложенные вызовы переиспользуют его; каждому connect() соответствует disconnect().
+        :param attempts: Попыток подключения (по умолчанию POOL_CONFIG['reconnect_attempts']);
+                         в потоке GUI - 1, чтобы не ждать повторов при недоступном сервере
+        """
+        connection = self.connection
+        if connection is not None:
+            if not connection.closed:
+                self._local.depth += 1
+                return True
+            self.pool.checkin(connection, discard=True)
+            self._local.connection = None
+
+        try:
+            self._local.connection = self.pool.checkout(attempts=attempts)
+            self._local.depth = 1
+            return True
+        except (OperationalError, PoolTimeoutError) as e:
+            print(f"Ошибка подключения к базе данных: {e}")
+            return False
+
+    def disconnect(self):
+        """Возвращает соединение в пул после последнего вложенного disconnect()"""
+        connection = self.connection
+        if connection is None:
+            return
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.connection = None
+        self.pool.checkin(connection)
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+    def query_stats(self):
+        """Статистика по запросам: вызовы, строки, перцентили задержки, время по фазам"""
+        return metrics.snapshot()
+
+    def close(self):
+        """Закрывает пул при завершении приложения"""
+        self.pool.close()
+
+    def _rollback(self):
+        """Откатывает транзакцию потока, если соединение еще живо"""
+        connection = self.connection
+        if connection is not None and not connection.closed:
+            connection.rollback()
+
+    def _reconnect(self):
+        """
+        Заменяет оборванное соединение потока новым из пула.
+        Только если соединение не используется внешним кодом (нет вложенных connect()).
+        """
+        connection = self.connection
+        if connection is None or not connection.closed or self._local.depth != 1:
+            return False
+        self.pool.checkin(connection, discard=True)
+        try:
+            self._local.connection = self.pool.checkout()
+            return True
+        except (OperationalError, PoolTimeoutError):
+            self._local.connection = None
+            return False
+
+    def _execute(self, run, fetch, error_message):
+        """
+        Выполняет run(cursor) на соединении потока.
+        Чтение (fetch=True) идемпотентно и при обрыве связи повторяется на новом соединении.
+        """
+        if not self.connect():
+            return None if fetch else False
+
+        try:
+            attempt = 0
+            while True:
+                try:
+                    with self.connection.cursor() as cursor:
+                        run(cursor)
+                        if fetch:
+                            return cursor.fetchall()
+                        self.connection.commit()
+                        return True
+                except (OperationalError, InterfaceError):
+                    if not fetch or attempt >= self.READ_RETRIES or not self._reconnect():
+                        raise
+                    attempt += 1
+
+        except Exception as e:
+            self._rollback()
+            print(f"{error_message}: {e}")
+            return None if fetch else False
+        finally:
+            self.disconnect()
+
+    def execute_query(self, query, params=None, fetch=False):
+        return self._execute(
+            lambda cursor: cursor.execute(query, params or ()),
+            fetch, "Ошибка выполнения запроса"
+        )
+
+    def execute_prepared(self, name, params=None, fetch=True):
+        """
+        Выполняет запрос из реестра подготовленных запросов
+        :param name: Имя запроса (см. database/queries.py)
+        :param params: Значения параметров $1, $2, ...
+        :param fetch: Вернуть строки результата вместо фиксации транзакции
+        """
+        return self._execute(
+            lambda cursor: statements.execute(cursor, name, params),
+            fetch, f"Ошибка выполнения запроса {name}"
+        )
+
+    def run_in_transaction(self, work):
+        """
+        Выполняет work(cursor) одной транзакцией на соединении потока.
+        В отличие от execute_query ошибки не подавляются: транзакция
+        откатывается, а исключение передается вызывающему коду.
+        :return: Результат work
+        """
+        if not self.connect():
+            raise OperationalError("Не удалось подключиться к базе данных")
+
+        try:
+            with self.connection.cursor() as cursor:
+                result = work(cursor)
+            self.connection.commit()
+            return result
+        except Exception:
+            self._rollback()
+            raise
+        finally:
+            self.disconnect()
+
+    def fetch_prepared(self, name, params=None):
+        """
+        Строки запроса из реестра подготовленных запросов.
+        В отличие от execute_prepared ошибка передается вызывающему коду.
+        """
+        def read(cursor):
+            statements.execute(cursor, name, params)
+            return cursor.fetchall()
+        return self.run_in_transaction(read)
+
+    def _page_size_for(self, cursor, template, sample_row):
+        """Подбирает число строк в одном INSERT по размеру первой строки"""
+        row_bytes = max(len(cursor.mogrify(template, sample_row)), 1)
+        page_size = self.BATCH_STATEMENT_BYTES // row_bytes
+        return max(self.MIN_PAGE_SIZE, min(self.MAX_PAGE_SIZE, page_size))
+
+    def execute_many(self, query, rows, template=None, page_size=None, fetch=False, commit=True):
+        """
+        Выполняет запрос вида "INSERT ... VALUES %s" для множества строк
+        пакетами по page_size строк в одной транзакции
+        :param query: Запрос с единственным плейсхолдером %s после VALUES
+        :param rows: Последовательность кортежей значений
+        :param template: Шаблон одной строки, например "(%s, %s, FALSE)"
+        :param page_size: Строк в пакете (по умолчанию подбирается автоматически)
+        :param fetch: Вернуть результат RETURNING
+        :param commit: Зафиксировать транзакцию (False - если вызывающий код продолжит ее сам)
+        :return: Число обработанных строк, строки RETURNING или None при ошибке
+        """
+        rows = list(rows)
+        if not rows:
+            return [] if fetch else 0
+        if not self.connect():
+            return None
+
+        try:
+            with self.connection.cursor() as cursor:
+                if page_size is None:
+                    row_template = template or "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+                    page_size = self._page_size_for(cursor, row_template, rows[0])
+                result = execute_values(cursor, query, rows, template=template,
+                                        page_size=page_size, fetch=fetch)
+                if commit:
+                    self.connection.commit()
+                return result if fetch else len(rows)
+
+        except Exception as e:
+            self._rollback()
+            print(f"Ошибка пакетного выполнения запроса: {e}")
+            return None
+        finally:
+            self.disconnect()
+
+    def copy_in(self, table, columns, rows, commit=True):
+        """
+        Загружает строки в таблицу через COPY FROM STDIN одним потоком
+        :param table: Имя таблицы
+        :param columns: Имена столбцов в порядке значений в строках
+        :param rows: Итерируемый источник кортежей (None загружается как NULL)
+        :param commit: Зафиксировать транзакцию
+        :return: Число загруженных строк или None при ошибке
+        """
+        if not self.connect():
+            return None
+
+        try:
+            copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                sql.Identifier(table),
+                sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+            )
+            with self.connection.cursor() as cursor:
+                cursor.copy_expert(copy_query, _CopyBuffer(rows))
+                loaded = cursor.rowcount
+            if commit:
+                self.connection.commit()
+            return loaded
+
+        except Exception as e:
+            self._rollback()
+            print(f"Ошибка загрузки данных в {table}: {e}")
+            return None
+        finally:
+            self.disconnect()
+
+    def stream(self, query, params=None, itersize=None, batches=False):
+        """
+        Построчно читает результат через именованный (серверный) курсор,
+        не загружая всю выборку в память клиента.
+        Открытие курсора при обрыве связи повторяется на новом соединении, как чтение
+        в execute_query; но ошибки, в отличие от него, не подавляются: генератор не может
+        вернуть None вместо строк, поэтому OperationalError/PoolTimeoutError (и обрыв
+        после выдачи первых строк - повторять чтение с начала нельзя) получает вызывающий код.
+        :param query: SELECT-запрос
+        :param params: Параметры запроса
+        :param itersize: Строк за одно обращение к серверу
+        :param batches: Отдавать списки строк по itersize вместо отдельных строк
+        :return: Генератор строк или пакетов строк
+        """
+        itersize = itersize or self.STREAM_ITERSIZE
+        attempt = 0
+        while True:
+            # Отдельное соединение: фиксация транзакции в другом коде потока
+            # не должна закрыть курсор посреди чтения
+            connection = self.pool.checkout()
+            try:
+                cursor = connection.cursor(name=f"stream_{next(self._cursor_ids)}")
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                rows = cursor.fetchmany(itersize)
+                break
+            except (OperationalError, InterfaceError):
+                self.pool.checkin(connection, discard=True)
+                if attempt >= self.READ_RETRIES:
+                    raise
+                attempt += 1
+            except Exception:
+                self.pool.checkin(connection)
+                raise
+
+        try:
+            while rows:
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+                rows = cursor.fetchmany(itersize)
+        finally:
+            if not connection.closed:
+                cursor.close()
+            self.pool.checkin(connection)
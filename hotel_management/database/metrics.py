@@ -0,0 +1,203 @@
+import logging
+import math
+import re
+import threading
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from hotel_management.config import METRICS_CONFIG
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_EXECUTE = re.compile(r"^EXECUTE (\w+)", re.IGNORECASE)
+# Строка многострочного VALUES (допускается один уровень вложенных скобок, например nextval(?))
+_VALUES_ROW = r"\((?:[^()]|\([^()]*\))*\)"
+_VALUES_LIST = re.compile(rf"\bVALUES ({_VALUES_ROW})(?: ?, ?{_VALUES_ROW})+", re.IGNORECASE)
+_KEYWORD_LITERAL = re.compile(r"\b(?:NULL|TRUE|FALSE)\b", re.IGNORECASE)
+# Длиннее этого текст запроса не кэшируется: пакеты execute_values занимают сотни КБ
+FINGERPRINT_CACHE_CHARS = 2048
+
+
+def _collapse_values(match):
+    row = _KEYWORD_LITERAL.sub("?", match.group(1))
+    return f"VALUES {row}, ..."
+
+
+def _normalize(query):
+    text = _WHITESPACE.sub(" ", query).strip()
+    match = _EXECUTE.match(text)
+    if match:
+        return f"EXECUTE {match.group(1)}"
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    return _VALUES_LIST.sub(_collapse_values, text)
+
+
+_cached_normalize = lru_cache(maxsize=1024)(_normalize)
+
+
+def fingerprint(query):
+    """
+    Нормализованный текст запроса: литералы заменены на ?, пробелы схлопнуты,
+    многострочный VALUES сведен к одной строке - пакетная вставка дает один
+    отпечаток при любом числе строк. Подготовленные запросы группируются по имени.
+    """
+    if len(query) > FINGERPRINT_CACHE_CHARS:
+        return _normalize(query)
+    return _cached_normalize(query)
+
+
+def redact(params):
+    """Заменяет значения параметров их типами, чтобы в журнал не попадали персональные данные"""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in params.items()) + "}"
+    parts = []
+    for value in params:
+        if isinstance(value, (list, tuple)):
+            parts.append(f"<{type(value).__name__}[{len(value)}]>")
+        else:
+            parts.append(f"<{type(value).__name__}>")
+    return "(" + ", ".join(parts) + ")"
+
+
+class LatencyHistogram:
+    """Гистограмма с геометрическими корзинами (шаг 10%): постоянная память, точность ~10%"""
+    BASE_MS = 0.01
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+
+    def add(self, value_ms):
+        if value_ms <= self.BASE_MS:
+            index = 0
+        else:
+            index = int(math.log(value_ms / self.BASE_MS, self.GROWTH)) + 1
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+
+    def percentile(self, percent):
+        """Верхняя граница корзины, в которую попадает заданный процентиль, мс"""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self.BASE_MS * self.GROWTH ** index
+        return self.BASE_MS * self.GROWTH ** max(self.counts)
+
+
+class StatementStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.connect_ms = 0.0
+        self.execute_ms = 0.0
+        self.fetch_ms = 0.0
+        self.latency = LatencyHistogram()
+
+
+class QueryMetrics:
+    """
+    Статистика по отпечаткам запросов: число вызовов, строк, ошибок,
+    время ожидания соединения / выполнения / выборки и перцентили задержки.
+    Задержка в гистограмме = ожидание соединения + выполнение на сервере.
+    """
+
+    def __init__(self, config=METRICS_CONFIG):
+        self.enabled = config['enabled']
+        self.slow_query_ms = config['slow_query_ms']
+        self._config = config
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._slow_log = None
+
+    def _entry(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = StatementStats()
+        return stats
+
+    def record_execute(self, query, connect_s, execute_s, rows, params=None):
+        if not self.enabled:
+            return
+        connect_ms, execute_ms = connect_s * 1000, execute_s * 1000
+        # Отпечаток пакетной вставки считается долго - вне блокировки
+        key = fingerprint(query)
+        with self._lock:
+            stats = self._entry(key)
+            stats.calls += 1
+            stats.rows += max(rows, 0)
+            stats.connect_ms += connect_ms
+            stats.execute_ms += execute_ms
+            stats.latency.add(connect_ms + execute_ms)
+        if connect_ms + execute_ms >= self.slow_query_ms:
+            self._log_slow(key, f"connect {connect_ms:.1f} ms, execute {execute_ms:.1f} ms", params)
+
+    def record_fetch(self, query, fetch_s, rows):
+        if not self.enabled:
+            return
+        fetch_ms = fetch_s * 1000
+        # Отпечаток пакетной вставки считается долго - вне блокировки
+        key = fingerprint(query)
+        with self._lock:
+            stats = self._entry(key)
+            stats.rows += rows
+            stats.fetch_ms += fetch_ms
+        if fetch_ms >= self.slow_query_ms:
+            self._log_slow(key, f"fetch {fetch_ms:.1f} ms, rows {rows}", None)
+
+    def record_error(self, query):
+        if not self.enabled:
+            return
+        key = fingerprint(query)
+        with self._lock:
+            self._entry(key).errors += 1
+
+    def _log_slow(self, key, timing, params):
+        if self._slow_log is None:
+            logger = logging.getLogger('hotel_management.slow_queries')
+            if not logger.handlers:
+                handler = RotatingFileHandler(
+                    self._config['slow_query_log'],
+                    maxBytes=self._config['log_max_bytes'],
+                    backupCount=self._config['log_backup_count'],
+                    encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+            self._slow_log = logger
+        self._slow_log.warning("%s | %s | params=%s", timing, key, redact(params))
+
+    def snapshot(self):
+        """Статистика по всем запросам, самые затратные первыми"""
+        with self._lock:
+            report = [{
+                'query': key,
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'rows': stats.rows,
+                'connect_ms': round(stats.connect_ms, 2),
+                'execute_ms': round(stats.execute_ms, 2),
+                'fetch_ms': round(stats.fetch_ms, 2),
+                'p50_ms': round(stats.latency.percentile(50), 2),
+                'p95_ms': round(stats.latency.percentile(95), 2),
+                'p99_ms': round(stats.latency.percentile(99), 2)
+            } for key, stats in self._stats.items()]
+        report.sort(key=lambda item: item['connect_ms'] + item['execute_ms'] + item['fetch_ms'], reverse=True)
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+metrics = QueryMetrics()
@@ -0,0 +1,19 @@
+-- Индексы для частых запросов приложения
+
+-- Действующие брони: status IN ('booked', 'checked_in') AND check_out_date >= CURRENT_DATE
+-- (список бронирований, расчет занятости)
+CREATE INDEX IF NOT EXISTS idx_occupancy_status_check_out
+    ON occupancy (status, check_out_date);
+
+-- Брони номера по дате заезда (проверка занятости номера, шахматка)
+CREATE INDEX IF NOT EXISTS idx_occupancy_room_check_in
+    ON occupancy (room_id, check_in_date);
+
+-- Незавершенные уборки: задачи уборки и отметка комнаты убранной
+CREATE INDEX IF NOT EXISTS idx_cleaning_pending_room
+    ON cleaning (room_id)
+    WHERE completed = FALSE;
+
+-- Вход и блокировка учетной записи по имени пользователя
+CREATE INDEX IF NOT EXISTS idx_app_users_username
+    ON app_users (username);
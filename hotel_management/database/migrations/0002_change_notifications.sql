@@ -0,0 +1,42 @@
+-- Уведомления клиентов об изменениях (клиенты слушают канал hotel_changes)
+-- Полезная нагрузка компактная: таблица, операция, id строки и номер комнаты
+CREATE OR REPLACE FUNCTION notify_hotel_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_data JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+
+    PERFORM pg_notify('hotel_changes', json_build_object(
+        't', TG_TABLE_NAME,
+        'op', left(TG_OP, 1),
+        'id', row_data ->> TG_ARGV[0],
+        'room', row_data ->> 'room_id'
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_occupancy_notify ON occupancy;
+CREATE TRIGGER tr_occupancy_notify
+AFTER INSERT OR UPDATE OR DELETE ON occupancy
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('occupancy_id');
+
+DROP TRIGGER IF EXISTS tr_cleaning_notify ON cleaning;
+CREATE TRIGGER tr_cleaning_notify
+AFTER INSERT OR UPDATE OR DELETE ON cleaning
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('cleaning_id');
+
+DROP TRIGGER IF EXISTS tr_rooms_notify ON rooms;
+CREATE TRIGGER tr_rooms_notify
+AFTER INSERT OR UPDATE OR DELETE ON rooms
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('room_id');
+
+DROP TRIGGER IF EXISTS tr_guests_notify ON guests;
+CREATE TRIGGER tr_guests_notify
+AFTER INSERT OR UPDATE OR DELETE ON guests
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('guest_id');
@@ -0,0 +1,18 @@
+-- Отметка времени изменения брони: клиенты дочитывают только измененные строки
+ALTER TABLE occupancy
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+
+CREATE INDEX IF NOT EXISTS idx_occupancy_updated_at ON occupancy (updated_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_occupancy_touch ON occupancy;
+CREATE TRIGGER tr_occupancy_touch
+BEFORE UPDATE ON occupancy
+FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
@@ -0,0 +1,7 @@
+-- Поиск гостей: постраничная выборка по (full_name, guest_id)
+-- и поиск подстроки в ФИО и телефоне через триграммы
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_guests_name_id ON guests (full_name, guest_id);
+CREATE INDEX IF NOT EXISTS idx_guests_full_name_trgm ON guests USING gin (full_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_guests_phone_trgm ON guests USING gin (phone_number gin_trgm_ops);
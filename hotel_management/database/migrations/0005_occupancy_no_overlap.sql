@@ -0,0 +1,19 @@
+-- Пересечения броней одного номера запрещает сама БД: период проживания -
+-- полуоткрытый диапазон [заезд, выезд), ограничение исключения проверяется
+-- по индексу GiST. Перед добавлением ограничения пересекающиеся действующие
+-- брони должны быть исправлены вручную.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE occupancy
+    ADD COLUMN IF NOT EXISTS stay DATERANGE
+    GENERATED ALWAYS AS (daterange(check_in_date, check_out_date, '[)')) STORED;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'occupancy_no_overlap') THEN
+        ALTER TABLE occupancy ADD CONSTRAINT occupancy_no_overlap
+            EXCLUDE USING gist (room_id WITH =, stay WITH &&)
+            WHERE (status IN ('booked', 'checked_in'));
+    END IF;
+END;
+$$;
@@ -0,0 +1,152 @@
+-- Отчеты: дневные сводки, которые триггеры поддерживают инкрементально.
+-- Изменение строки вычитает вклад старой версии и добавляет вклад новой,
+-- поэтому отчет за месяц или год читает по строке на день и не сканирует
+-- occupancy и cleaning.
+-- Ночи считаются по полуоткрытому периоду [заезд, выезд); отмены - по дате
+-- запланированного заезда.
+CREATE TABLE IF NOT EXISTS report_daily_stays (
+    day DATE PRIMARY KEY,
+    occupied_rooms INTEGER NOT NULL DEFAULT 0,
+    arrivals INTEGER NOT NULL DEFAULT 0,
+    departures INTEGER NOT NULL DEFAULT 0,
+    cancellations INTEGER NOT NULL DEFAULT 0
+);
+
+-- Уборки: запрошенные - по дате запроса, выполненные и время выполнения - по дате уборки
+CREATE TABLE IF NOT EXISTS report_daily_housekeeping (
+    day DATE PRIMARY KEY,
+    requested INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    turnaround_count INTEGER NOT NULL DEFAULT 0,
+    turnaround_seconds DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION report_count_stay(booking occupancy, sign INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF booking.status = 'cancelled' THEN
+        INSERT INTO report_daily_stays AS r (day, cancellations)
+        VALUES (booking.check_in_date, sign)
+        ON CONFLICT (day) DO UPDATE SET cancellations = r.cancellations + EXCLUDED.cancellations;
+        RETURN;
+    END IF;
+
+    INSERT INTO report_daily_stays AS r (day, occupied_rooms)
+    SELECT night::date, sign
+    FROM generate_series(booking.check_in_date, booking.check_out_date - 1, interval '1 day') AS night
+    ON CONFLICT (day) DO UPDATE SET occupied_rooms = r.occupied_rooms + EXCLUDED.occupied_rooms;
+
+    INSERT INTO report_daily_stays AS r (day, arrivals)
+    VALUES (booking.check_in_date, sign)
+    ON CONFLICT (day) DO UPDATE SET arrivals = r.arrivals + EXCLUDED.arrivals;
+
+    INSERT INTO report_daily_stays AS r (day, departures)
+    VALUES (booking.check_out_date, sign)
+    ON CONFLICT (day) DO UPDATE SET departures = r.departures + EXCLUDED.departures;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_count_cleaning(task cleaning, sign INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF COALESCE(task.requested_at, task.cleaning_date) IS NOT NULL THEN
+        INSERT INTO report_daily_housekeeping AS r (day, requested)
+        VALUES (COALESCE(task.requested_at, task.cleaning_date)::date, sign)
+        ON CONFLICT (day) DO UPDATE SET requested = r.requested + EXCLUDED.requested;
+    END IF;
+
+    IF task.completed AND task.cleaned_at IS NOT NULL THEN
+        INSERT INTO report_daily_housekeeping AS r (day, completed, turnaround_count, turnaround_seconds)
+        VALUES (
+            task.cleaned_at::date,
+            sign,
+            CASE WHEN task.requested_at IS NULL THEN 0 ELSE sign END,
+            CASE WHEN task.requested_at IS NULL THEN 0
+                 ELSE sign * EXTRACT(EPOCH FROM task.cleaned_at - task.requested_at) END
+        )
+        ON CONFLICT (day) DO UPDATE SET
+            completed = r.completed + EXCLUDED.completed,
+            turnaround_count = r.turnaround_count + EXCLUDED.turnaround_count,
+            turnaround_seconds = r.turnaround_seconds + EXCLUDED.turnaround_seconds;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_occupancy_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.status = OLD.status
+       AND NEW.check_in_date = OLD.check_in_date
+       AND NEW.check_out_date = OLD.check_out_date THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM report_count_stay(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM report_count_stay(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_cleaning_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM report_count_cleaning(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM report_count_cleaning(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Начальное заполнение сводок (один раз, пока они пусты) и подключение триггеров;
+-- миграция выполняется в транзакции, исходные таблицы заблокированы от изменений
+LOCK TABLE occupancy, cleaning IN SHARE MODE;
+
+INSERT INTO report_daily_stays (day, occupied_rooms, arrivals, departures, cancellations)
+SELECT day, SUM(occupied_rooms), SUM(arrivals), SUM(departures), SUM(cancellations)
+FROM (
+    SELECT night::date AS day, 1 AS occupied_rooms, 0 AS arrivals, 0 AS departures, 0 AS cancellations
+    FROM occupancy, generate_series(check_in_date, check_out_date - 1, interval '1 day') AS night
+    WHERE status <> 'cancelled'
+    UNION ALL
+    SELECT check_in_date, 0, 1, 0, 0 FROM occupancy WHERE status <> 'cancelled'
+    UNION ALL
+    SELECT check_out_date, 0, 0, 1, 0 FROM occupancy WHERE status <> 'cancelled'
+    UNION ALL
+    SELECT check_in_date, 0, 0, 0, 1 FROM occupancy WHERE status = 'cancelled'
+) AS stay_days
+WHERE NOT EXISTS (SELECT 1 FROM report_daily_stays)
+GROUP BY day;
+
+INSERT INTO report_daily_housekeeping (day, requested, completed, turnaround_count, turnaround_seconds)
+SELECT day, SUM(requested), SUM(completed), SUM(turnaround_count), SUM(turnaround_seconds)
+FROM (
+    SELECT COALESCE(requested_at, cleaning_date)::date AS day,
+           1 AS requested, 0 AS completed, 0 AS turnaround_count, 0::double precision AS turnaround_seconds
+    FROM cleaning
+    WHERE COALESCE(requested_at, cleaning_date) IS NOT NULL
+    UNION ALL
+    SELECT cleaned_at::date, 0, 1,
+           CASE WHEN requested_at IS NULL THEN 0 ELSE 1 END,
+           COALESCE(EXTRACT(EPOCH FROM cleaned_at - requested_at), 0)
+    FROM cleaning
+    WHERE completed AND cleaned_at IS NOT NULL
+) AS cleaning_days
+WHERE NOT EXISTS (SELECT 1 FROM report_daily_housekeeping)
+GROUP BY day;
+
+DROP TRIGGER IF EXISTS tr_occupancy_report ON occupancy;
+CREATE TRIGGER tr_occupancy_report
+AFTER INSERT OR UPDATE OR DELETE ON occupancy
+FOR EACH ROW EXECUTE FUNCTION report_occupancy_change();
+
+DROP TRIGGER IF EXISTS tr_cleaning_report ON cleaning;
+CREATE TRIGGER tr_cleaning_report
+AFTER INSERT OR UPDATE OR DELETE ON cleaning
+FOR EACH ROW EXECUTE FUNCTION report_cleaning_change();
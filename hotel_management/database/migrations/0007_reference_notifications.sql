@@ -0,0 +1,16 @@
+-- Уведомления об изменении справочников: клиенты перечитывают кэш справочников,
+-- сервер приложения сбрасывает общий кэш чтений
+DROP TRIGGER IF EXISTS tr_roles_notify ON roles;
+CREATE TRIGGER tr_roles_notify
+AFTER INSERT OR UPDATE OR DELETE ON roles
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('role_id');
+
+DROP TRIGGER IF EXISTS tr_statuses_notify ON statuses;
+CREATE TRIGGER tr_statuses_notify
+AFTER INSERT OR UPDATE OR DELETE ON statuses
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('status_id');
+
+DROP TRIGGER IF EXISTS tr_room_categories_notify ON room_categories;
+CREATE TRIGGER tr_room_categories_notify
+AFTER INSERT OR UPDATE OR DELETE ON room_categories
+FOR EACH ROW EXECUTE FUNCTION notify_hotel_change('category_id');
@@ -0,0 +1,193 @@
+import hashlib
+import re
+from collections import namedtuple
+from pathlib import Path
+from hotel_management.database.connector import DatabaseConnector
+
+Migration = namedtuple('Migration', ['version', 'name', 'sql', 'checksum'])
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+SQL_COMMENT = re.compile(r'--[^\n]*')
+
+# Объекты схемы, которые создают миграции: после миграций каждый из них (кроме
+# удаленных последующими миграциями) должен существовать. existing - запрос
+# имен из списка %s, которые есть в БД; имя столбца - "таблица.столбец"
+SchemaObject = namedtuple('SchemaObject', ['title', 'created', 'dropped', 'existing'])
+
+SCHEMA_OBJECTS = (
+    SchemaObject(
+        'расширения',
+        re.compile(r'CREATE\s+EXTENSION\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        re.compile(r'DROP\s+EXTENSION\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        "SELECT extname FROM pg_extension WHERE extname = ANY(%s)"
+    ),
+    SchemaObject(
+        'таблицы',
+        re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        re.compile(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        """
+        SELECT tablename FROM pg_tables
+        WHERE schemaname = ANY(current_schemas(false)) AND tablename = ANY(%s)
+        """
+    ),
+    SchemaObject(
+        'столбцы',
+        re.compile(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(\w+)\s+'
+                   r'ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        re.compile(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(\w+)\s+'
+                   r'DROP\s+COLUMN\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        """
+        SELECT table_name || '.' || column_name FROM information_schema.columns
+        WHERE table_schema = ANY(current_schemas(false)) AND table_name || '.' || column_name = ANY(%s)
+        """
+    ),
+    SchemaObject(
+        'индексы',
+        re.compile(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)',
+                   re.IGNORECASE),
+        re.compile(r'DROP\s+INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        """
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = ANY(current_schemas(false)) AND indexname = ANY(%s)
+        """
+    ),
+    SchemaObject(
+        'ограничения',
+        re.compile(r'ADD\s+CONSTRAINT\s+(\w+)', re.IGNORECASE),
+        re.compile(r'DROP\s+CONSTRAINT\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        "SELECT conname FROM pg_constraint WHERE conname = ANY(%s)"
+    ),
+    SchemaObject(
+        'функции',
+        re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(\w+)', re.IGNORECASE),
+        re.compile(r'DROP\s+FUNCTION\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        """
+        SELECT p.proname FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname = ANY(current_schemas(false)) AND p.proname = ANY(%s)
+        """
+    ),
+    SchemaObject(
+        'триггеры',
+        re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\s+(\w+)', re.IGNORECASE),
+        re.compile(r'DROP\s+TRIGGER\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE),
+        "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal AND tgname = ANY(%s)"
+    )
+)
+
+class SchemaDriftError(Exception):
+    """Схема БД не соответствует миграциям приложения"""
+
+
+class Migrator:
+    """
+    Версионированные миграции схемы: файлы NNNN_описание.sql в этом каталоге.
+    Примененные миграции записываются в schema_migrations вместе с контрольной
+    суммой. Перед работой приложение применяет недостающие миграции и
+    отказывается запускаться, если схема разошлась с ними: изменен уже
+    примененный файл, в БД есть неизвестная приложению версия или удален
+    объект, созданный миграцией (таблица, столбец, индекс, ограничение,
+    функция, триггер, расширение). Миграции идемпотентны: их можно применить
+    к базе, где часть объектов уже создана вручную.
+    """
+    # Ключ рекомендательной блокировки: клиенты, запущенные одновременно, применяют миграции по очереди
+    LOCK_KEY = 7_245_110_001
+
+    def __init__(self, directory=MIGRATIONS_DIR):
+        self.directory = Path(directory)
+
+    def discover(self):
+        """Миграции из каталога по возрастанию версии"""
+        migrations = []
+        for path in sorted(self.directory.glob('*.sql')):
+            match = MIGRATION_FILE.match(path.name)
+            if not match:
+                raise SchemaDriftError(f"Неверное имя файла миграции: {path.name}")
+            # Контрольная сумма не зависит от окончаний строк в рабочей копии
+            sql = path.read_text(encoding='utf-8').replace('\r\n', '\n')
+            checksum = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+            migrations.append(Migration(int(match.group(1)), match.group(2), sql, checksum))
+
+        for expected, migration in enumerate(migrations, 1):
+            if migration.version != expected:
+                raise SchemaDriftError(f"Пропущена или повторена версия миграции {expected:04d}")
+        return migrations
+
+    def migrate(self, apply=True):
+        """
+        Проверяет схему и применяет недостающие миграции одной транзакцией
+        :param apply: False - только проверка; недостающие миграции считаются расхождением
+        :return: Список примененных версий
+        :raises SchemaDriftError: Схема разошлась с миграциями
+        """
+        migrations = self.discover()
+
+        def work(cursor):
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.LOCK_KEY,))
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    checksum TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            cursor.execute("SELECT version, name, checksum FROM schema_migrations ORDER BY version")
+            applied = {version: (name, checksum) for version, name, checksum in cursor.fetchall()}
+            self._check_applied(applied, migrations)
+
+            pending = [migration for migration in migrations if migration.version not in applied]
+            if pending and not apply:
+                raise SchemaDriftError(
+                    "Не применены миграции: " + ", ".join(f"{m.version:04d}_{m.name}" for m in pending))
+            for migration in pending:
+                cursor.execute(migration.sql)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum)
+                )
+
+            self._check_objects(cursor, migrations)
+            return [migration.version for migration in pending]
+
+        return DatabaseConnector().run_in_transaction(work)
+
+    def _check_applied(self, applied, migrations):
+        known = {migration.version: migration for migration in migrations}
+        unknown = sorted(set(applied) - set(known))
+        if unknown:
+            raise SchemaDriftError(
+                f"В базе данных применены миграции, неизвестные приложению: {unknown}. Обновите приложение")
+        for version, (name, checksum) in applied.items():
+            if known[version].checksum != checksum:
+                raise SchemaDriftError(f"Миграция {version:04d}_{name} изменена после применения")
+
+    def _check_objects(self, cursor, migrations):
+        """Объекты, созданные миграциями (и не удаленные последующими), должны существовать"""
+        missing = []
+        for kind in SCHEMA_OBJECTS:
+            expected = []
+            for migration in migrations:
+                sql = SQL_COMMENT.sub('', migration.sql)
+                # Удаление и повторное создание в одной миграции оставляют объект ожидаемым
+                dropped = {self._object_name(match) for match in kind.dropped.findall(sql)}
+                expected = [name for name in expected if name not in dropped]
+                expected.extend(self._object_name(match) for match in kind.created.findall(sql))
+            if not expected:
+                continue
+
+            cursor.execute(kind.existing, (expected,))
+            absent = sorted(set(expected) - {row[0] for row in cursor.fetchall()})
+            if absent:
+                missing.append(f"{kind.title}: {', '.join(absent)}")
+        if missing:
+            raise SchemaDriftError("Отсутствуют объекты схемы - " + "; ".join(missing))
+
+    @staticmethod
+    def _object_name(match):
+        """Имя объекта из совпадения регулярного выражения (для столбца - "таблица.столбец")"""
+        return '.'.join(match) if isinstance(match, tuple) else match
+
+
+migrator = Migrator()
+
@@ -0,0 +1,25 @@
+"""
+Применение миграций схемы администратором:
+    python -m hotel_management.database.migrations
+    python -m hotel_management.database.migrations --check
+"""
+import argparse
+from hotel_management.database.migrations import migrator, SchemaDriftError
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m hotel_management.database.migrations')
+    parser.add_argument('--check', action='store_true',
+                        help="только проверить схему, не применяя недостающие миграции")
+    args = parser.parse_args()
+
+    try:
+        applied = migrator.migrate(apply=not args.check)
+    except SchemaDriftError as e:
+        print(f"Схема базы данных не соответствует приложению: {e}")
+        raise SystemExit(1)
+    print(f"Применены миграции: {applied}" if applied else "Схема актуальна")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+import json
+import threading
+import time
+from collections import namedtuple
+import psycopg2
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+from hotel_management.config import DB_CONFIG, SERVER_CONFIG
+
+CHANNEL = 'hotel_changes'
+
+# table - таблица, op - I/U/D (R - пересинхронизация после переподключения),
+# row_id - id измененной строки, room_id - комната, к которой она относится
+ChangeEvent = namedtuple('ChangeEvent', ['table', 'op', 'row_id', 'room_id'])
+
+
+def _to_int(value):
+    return int(value) if value is not None else None
+
+
+def parse_event(payload):
+    """ChangeEvent из полезной нагрузки уведомления триггера или None, если она некорректна"""
+    try:
+        payload = json.loads(payload)
+        return ChangeEvent(payload['t'], payload['op'], _to_int(payload.get('id')), _to_int(payload.get('room')))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class _Subscription:
+    def __init__(self, tables, callback, debounce_ms, owner):
+        """
+        Подписка виджета: события копятся и передаются пачкой после паузы debounce_ms
+        :param owner: QObject-владелец; при его удалении подписка снимается
+        """
+        self.tables = frozenset(tables)
+        self.callback = callback
+        self.pending = []
+        self.timer = QTimer(owner)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def push(self, event):
+        self.pending.append(event)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        events, self.pending = self.pending, []
+        if events:
+            self.callback(events)
+
+
+class ChangeBus(QObject):
+    """
+    Единственный на клиента слушатель LISTEN/NOTIFY.
+    Триггеры БД (migrations/0002_change_notifications.sql) публикуют изменения occupancy, cleaning,
+    rooms, guests и справочников; шина раздает их подписанным виджетам.
+    """
+    changed = pyqtSignal(object)
+
+    RECONNECT_MIN_MS = 1000
+    RECONNECT_MAX_MS = 30000
+
+    def __init__(self):
+        super().__init__()
+        self._connection = None
+        self._notifier = None
+        self._subscriptions = []
+        self._reconnect_ms = self.RECONNECT_MIN_MS
+        self._running = False
+
+    @property
+    def active(self):
+        """Слушатель подключен: изменения, в том числе свои, придут через шину"""
+        return self._connection is not None and not self._connection.closed
+
+    def start(self):
+        """Подключается отдельным соединением (вне пула) и подписывается на канал"""
+        self._running = True
+        if self.active:
+            return True
+        try:
+            self._connection = psycopg2.connect(**DB_CONFIG)
+            self._connection.autocommit = True
+            with self._connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+        except psycopg2.Error as e:
+            print(f"Не удалось подписаться на изменения: {e}")
+            self._drop_connection()
+            self._schedule_reconnect()
+            return False
+
+        self._notifier = QSocketNotifier(self._connection.fileno(), QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._poll)
+        if self._reconnect_ms != self.RECONNECT_MIN_MS:
+            # После обрыва часть событий потеряна - подписчики перечитывают данные
+            self._dispatch(ChangeEvent('*', 'R', None, None))
+        self._reconnect_ms = self.RECONNECT_MIN_MS
+        return True
+
+    def stop(self):
+        self._running = False
+        self._drop_connection()
+
+    def subscribe(self, tables, callback, owner, debounce_ms=300):
+        """
+        Подписывает виджет на изменения таблиц
+        :param tables: Имена таблиц
+        :param callback: Функция, принимающая список ChangeEvent
+        :param owner: Виджет-владелец подписки
+        :param debounce_ms: Пауза для объединения серии изменений в один вызов
+        """
+        subscription = _Subscription(tables, callback, debounce_ms, owner)
+        self._subscriptions.append(subscription)
+        owner.destroyed.connect(lambda: self._unsubscribe(subscription))
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _poll(self):
+        try:
+            self._connection.poll()
+        except psycopg2.Error as e:
+            print(f"Соединение для уведомлений потеряно: {e}")
+            self._drop_connection()
+            self._schedule_reconnect()
+            return
+
+        while self._connection.notifies:
+            event = parse_event(self._connection.notifies.pop(0).payload)
+            if event is not None:
+                self._dispatch(event)
+
+    def _dispatch(self, event):
+        self.changed.emit(event)
+        for subscription in list(self._subscriptions):
+            if event.table == '*' or event.table in subscription.tables:
+                subscription.push(event)
+
+    def _drop_connection(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except psycopg2.Error:
+                pass
+            self._connection = None
+
+    def _schedule_reconnect(self):
+        if not self._running:
+            return
+        QTimer.singleShot(self._reconnect_ms, self.start)
+        self._reconnect_ms = min(self._reconnect_ms * 2, self.RECONNECT_MAX_MS)
+
+
+class RemoteChangeBus(ChangeBus):
+    """
+    Шина изменений клиента сервера приложения (SERVER_CONFIG['url']).
+    Вместо собственного LISTEN клиент длинными опросами забирает изменения,
+    которые сервер получил своим единственным слушателем; подписка и
+    раздача событий виджетам - как у ChangeBus.
+    """
+    received = pyqtSignal(object)
+
+    def __init__(self, client):
+        """:param client: ServerClient"""
+        super().__init__()
+        self._client = client
+        self._thread = None
+        self._connected = False
+        # События приходят из потока опроса, раздаются в потоке GUI
+        self.received.connect(self._deliver)
+
+    @property
+    def active(self):
+        return self._connected
+
+    def start(self):
+        self._running = True
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._listen, name='change-events', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        self._running = False
+
+    def _listen(self):
+        # -1: сервер сразу вернет текущий номер изменения без событий
+        after = -1
+        delay_ms = self.RECONNECT_MIN_MS
+        while self._running:
+            try:
+                after, events = self._client.events(after)
+            except (OSError, RuntimeError) as e:
+                if self._connected:
+                    print(f"Соединение с сервером приложения потеряно: {e}")
+                self._connected = False
+                time.sleep(delay_ms / 1000)
+                delay_ms = min(delay_ms * 2, self.RECONNECT_MAX_MS)
+                continue
+            self._connected = True
+            delay_ms = self.RECONNECT_MIN_MS
+            if events:
+                self.received.emit(events)
+
+    def _deliver(self, events):
+        for event in events:
+            self._dispatch(ChangeEvent(*event))
+
+
+_change_bus = None
+
+
+def change_bus():
+    """Шина изменений приложения (создается при первом обращении, нужен QApplication)"""
+    global _change_bus
+    if _change_bus is None:
+        if SERVER_CONFIG['url']:
+            from hotel_management.server.client import server_client
+            _change_bus = RemoteChangeBus(server_client())
+        else:
+            _change_bus = ChangeBus()
+    return _change_bus
@@ -1,31 +1,282 @@
-class RoomQueries:
-    GET_ALL = """
-    SELECT r.room_id, r.floor, rc.name, s.name 
-    FROM rooms r
-    JOIN room_categories rc ON r.category_id = rc.category_id
-    JOIN statuses s ON r.status_id = s.status_id
-    """
-
-class GuestQueries:
-    GET_ALL = "SELECT guest_id, full_name, phone_number FROM guests"
-    
-class BookingQueries:
-    GET_ACTIVE = """
-    SELECT o.occupancy_id, g.full_name, r.room_id, o.check_in_date, o.check_out_date
-    FROM occupancy o
-    JOIN guests g ON o.guest_id = g.guest_id
-    JOIN rooms r ON o.room_id = r.room_id
-    WHERE o.check_out_date >= CURRENT_DATE
-    """
-
-class CleaningQueries:
-    GET_PENDING = """
-    SELECT c.cleaning_id, r.room_id, s.name 
-    FROM cleaning c
-    JOIN rooms r ON c.room_id = r.room_id
-    JOIN statuses s ON c.status_id = s.status_id
-    WHERE s.name = 'Требует уборки'
-    """
-class RoleQueries:
-    GET_ALL = "SELECT role_id, name FROM roles ORDER BY role_id"
-    CREATE = "INSERT INTO roles (name) VALUES (%s) RETURNING role_id"
\ No newline at end of file
+import threading
+from collections import Counter
+from psycopg2 import errors
+
+
+# Категории, статусы и роли возвращаются как id:
+# названия подставляет клиент из кэша справочников (database/reference_data.py)
+class RoomQueries:
+    GET_ALL = """
+    SELECT r.room_id, r.floor, r.category_id, r.status_id
+    FROM rooms r
+    ORDER BY r.room_id
+    """
+    GET_FREE = """
+    SELECT r.room_id, r.floor, r.category_id
+    FROM rooms r
+    WHERE r.status_id = 1
+    ORDER BY r.room_id
+    """
+
+class GuestQueries:
+    GET_ALL = "SELECT guest_id, full_name, phone_number, age FROM guests ORDER BY full_name"
+    # Подсказки при выборе гостя: $1 - шаблон начала ФИО или телефона ('ив%'), $2 - лимит
+    LOOKUP = """
+    SELECT guest_id, full_name, phone_number
+    FROM guests
+    WHERE full_name ILIKE $1 OR phone_number LIKE $1
+    ORDER BY full_name, guest_id
+    LIMIT $2
+    """
+    # Постраничная выборка по ключу (full_name, guest_id): следующая страница
+    # начинается сразу после последней строки предыдущей, поэтому ее стоимость
+    # не зависит от глубины прокрутки (индекс idx_guests_name_id)
+    # $1 - размер страницы
+    PAGE_FIRST = """
+    SELECT guest_id, full_name, phone_number, age
+    FROM guests
+    ORDER BY full_name, guest_id
+    LIMIT $1
+    """
+    # $1, $2 - ФИО и id последнего гостя предыдущей страницы, $3 - размер страницы
+    PAGE_NEXT = """
+    SELECT guest_id, full_name, phone_number, age
+    FROM guests
+    WHERE (full_name, guest_id) > ($1, $2)
+    ORDER BY full_name, guest_id
+    LIMIT $3
+    """
+    # Поиск подстроки в ФИО или телефоне (триграммные индексы)
+    # $1 - шаблон ILIKE вида '%текст%', $2 - размер страницы
+    SEARCH_FIRST = """
+    SELECT guest_id, full_name, phone_number, age
+    FROM guests
+    WHERE full_name ILIKE $1 OR phone_number ILIKE $1
+    ORDER BY full_name, guest_id
+    LIMIT $2
+    """
+    # $1 - шаблон, $2, $3 - ФИО и id последнего гостя, $4 - размер страницы
+    SEARCH_NEXT = """
+    SELECT guest_id, full_name, phone_number, age
+    FROM guests
+    WHERE (full_name ILIKE $1 OR phone_number ILIKE $1)
+    AND (full_name, guest_id) > ($2, $3)
+    ORDER BY full_name, guest_id
+    LIMIT $4
+    """
+
+class BookingQueries:
+    GET_ACTIVE = """
+    SELECT
+        occupancy.occupancy_id,
+        guests.full_name,
+        rooms.room_id,
+        occupancy.check_in_date,
+        occupancy.check_out_date,
+        occupancy.status,
+        occupancy.updated_at
+    FROM occupancy
+    JOIN guests ON occupancy.guest_id = guests.guest_id
+    JOIN rooms ON occupancy.room_id = rooms.room_id
+    WHERE occupancy.status IN ('booked', 'checked_in')
+    AND occupancy.check_out_date >= CURRENT_DATE
+    ORDER BY occupancy.check_in_date, occupancy.occupancy_id
+    """
+    # Брони, измененные после отметки $1 (в любом статусе - чтобы убрать ставшие неактивными)
+    GET_CHANGED = """
+    SELECT
+        occupancy.occupancy_id,
+        guests.full_name,
+        occupancy.room_id,
+        occupancy.check_in_date,
+        occupancy.check_out_date,
+        occupancy.status,
+        occupancy.updated_at
+    FROM occupancy
+    JOIN guests ON occupancy.guest_id = guests.guest_id
+    WHERE occupancy.updated_at > $1
+    ORDER BY occupancy.updated_at
+    """
+    # Действующие брони, пересекающиеся с окном [$1, $2) шахматки
+    # (условие по stay использует GiST-индекс ограничения occupancy_no_overlap)
+    GET_RANGE = """
+    SELECT
+        occupancy.room_id,
+        occupancy.check_in_date,
+        occupancy.check_out_date,
+        occupancy.status,
+        guests.full_name
+    FROM occupancy
+    JOIN guests ON occupancy.guest_id = guests.guest_id
+    WHERE occupancy.status IN ('booked', 'checked_in')
+    AND occupancy.stay && daterange($1::date, $2::date, '[)')
+    """
+    # Ночной аудит на дату %(day)s: выселение всех заселенных с наступившей датой
+    # выезда (дата выезда - как при обычном выселении) и уборка их номеров без дублей
+    # незавершенной уборки. Возвращает число выселений, число задач уборки и номера.
+    # Статус номеров меняется отдельным запросом (NIGHT_AUDIT_ROOMS): строчные AFTER-триггеры
+    # INSERT в cleaning срабатывают в конце запроса и вернули бы номерам статус "Свободен".
+    NIGHT_AUDIT = """
+    WITH departed AS (
+        UPDATE occupancy
+        SET
+            status = 'checked_out',
+            check_out_date = GREATEST(%(day)s, check_in_date + 1)
+        WHERE status = 'checked_in'
+        AND check_out_date <= %(day)s
+        RETURNING room_id
+    ), rooms_to_clean AS (
+        SELECT DISTINCT room_id FROM departed
+    ), cleaning_requested AS (
+        INSERT INTO cleaning (room_id, status_id, cleaning_date, completed, requested_at)
+        SELECT rooms_to_clean.room_id, 2, NOW(), FALSE, NOW()
+        FROM rooms_to_clean
+        WHERE NOT EXISTS (
+            SELECT 1 FROM cleaning
+            WHERE cleaning.room_id = rooms_to_clean.room_id AND NOT cleaning.completed
+        )
+        RETURNING room_id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM departed),
+        (SELECT COUNT(*) FROM cleaning_requested),
+        ARRAY(SELECT room_id FROM rooms_to_clean)
+    """
+    NIGHT_AUDIT_ROOMS = """
+    UPDATE rooms
+    SET status_id = 2  -- "Требует уборки"
+    WHERE room_id = ANY(%s)
+    """
+
+# Данные для расчета занятости в памяти (database/availability.py)
+class AvailabilityQueries:
+    GET_ROOMS = "SELECT room_id, floor, category_id FROM rooms ORDER BY room_id"
+    GET_STAYS = """
+    SELECT occupancy_id, room_id, check_in_date, check_out_date, updated_at
+    FROM occupancy
+    WHERE status IN ('booked', 'checked_in')
+    AND check_out_date >= CURRENT_DATE
+    """
+
+class CleaningQueries:
+    GET_PENDING = """
+    SELECT r.room_id, r.floor, r.category_id
+    FROM cleaning cl
+    JOIN rooms r ON cl.room_id = r.room_id
+    WHERE cl.completed = FALSE
+    ORDER BY r.room_id
+    """
+
+class UserQueries:
+    GET_ALL = """
+    SELECT u.user_id, u.username, u.role_id,
+           CASE WHEN u.locked_until IS NULL OR u.locked_until < NOW()
+           THEN 'Активен' ELSE 'Заблокирован' END,
+           COALESCE(TO_CHAR(u.locked_until, 'DD.MM.YYYY HH24:MI'), '-')
+    FROM app_users u
+    ORDER BY u.user_id
+    """
+
+class RoleQueries:
+    CREATE = "INSERT INTO roles (name) VALUES (%s) RETURNING role_id"
+
+# Отчеты по дневным сводкам (поддерживаются триггерами, см. migrations/0006_daily_reports.sql)
+class ReportQueries:
+    # По строке на каждый день периода [$1, $2], включая дни без событий
+    DAILY = """
+    SELECT
+        days.day::date,
+        COALESCE(stays.occupied_rooms, 0),
+        COALESCE(stays.arrivals, 0),
+        COALESCE(stays.departures, 0),
+        COALESCE(stays.cancellations, 0),
+        COALESCE(housekeeping.requested, 0),
+        COALESCE(housekeeping.completed, 0),
+        COALESCE(housekeeping.turnaround_count, 0),
+        COALESCE(housekeeping.turnaround_seconds, 0)
+    FROM generate_series($1::date, $2::date, interval '1 day') AS days(day)
+    LEFT JOIN report_daily_stays stays ON stays.day = days.day::date
+    LEFT JOIN report_daily_housekeeping housekeeping ON housekeeping.day = days.day::date
+    ORDER BY days.day
+    """
+    COUNT_ROOMS = "SELECT COUNT(*) FROM rooms"
+
+
+class PreparedStatementRegistry:
+    """
+    Реестр именованных запросов. Каждый запрос объявляется один раз,
+    подготавливается (PREPARE) на соединении при первом использовании
+    и дальше выполняется по имени через EXECUTE без повторного планирования.
+    Параметры в тексте запроса обозначаются как $1, $2, ...
+    """
+
+    def __init__(self):
+        self._statements = {}
+        self._executions = Counter()
+        self._lock = threading.Lock()
+
+    def register(self, name, sql):
+        """
+        Объявляет запрос
+        :param name: Имя (SQL-идентификатор)
+        :param sql: Текст запроса с параметрами $1, $2, ...
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Недопустимое имя запроса: {name}")
+        self._statements[name] = sql
+
+    def names(self):
+        return sorted(self._statements)
+
+    def prepare(self, connection, name):
+        """Подготавливает запрос на соединении, если это еще не сделано"""
+        if name not in self._statements:
+            raise KeyError(f"Запрос {name} не зарегистрирован")
+        if name in connection.prepared_statements:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"PREPARE {name} AS {self._statements[name]}")
+        connection.prepared_statements.add(name)
+
+    def execute(self, cursor, name, params=()):
+        """
+        Выполняет подготовленный запрос на курсоре
+        :param cursor: Курсор соединения из пула
+        :param name: Имя зарегистрированного запроса
+        :param params: Значения параметров $1, $2, ...
+        """
+        connection = cursor.connection
+        self.prepare(connection, name)
+        params = tuple(params or ())
+        try:
+            if params:
+                placeholders = ", ".join(["%s"] * len(params))
+                cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+        except errors.InvalidSqlStatementName:
+            # Сервер потерял подготовленный запрос - подготовим заново при следующем вызове
+            connection.prepared_statements.discard(name)
+            raise
+        with self._lock:
+            self._executions[name] += 1
+
+    def execution_counts(self):
+        """Количество выполнений по каждому запросу"""
+        with self._lock:
+            return dict(self._executions)
+
+
+statements = PreparedStatementRegistry()
+statements.register('room_get_all', RoomQueries.GET_ALL)
+statements.register('room_get_free', RoomQueries.GET_FREE)
+statements.register('guest_lookup', GuestQueries.LOOKUP)
+statements.register('guest_page_first', GuestQueries.PAGE_FIRST)
+statements.register('guest_page_next', GuestQueries.PAGE_NEXT)
+statements.register('guest_search_first', GuestQueries.SEARCH_FIRST)
+statements.register('guest_search_next', GuestQueries.SEARCH_NEXT)
+statements.register('booking_get_active', BookingQueries.GET_ACTIVE)
+statements.register('booking_get_changed', BookingQueries.GET_CHANGED)
+statements.register('booking_get_range', BookingQueries.GET_RANGE)
+statements.register('cleaning_get_pending', CleaningQueries.GET_PENDING)
+statements.register('report_daily', ReportQueries.DAILY)
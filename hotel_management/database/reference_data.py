@@ -0,0 +1,131 @@
+import threading
+import time
+from hotel_management.config import SERVER_CONFIG
+from hotel_management.database.connector import DatabaseConnector
+
+
+class ReferenceData:
+    """
+    Кэш справочников (роли, статусы, категории номеров) в памяти процесса.
+    Загружается один раз при входе; запросы возвращают только id,
+    а названия подставляются на стороне клиента. Клиент сервера
+    приложения получает справочники от сервера.
+    При изменении справочника в БД (уведомление шины изменений) он
+    перечитывается в рабочем потоке; до замены действуют старые данные.
+    После неудачной загрузки справочник RETRY_SECONDS считается пустым,
+    чтобы отрисовка таблиц не обращалась к БД на каждую ячейку.
+    """
+    TABLES = {
+        'roles': "SELECT role_id, name FROM roles ORDER BY role_id",
+        'statuses': "SELECT status_id, name FROM statuses ORDER BY status_id",
+        'room_categories': "SELECT category_id, name FROM room_categories ORDER BY category_id"
+    }
+    # Пауза перед повторной загрузкой справочника после ошибки, сек
+    RETRY_SECONDS = 30
+
+    def __init__(self):
+        self._data = {}
+        # Справочник -> время (time.monotonic), до которого загрузка не повторяется
+        self._retry_at = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def track(self, bus, executor=None):
+        """
+        Подписывается на изменения справочников
+        :param executor: QueryExecutor - загрузки выполняются в рабочем потоке,
+                         без него - в потоке вызова
+        """
+        self._executor = executor
+        bus.subscribe(list(self.TABLES), self.apply_events, bus)
+
+    def apply_events(self, events):
+        """Обработчик шины изменений: перечитывает измененные справочники"""
+        tables = {event.table for event in events}
+        self.reload(self.TABLES if '*' in tables else [table for table in self.TABLES if table in tables])
+
+    def reload(self, tables, rerun=True):
+        """Загружает справочники заново, не сбрасывая текущие данные до получения новых"""
+        tables = sorted(tables)
+        if not tables:
+            return
+        if self._executor is None:
+            self.load(tables)
+        else:
+            self._executor.submit(self.load, tables, key=(id(self), 'load', tuple(tables)), rerun=rerun)
+
+    def fetch(self, tables=None):
+        """
+        Чтение справочников из БД одной транзакцией
+        :param tables: Имена справочников (по умолчанию все)
+        :return: {имя справочника: [(id, название), ...]}
+        """
+        def read(cursor):
+            rows = {}
+            for table in tables or self.TABLES:
+                cursor.execute(self.TABLES[table])
+                rows[table] = cursor.fetchall()
+            return rows
+        return DatabaseConnector().run_in_transaction(read)
+
+    def load(self, tables=None):
+        """
+        Загружает справочники из БД или с сервера приложения
+        :param tables: Имена справочников (по умолчанию все)
+        :return: True, если все справочники загружены
+        """
+        tables = list(tables or self.TABLES)
+        try:
+            if SERVER_CONFIG['url']:
+                from hotel_management.server.client import server_client
+                rows = server_client().call('reference.fetch', tables)
+            else:
+                rows = self.fetch(tables)
+        except Exception as e:
+            print(f"Ошибка загрузки справочников: {e}")
+            with self._lock:
+                for table in tables:
+                    self._retry_at[table] = time.monotonic() + self.RETRY_SECONDS
+            return False
+
+        with self._lock:
+            self._data.update({table: dict(table_rows) for table, table_rows in rows.items()})
+            for table in tables:
+                self._retry_at.pop(table, None)
+        return True
+
+    def _table(self, table):
+        """Данные справочника; незагруженный справочник загружается (в фоне при наличии executor)"""
+        with self._lock:
+            data = self._data.get(table)
+            retry = data is None and self._retry_at.get(table, 0) <= time.monotonic()
+        if not retry:
+            return data or {}
+        if self._executor is not None:
+            # Таблица покажет названия при следующей отрисовке после загрузки
+            self.reload([table], rerun=False)
+            return {}
+        self.load([table])
+        with self._lock:
+            return self._data.get(table, {})
+
+    def name(self, table, key, default=""):
+        """Название записи справочника по id"""
+        return self._table(table).get(key, default)
+
+    def items(self, table):
+        """Список (id, название) в порядке id"""
+        return sorted(self._table(table).items())
+
+    def invalidate(self, table=None):
+        """Сбрасывает справочник (или все); следующее обращение загрузит его заново"""
+        with self._lock:
+            if table is None:
+                self._data.clear()
+                self._retry_at.clear()
+            else:
+                self._data.pop(table, None)
+                self._retry_at.pop(table, None)
+
+
+reference_data = ReferenceData()
@@ -1,26 +1,73 @@
-import sys
-from PyQt6.QtWidgets import QApplication
-from hotel_management.ui.auth.login_window import LoginWindow
-from hotel_management.ui.admin.admin_dashboard import AdminDashboard
-
-class MainApp:
-    def __init__(self):
-        """Инициализация главного приложения"""
-        self.app = QApplication(sys.argv)
-        self.login_window = LoginWindow()
-        self.login_window.login_success.connect(self.on_login_success)
-        self.login_window.show()
-        
-    def on_login_success(self, user_id, role_id):
-        """Обработчик успешного входа"""
-        self.main_window = AdminDashboard(user_id, role_id)
-        self.main_window.show()
-        self.login_window.close()
-        
-    def run(self):
-        """Запуск приложения"""
-        sys.exit(self.app.exec())
-
-if __name__ == "__main__":
-    app = MainApp()
+import sys
+from psycopg2 import Error as DatabaseError, OperationalError
+from PyQt6.QtWidgets import QApplication, QMessageBox
+from hotel_management.ui.auth.login_window import LoginWindow
+from hotel_management.ui.admin.admin_dashboard import AdminDashboard
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.reference_data import reference_data
+from hotel_management.database.notifications import change_bus
+from hotel_management.database.background import query_executor
+from hotel_management.database.availability import availability
+from hotel_management.database.migrations import migrator, SchemaDriftError
+from hotel_management.utils.permissions import permissions
+from hotel_management.config import MIGRATIONS_CONFIG, SERVER_CONFIG
+
+class MainApp:
+    def __init__(self):
+        """Инициализация главного приложения"""
+        self.app = QApplication(sys.argv)
+        # Сначала дожидаемся фоновых запросов, затем закрываем пул
+        self.app.aboutToQuit.connect(query_executor().wait)
+        self.app.aboutToQuit.connect(DatabaseConnector().close)
+        self.app.aboutToQuit.connect(change_bus().stop)
+        if not self.check_schema():
+            sys.exit(1)
+        self.login_window = LoginWindow()
+        self.login_window.login_success.connect(self.on_login_success)
+        self.login_window.show()
+        
+    def check_schema(self):
+        """Применяет миграции схемы; при расхождении схемы с миграциями работа невозможна"""
+        if SERVER_CONFIG['url']:
+            # Схему проверяет сервер приложения
+            return True
+        db = DatabaseConnector()
+        # Одна попытка подключения: окно входа не ждет повторов при недоступном сервере,
+        # об ошибке подключения сообщит вход
+        if not db.connect(attempts=1):
+            return True
+        try:
+            applied = migrator.migrate(apply=MIGRATIONS_CONFIG['auto_apply'])
+        except OperationalError as e:
+            print(f"Не удалось проверить схему базы данных: {e}")
+            return True
+        except (SchemaDriftError, DatabaseError) as e:
+            QMessageBox.critical(None, "Схема базы данных",
+                                 f"Схема базы данных не соответствует приложению:\n{e}")
+            return False
+        finally:
+            db.disconnect()
+        if applied:
+            print(f"Применены миграции схемы: {applied}")
+        return True
+
+    def on_login_success(self, user_id, role_id):
+        """Обработчик успешного входа"""
+        reference_data.load()
+        change_bus().start()
+        reference_data.track(change_bus(), query_executor())
+        if not SERVER_CONFIG['url']:
+            # У клиента сервера приложения права приходят при входе, а занятость номеров считает сервер
+            permissions.track(change_bus())
+            availability.track(change_bus(), query_executor())
+        self.main_window = AdminDashboard(user_id, role_id)
+        self.main_window.show()
+        self.login_window.close()
+        
+    def run(self):
+        """Запуск приложения"""
+        sys.exit(self.app.exec())
+
+if __name__ == "__main__":
+    app = MainApp()
     app.run()
\ No newline at end of file
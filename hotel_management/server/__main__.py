@@ -0,0 +1,48 @@
+"""
+Сервер приложения для рабочих мест (SERVER_CONFIG):
+    python -m hotel_management.server
+    python -m hotel_management.server --host 127.0.0.1 --port 8765
+На клиентах в config.SERVER_CONFIG['url'] указывается адрес сервера.
+
+Сервер не шифрует соединения: пароли и токены сессий передаются открытым
+текстом. Рабочие места подключаются через обратный прокси с TLS
+(например, nginx с proxy_pass http://127.0.0.1:8765 и url https://...);
+слушать внешний адрес (--host 0.0.0.0) без прокси допустимо только в
+изолированной доверенной сети.
+"""
+import argparse
+from psycopg2 import DatabaseError
+from hotel_management.config import SERVER_CONFIG, MIGRATIONS_CONFIG
+from hotel_management.database.migrations import migrator, SchemaDriftError
+from hotel_management.server.app import ApplicationServer
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m hotel_management.server')
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    args = parser.parse_args()
+
+    # Схему проверяет сервер, а не каждое рабочее место:
+    # без проверенной схемы сервер не обслуживает клиентов
+    try:
+        applied = migrator.migrate(apply=MIGRATIONS_CONFIG['auto_apply'])
+    except SchemaDriftError as e:
+        print(f"Схема базы данных не соответствует приложению: {e}")
+        raise SystemExit(1)
+    except DatabaseError as e:
+        print(f"Не удалось проверить схему базы данных: {e}")
+        raise SystemExit(1)
+    if applied:
+        print(f"Применены миграции схемы: {applied}")
+
+    server = ApplicationServer(args.host, args.port)
+    print(f"Сервер приложения запущен на {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Сервер приложения остановлен")
+
+
+if __name__ == '__main__':
+    main()
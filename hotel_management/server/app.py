@@ -0,0 +1,253 @@
+import secrets
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from hotel_management.config import SERVER_CONFIG
+from hotel_management.database.availability import availability
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.reference_data import ReferenceData
+from hotel_management.database.models import ValidationError, BookingConflictError
+from hotel_management.server.protocol import OPERATIONS, encode, decode, restore_rows
+from hotel_management.server.shared import ChangeFeed, SharedReads
+from hotel_management.services.booking_service import BookingService
+from hotel_management.services.cleaning_service import CleaningService
+from hotel_management.services.guest_service import GuestService
+from hotel_management.services.report_service import ReportService
+from hotel_management.services.room_service import RoomService
+from hotel_management.services.user_service import UserService
+from hotel_management.utils.permissions import permissions
+
+# function - метод сервиса; permissions - достаточно любого из прав (пусто - любому вошедшему);
+# reads - таблицы, от которых зависит результат чтения (None - операция изменяет данные);
+# writes - таблицы, кэш которых сбрасывается после изменения;
+# own - без прав разрешено для своей учетной записи (первый аргумент - id пользователя сессии)
+Operation = namedtuple('Operation', ['function', 'permissions', 'reads', 'writes', 'own'], defaults=(False,))
+
+Session = namedtuple('Session', ['user_id', 'role_id', 'expires'])
+
+# Ошибки, которые показываются пользователю как есть (остальные - как сбой сервера)
+CLIENT_ERRORS = (ValidationError, BookingConflictError, PermissionError)
+
+
+def _read(function, permission, tables=()):
+    return Operation(function, permission, tuple(tables), ())
+
+
+def _change(function, permission, tables=()):
+    return Operation(function, permission, None, tuple(tables))
+
+
+def _own(function, permission, tables=()):
+    return Operation(function, permission, None, tuple(tables), True)
+
+
+class ApplicationServer:
+    """
+    Сервер приложения: клиенты вызывают операции сервисов бронирований,
+    гостей, уборки, номеров, отчетов и пользователей и читают справочники
+    по HTTP вместо собственных подключений к БД.
+    Сервер держит общий пул соединений, единственный слушатель изменений
+    (клиенты получают изменения длинными опросами /events), общую занятость
+    номеров и общий кэш чтений с объединением одинаковых запросов.
+    """
+
+    def __init__(self, host=None, port=None):
+        self.feed = ChangeFeed(SERVER_CONFIG['events_keep'])
+        self.reads = SharedReads(SERVER_CONFIG['cache_seconds'], self.feed)
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.users = UserService()
+        self.operations = self._operations()
+        registered = {f"{service}.{name}" for service, names in OPERATIONS.items() for name in names}
+        if set(self.operations) != registered:
+            raise RuntimeError(f"Операции сервера расходятся с protocol.OPERATIONS: "
+                               f"{sorted(set(self.operations) ^ registered)}")
+        self.httpd = ThreadingHTTPServer((host or SERVER_CONFIG['host'], port or SERVER_CONFIG['port']),
+                                         _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self
+
+    def _operations(self):
+        booking, guest, cleaning, users = BookingService(), GuestService(), CleaningService(), self.users
+        rooms, reports, reference = RoomService(), ReportService(), ReferenceData()
+        bookings, guests, rooms_cleaning = ('manage_bookings',), ('manage_guests',), ('manage_cleaning',)
+        admin = ('all',)
+        return {
+            'reference.fetch': _read(reference.fetch, (), ReferenceData.TABLES),
+            'room.list_rooms': _read(rooms.list_rooms, ('manage_rooms',), ['rooms']),
+            'report.daily_report': _read(reports.daily_report, ('view_reports',), ['occupancy', 'cleaning', 'rooms']),
+            'booking.active_bookings': _read(booking.active_bookings, bookings, ['occupancy', 'guests', 'rooms']),
+            'booking.changed_bookings': _read(booking.changed_bookings, bookings),
+            'booking.free_rooms': _read(booking.free_rooms, bookings),
+            'booking.stays_in_range': _read(booking.stays_in_range, bookings, ['occupancy', 'rooms', 'guests']),
+            'booking.create_booking': _change(booking.create_booking, bookings, ['occupancy']),
+            'booking.cancel_booking': _change(booking.cancel_booking, bookings, ['occupancy']),
+            'booking.check_in': _change(booking.check_in, bookings, ['occupancy']),
+            'booking.check_out': _change(booking.check_out, bookings, ['occupancy', 'cleaning']),
+            'booking.night_audit': _change(booking.night_audit, bookings, ['occupancy', 'cleaning', 'rooms']),
+            'guest.page': _read(guest.page, guests, ['guests']),
+            # Подсказки гостей нужны и в форме бронирования
+            'guest.lookup': _read(guest.lookup, guests + bookings, ['guests']),
+            'guest.create_guest': _change(guest.create_guest, guests, ['guests']),
+            'guest.update_guest': _change(guest.update_guest, guests, ['guests']),
+            'guest.delete_guest': _change(guest.delete_guest, guests, ['guests']),
+            'guest.import_guests': _change(guest.import_guests, guests, ['guests']),
+            'cleaning.free_rooms': _read(cleaning.free_rooms, rooms_cleaning, ['rooms']),
+            'cleaning.pending_tasks': _read(cleaning.pending_tasks, rooms_cleaning, ['cleaning', 'rooms']),
+            'cleaning.request_cleaning': _change(cleaning.request_cleaning, rooms_cleaning, ['cleaning', 'rooms']),
+            'cleaning.request_cleaning_many': _change(cleaning.request_cleaning_many, rooms_cleaning,
+                                                      ['cleaning', 'rooms']),
+            'cleaning.mark_cleaned': _change(cleaning.mark_cleaned, rooms_cleaning, ['cleaning', 'rooms']),
+            'user.list_users': _read(users.list_users, admin),
+            'user.create_user': _change(users.create_user, admin),
+            # Свой пароль меняет любой пользователь (сервис проверяет текущий пароль)
+            'user.change_password': _own(users.change_password, admin),
+            'user.set_locked': _change(users.set_locked, admin)
+        }
+
+    def serve_forever(self):
+        """Запускает слушатель изменений и обслуживает клиентов до остановки"""
+        self.feed.start()
+        availability.track(self.feed)
+        # Права ролей проверяются при каждом вызове все время работы сервера
+        permissions.track(self.feed)
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.feed.stop()
+            DatabaseConnector().close()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+    def login(self, username, password):
+        """:return: Данные сессии или None при неверных данных либо заблокированной учетной записи"""
+        user = self.users.authenticate(username, password)
+        if user is None:
+            return None
+        token = secrets.token_urlsafe(32)
+        expires = time.monotonic() + SERVER_CONFIG['session_hours'] * 3600
+        with self._sessions_lock:
+            self.sessions[token] = Session(user.user_id, user.role_id, expires)
+        return {
+            'token': token,
+            'user_id': user.user_id,
+            'username': user.username,
+            'role_id': user.role_id,
+            'permissions': sorted(user.permissions)
+        }
+
+    def session(self, token):
+        """Сессия по токену (None - нет или истекла)"""
+        with self._sessions_lock:
+            session = self.sessions.get(token)
+            if session is not None and session.expires < time.monotonic():
+                del self.sessions[token]
+                session = None
+        return session
+
+    def call(self, session, name, args):
+        """Выполняет операцию от имени пользователя сессии"""
+        operation = self.operations[name]
+        own = operation.own and bool(args) and args[0] == session.user_id
+        if operation.permissions and not own and not any(permissions.has(session.role_id, permission)
+                                                         for permission in operation.permissions):
+            raise PermissionError("Недостаточно прав для этой операции")
+
+        if operation.reads is not None:
+            return self.reads.get((name, encode(args)), operation.reads, lambda: operation.function(*args))
+
+        result = operation.function(*args)
+        # Следующее чтение увидит изменение, не дожидаясь уведомления
+        self.reads.invalidate(operation.writes)
+        return result
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'HotelServer/1.0'
+
+    @property
+    def app(self):
+        return self.server.app
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            self._reply(200, {'ok': True, 'events': self.app.feed.active})
+        elif url.path == '/events':
+            if self._session() is None:
+                return
+            try:
+                after = int(parse_qs(url.query).get('after', ['-1'])[0])
+            except ValueError:
+                self._error(400, 'ValueError', "Некорректный номер изменения")
+                return
+            seq, events = self.app.feed.wait(after, SERVER_CONFIG['events_wait_seconds'])
+            self._reply(200, {'seq': seq, 'events': [list(event) for event in events]})
+        else:
+            self._error(404, 'LookupError', "Неизвестный адрес")
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        try:
+            payload = decode(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError:
+            self._error(400, 'ValueError', "Некорректный запрос")
+            return
+
+        if path == '/login':
+            session = self.app.login(payload.get('username', ''), payload.get('password', ''))
+            if session is None:
+                self._error(401, 'PermissionError', "Неверные учетные данные")
+            else:
+                self._reply(200, session)
+            return
+
+        if not path.startswith('/call/'):
+            self._error(404, 'LookupError', "Неизвестный адрес")
+            return
+        session = self._session()
+        if session is None:
+            return
+        name = path[len('/call/'):]
+        if name not in self.app.operations:
+            self._error(404, 'LookupError', f"Неизвестная операция {name}")
+            return
+
+        try:
+            result = self.app.call(session, name, restore_rows(payload.get('args', [])))
+        except PermissionError as e:
+            self._error(403, 'PermissionError', str(e))
+        except CLIENT_ERRORS as e:
+            self._error(409, type(e).__name__, str(e))
+        except Exception as e:
+            print(f"Ошибка операции {name}: {e}")
+            self._error(500, 'RuntimeError', str(e))
+        else:
+            self._reply(200, {'result': result})
+
+    def _session(self):
+        """Сессия из заголовка Authorization; без нее клиенту отправляется 401"""
+        token = self.headers.get('Authorization', '')[len('Bearer '):]
+        session = self.app.session(token) if token else None
+        if session is None:
+            self._error(401, 'PermissionError', "Сессия истекла, войдите заново")
+        return session
+
+    def _error(self, status, error_type, message):
+        self._reply(status, {'error': {'type': error_type, 'message': message}})
+
+    def _reply(self, status, payload):
+        body = encode(payload)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        # Каждый запрос (в том числе длинные опросы) не журналируется, ошибки - через log_error
+        pass
@@ -0,0 +1,158 @@
+import csv
+import functools
+import threading
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+from hotel_management.config import SERVER_CONFIG
+from hotel_management.database.models import User, ValidationError, BookingConflictError
+from hotel_management.server.protocol import OPERATIONS, encode, decode, restore_rows
+from hotel_management.utils.permissions import permissions
+
+# Исключения, которые сервер передает клиенту по имени; остальные приходят как RuntimeError
+ERRORS = {
+    'ValidationError': ValidationError,
+    'BookingConflictError': BookingConflictError,
+    'PermissionError': PermissionError
+}
+
+
+class ServerClient:
+    """
+    HTTP-клиент сервера приложения. Сессия (токен после входа) общая
+    для всех потоков клиента; каждый запрос - отдельное HTTP-соединение.
+    """
+
+    def __init__(self, url, timeout):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self._token = None
+        self._lock = threading.Lock()
+
+    def login(self, username, password):
+        """
+        Вход на сервере
+        :return: Словарь сессии (user_id, username, role_id, permissions) или None при неверных данных
+        """
+        try:
+            session = self._request('/login', {'username': username, 'password': password})
+        except PermissionError:
+            return None
+        with self._lock:
+            self._token = session.pop('token')
+        return session
+
+    def call(self, operation, *args):
+        """Выполняет операцию сервиса на сервере и возвращает ее результат"""
+        return restore_rows(self._request(f'/call/{operation}', {'args': list(args)})['result'])
+
+    def events(self, after):
+        """
+        Ждет изменений после номера after (длинный опрос)
+        :return: (номер последнего изменения, список (table, op, row_id, room_id))
+        """
+        wait = SERVER_CONFIG['events_wait_seconds']
+        reply = self._request(f"/events?{urlencode({'after': after})}", timeout=wait + self.timeout)
+        return reply['seq'], reply['events']
+
+    def _request(self, path, payload=None, timeout=None):
+        headers = {'Content-Type': 'application/json'}
+        with self._lock:
+            if self._token:
+                headers['Authorization'] = f"Bearer {self._token}"
+        data = encode(payload) if payload is not None else None
+        request = Request(self.url + path, data=data, headers=headers, method='POST' if data else 'GET')
+        try:
+            with urlopen(request, timeout=timeout or self.timeout) as response:
+                return decode(response.read())
+        except HTTPError as e:
+            try:
+                error = decode(e.read())['error']
+            except (ValueError, KeyError, TypeError):
+                raise RuntimeError(f"Ошибка сервера приложения: HTTP {e.code}") from None
+            raise ERRORS.get(error['type'], RuntimeError)(error['message']) from None
+        except URLError as e:
+            raise ConnectionError(f"Сервер приложения недоступен: {e.reason}") from None
+
+
+class RemoteService:
+    """
+    Прокси сервиса на сервере приложения: вызов метода name выполняет
+    операцию '<service>.<name>' на сервере, если сервер ее выполняет
+    (protocol.OPERATIONS). Константы (PAGE_SIZE и т.п.) и методы из
+    LOCAL_METHODS берутся у локального класса сервиса.
+    """
+    LOCAL_METHODS = ()
+
+    def __init__(self, client, service, local_class):
+        self._client = client
+        self._service = service
+        self._local_class = local_class
+        self._operations = OPERATIONS.get(service, ())
+
+    def __getattr__(self, name):
+        value = getattr(self._local_class, name)
+        if name in self.LOCAL_METHODS:
+            return value.__get__(self)
+        if name in self._operations:
+            return functools.partial(self._client.call, f"{self._service}.{name}")
+        if callable(value):
+            raise AttributeError(f"Операция {self._service}.{name} недоступна через сервер приложения")
+        return value
+
+
+class RemoteGuestService(RemoteService):
+    # Разбор строки поиска и файла импорта не требует БД
+    LOCAL_METHODS = ('search_pattern', 'read_csv')
+    EXPORT_PAGE_SIZE = 5000
+
+    def export_csv(self, path):
+        """Выгрузка гостей в CSV на клиенте страницами с сервера (формат как у GuestService)"""
+        exported = 0
+        with open(path, 'w', newline='', encoding='utf-8-sig') as csv_file:
+            writer = csv.writer(csv_file, delimiter=';')
+            writer.writerow(["ФИО", "Телефон", "Возраст", "ID"])
+            last_guest = None
+            while True:
+                batch = self.page(last_guest, None, self.EXPORT_PAGE_SIZE)
+                writer.writerows((name, phone, age, guest_id) for guest_id, name, phone, age in batch)
+                exported += len(batch)
+                if len(batch) < self.EXPORT_PAGE_SIZE:
+                    return exported
+                last_guest = batch[-1]
+
+
+class RemoteUserService(RemoteService):
+    def authenticate(self, username, password):
+        """Вход через сервер; права роли приходят вместе с сессией"""
+        session = self._client.login(username, password)
+        if session is None:
+            return None
+        permissions.preload(session['role_id'], session['permissions'])
+        return User(session['user_id'], session['username'], session['role_id'])
+
+
+REMOTE_CLASSES = {
+    'guest': RemoteGuestService,
+    'user': RemoteUserService
+}
+
+_server_client = None
+
+
+def server_client():
+    """Клиент сервера приложения (SERVER_CONFIG['url'])"""
+    global _server_client
+    if _server_client is None:
+        _server_client = ServerClient(SERVER_CONFIG['url'], SERVER_CONFIG['request_timeout'])
+    return _server_client
+
+
+def service(name, local_class):
+    """
+    Экземпляр сервиса для приложения: при заданном SERVER_CONFIG['url'] -
+    прокси операций на сервере приложения, иначе - локальный сервис
+    """
+    if not SERVER_CONFIG['url']:
+        return local_class()
+    return REMOTE_CLASSES.get(name, RemoteService)(server_client(), name, local_class)
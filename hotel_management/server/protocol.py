@@ -0,0 +1,65 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+# JSON не различает даты, время и Decimal - они передаются помеченными объектами
+_DATETIME = '$datetime'
+_DATE = '$date'
+_DECIMAL = '$decimal'
+
+# Операции сервисов, которые сервер выполняет по /call/<сервис>.<метод>:
+# прокси на клиенте (server/client.py) вызывают только их
+OPERATIONS = {
+    'reference': ('fetch',),
+    'room': ('list_rooms',),
+    'report': ('daily_report',),
+    'booking': ('active_bookings', 'changed_bookings', 'free_rooms', 'stays_in_range', 'create_booking',
+                'cancel_booking', 'check_in', 'check_out', 'night_audit'),
+    'guest': ('page', 'lookup', 'create_guest', 'update_guest', 'delete_guest', 'import_guests'),
+    'cleaning': ('free_rooms', 'pending_tasks', 'request_cleaning', 'request_cleaning_many', 'mark_cleaned'),
+    'user': ('list_users', 'create_user', 'change_password', 'set_locked')
+}
+
+
+def _tag(value):
+    if isinstance(value, datetime):
+        return {_DATETIME: value.isoformat()}
+    if isinstance(value, date):
+        return {_DATE: value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_DECIMAL: str(value)}
+    raise TypeError(f"Значение типа {type(value).__name__} нельзя передать серверу")
+
+
+def _untag(obj):
+    if len(obj) == 1:
+        if _DATETIME in obj:
+            return datetime.fromisoformat(obj[_DATETIME])
+        if _DATE in obj:
+            return date.fromisoformat(obj[_DATE])
+        if _DECIMAL in obj:
+            return Decimal(obj[_DECIMAL])
+    return obj
+
+
+def encode(value):
+    """Сообщение в байты JSON (кортежи передаются списками)"""
+    return json.dumps(value, default=_tag, ensure_ascii=False).encode('utf-8')
+
+
+def decode(data):
+    """Сообщение из байтов JSON с восстановлением дат и Decimal"""
+    return json.loads(data.decode('utf-8'), object_hook=_untag)
+
+
+def _row(value):
+    if isinstance(value, list):
+        return tuple(_row(item) for item in value)
+    return value
+
+
+def restore_rows(value):
+    """Вложенные списки снова становятся кортежами: строки результата остаются кортежами, как у psycopg2"""
+    if isinstance(value, list):
+        return [_row(item) for item in value]
+    return value
@@ -0,0 +1,220 @@
+import itertools
+import select
+import threading
+import time
+from collections import deque
+import psycopg2
+from hotel_management.config import DB_CONFIG
+from hotel_management.database.notifications import CHANNEL, ChangeEvent, parse_event
+
+RESYNC = ChangeEvent('*', 'R', None, None)
+
+
+class ChangeFeed:
+    """
+    Единственный на сервер слушатель LISTEN/NOTIFY. Хранит журнал последних
+    изменений с возрастающими номерами: клиенты забирают их длинными опросами
+    (wait), а подписчики внутри сервера (кэш чтений, занятость номеров)
+    получают их сразу. Интерфейс подписки совместим с ChangeBus.
+    """
+    RECONNECT_MIN = 1
+    RECONNECT_MAX = 30
+
+    def __init__(self, keep):
+        """:param keep: Сколько последних изменений хранить для отставших клиентов"""
+        self._events = deque(maxlen=keep)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._subscriptions = []
+        self._connection = None
+        self._running = False
+        self._thread = None
+
+    @property
+    def active(self):
+        """Слушатель подключен: кэш и занятость номеров узнают обо всех изменениях"""
+        return self._connection is not None and not self._connection.closed
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, name='change-feed', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def subscribe(self, tables, callback, owner=None, debounce_ms=None):
+        """
+        Подписка внутри сервера: callback(events) вызывается в потоке слушателя
+        :param tables: Имена таблиц или None - все изменения
+        """
+        self._subscriptions.append((frozenset(tables) if tables is not None else None, callback))
+
+    def wait(self, after, timeout):
+        """
+        Ждет изменений с номером больше after
+        :return: (номер последнего изменения, список ChangeEvent); клиенту, пропустившему
+                 часть журнала (или переподключившемуся к перезапущенному серверу), - RESYNC
+        """
+        with self._condition:
+            if after >= 0:
+                self._condition.wait_for(lambda: self._seq != after, timeout)
+            if after < 0 or after == self._seq:
+                return self._seq, []
+            oldest = self._events[0][0] if self._events else self._seq + 1
+            if after > self._seq or after < oldest - 1:
+                return self._seq, [RESYNC]
+            return self._seq, [event for seq, event in self._events if seq > after]
+
+    def _listen(self):
+        delay = self.RECONNECT_MIN
+        resync = False
+        while self._running:
+            if not self.active:
+                try:
+                    self._connect()
+                except psycopg2.Error as e:
+                    print(f"Не удалось подписаться на изменения: {e}")
+                    self._disconnect()
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.RECONNECT_MAX)
+                    resync = True
+                    continue
+                delay = self.RECONNECT_MIN
+                if resync:
+                    # Пока слушателя не было, часть изменений потеряна
+                    self._publish([RESYNC])
+                    resync = False
+
+            try:
+                if select.select([self._connection], [], [], 1.0)[0]:
+                    self._connection.poll()
+            except (psycopg2.Error, OSError) as e:
+                print(f"Соединение для уведомлений потеряно: {e}")
+                self._disconnect()
+                resync = True
+                continue
+
+            events = []
+            while self._connection.notifies:
+                event = parse_event(self._connection.notifies.pop(0).payload)
+                if event is not None:
+                    events.append(event)
+            if events:
+                self._publish(events)
+        self._disconnect()
+
+    def _connect(self):
+        self._connection = psycopg2.connect(**DB_CONFIG)
+        self._connection.autocommit = True
+        with self._connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+
+    def _disconnect(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except psycopg2.Error:
+                pass
+            self._connection = None
+
+    def _publish(self, events):
+        with self._condition:
+            for event in events:
+                self._seq += 1
+                self._events.append((self._seq, event))
+            self._condition.notify_all()
+
+        for tables, callback in list(self._subscriptions):
+            matching = [event for event in events
+                        if tables is None or event.table == '*' or event.table in tables]
+            if matching:
+                try:
+                    callback(matching)
+                except Exception as e:
+                    print(f"Ошибка обработки изменений: {e}")
+
+
+class _Flight:
+    """Выполняющееся чтение, результат которого ждут все одинаковые запросы"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SharedReads:
+    """
+    Общие для всех клиентов чтения. Одинаковые одновременные запросы
+    (одна операция с одними аргументами) выполняются в БД один раз, а
+    результат кэшируется на ttl секунд - пока в его таблицах нет изменений.
+    Кэш используется только при работающем слушателе изменений: без него
+    сервер не узнал бы об изменениях с других клиентов и из БД.
+    """
+
+    def __init__(self, ttl, feed):
+        self._ttl = ttl
+        self._feed = feed
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._flights = {}
+        # Номер версии каждой таблицы: результат, прочитанный до изменения, не кэшируется
+        self._versions = {}
+        self._counter = itertools.count(1)
+        feed.subscribe(None, lambda events: self.invalidate({event.table for event in events}))
+
+    def get(self, key, tables, load):
+        """
+        Результат чтения load() по ключу key
+        :param tables: Таблицы, от которых зависит результат (пусто - не кэшировать)
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[2]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                versions = self._versions_of(tables)
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = load()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if (flight.error is None and tables and self._feed.active
+                        and self._versions_of(tables) == versions):
+                    self._cache[key] = (time.monotonic() + self._ttl, frozenset(tables), flight.result)
+            flight.done.set()
+        return flight.result
+
+    def invalidate(self, tables):
+        """Сбрасывает результаты, зависящие от таблиц ('*' - все)"""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] = next(self._counter)
+            if '*' in tables:
+                self._cache.clear()
+                return
+            for key in [key for key, cached in self._cache.items() if cached[1] & tables]:
+                del self._cache[key]
+
+    def _versions_of(self, tables):
+        return (self._versions.get('*'),) + tuple(self._versions.get(table) for table in tables)
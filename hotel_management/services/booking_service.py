@@ -0,0 +1,141 @@
+from collections import namedtuple
+from datetime import date
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.availability import availability
+from hotel_management.database.models import Booking, BookingConflictError, ValidationError
+from hotel_management.database.queries import AvailabilityQueries, BookingQueries, statements
+from hotel_management.server.client import service
+
+# Итог ночного аудита: выселено проживаний, создано задач уборки, номеров переведено в "Требует уборки"
+NightAuditSummary = namedtuple('NightAuditSummary', ['checked_out', 'cleaning_requested', 'rooms_updated'])
+
+
+class BookingService:
+    """
+    Операции с бронированиями без GUI. Методы выполняются в вызывающем
+    потоке (виджеты ставят их в query_executor, замеры и скрипты вызывают
+    напрямую), возвращают данные и сообщают об ошибках исключениями.
+    """
+    ACTIVE_STATUSES = ('booked', 'checked_in')
+    # Ключ рекомендательной блокировки: аудиты с разных рабочих мест не выполняются одновременно
+    NIGHT_AUDIT_LOCK_KEY = 7_245_110_002
+
+    def active_bookings(self):
+        """
+        Действующие брони с выездом не раньше сегодняшнего дня
+        :return: Строки (occupancy_id, full_name, room_id, check_in, check_out, status, updated_at)
+        """
+        return DatabaseConnector().fetch_prepared('booking_get_active')
+
+    def changed_bookings(self, since):
+        """Брони в любом статусе, измененные после отметки since (строки как у active_bookings)"""
+        return DatabaseConnector().fetch_prepared('booking_get_changed', (since,))
+
+    def free_rooms(self, check_in, check_out, prefix='', limit=None):
+        """Номера (room_id, floor, category_id), свободные весь период [check_in, check_out)"""
+        rooms = [room for room in availability.free_rooms(check_in, check_out)
+                 if str(room[0]).startswith(prefix)]
+        return rooms if limit is None else rooms[:limit]
+
+    def stays_in_range(self, start_date, end_date):
+        """
+        Данные шахматки: все номера и действующие брони, пересекающиеся с [start_date, end_date)
+        :return: (номера (room_id, floor, category_id), брони (room_id, заезд, выезд, статус, ФИО))
+        """
+        def read(cursor):
+            cursor.execute(AvailabilityQueries.GET_ROOMS)
+            rooms = cursor.fetchall()
+            statements.execute(cursor, 'booking_get_range', (start_date, end_date))
+            return rooms, cursor.fetchall()
+        return DatabaseConnector().run_in_transaction(read)
+
+    def create_booking(self, guest_id, room_id, check_in, check_out):
+        """
+        Создает бронь после проверки дат и занятости номера
+        :return: ID бронирования
+        :raises ValidationError: Выезд не позже заезда
+        :raises BookingConflictError: Номер занят на эти даты
+        """
+        if check_in >= check_out:
+            raise ValidationError("Дата выезда должна быть позже даты заезда")
+        # Быстрая проверка по занятости в памяти; окончательная - ограничение в БД
+        if availability.conflicts(room_id, check_in, check_out):
+            raise BookingConflictError("Выбранный номер уже забронирован на указанные даты")
+        return Booking.create(guest_id, room_id, check_in, check_out)
+
+    def cancel_booking(self, booking_id):
+        """:return: True, если бронь была действующей и отменена"""
+        return self._set_status(booking_id, 'cancelled', self.ACTIVE_STATUSES)
+
+    def check_in(self, booking_id):
+        """:return: True, если забронированный гость заселен"""
+        return self._set_status(booking_id, 'checked_in', ('booked',))
+
+    def check_out(self, booking_id, on_date=None):
+        """
+        Выселяет гостя и ставит номер на уборку одной транзакцией.
+        Дата выезда - on_date (по умолчанию сегодня), но не раньше следующего дня после заезда.
+        :return: True, если заселенный гость выселен
+        """
+        on_date = on_date or date.today()
+
+        def check_out_booking(cursor):
+            cursor.execute("""
+                UPDATE occupancy
+                SET
+                    status = 'checked_out',
+                    check_out_date = GREATEST(%s, check_in_date + 1)
+                WHERE occupancy_id = %s
+                AND status = 'checked_in'
+                RETURNING room_id
+            """, (on_date, booking_id))
+            checked_out = cursor.fetchone()
+            if checked_out is None:
+                return False
+
+            cursor.execute("""
+                INSERT INTO cleaning
+                (room_id, cleaning_date, completed, requested_at)
+                VALUES (%s, NOW(), FALSE, NOW())
+            """, (checked_out[0],))
+            return True
+
+        return DatabaseConnector().run_in_transaction(check_out_booking)
+
+    def night_audit(self, on_date=None):
+        """
+        Массовое выселение: все заселенные гости с датой выезда не позже on_date
+        (по умолчанию сегодня) выселяются, их номера ставятся на уборку.
+        Одна транзакция и несколько запросов независимо от числа выселений.
+        :return: NightAuditSummary
+        """
+        on_date = on_date or date.today()
+
+        def run_audit(cursor):
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.NIGHT_AUDIT_LOCK_KEY,))
+            return self.apply_night_audit(cursor, on_date)
+
+        return DatabaseConnector().run_in_transaction(run_audit)
+
+    @staticmethod
+    def apply_night_audit(cursor, on_date):
+        """Запросы ночного аудита в транзакции вызывающего (без блокировки и фиксации)"""
+        cursor.execute(BookingQueries.NIGHT_AUDIT, {'day': on_date})
+        checked_out, cleaning_requested, room_ids = cursor.fetchone()
+        # После INSERT в cleaning: его триггер уже отработал и не перезапишет статус
+        cursor.execute(BookingQueries.NIGHT_AUDIT_ROOMS, (room_ids,))
+        return NightAuditSummary(checked_out, cleaning_requested, cursor.rowcount)
+
+    def _set_status(self, booking_id, status, current_statuses):
+        def update_status(cursor):
+            cursor.execute("""
+                UPDATE occupancy
+                SET status = %s
+                WHERE occupancy_id = %s
+                AND status = ANY(%s)
+            """, (status, booking_id, list(current_statuses)))
+            return cursor.rowcount > 0
+        return DatabaseConnector().run_in_transaction(update_status)
+
+
+booking_service = service('booking', BookingService)
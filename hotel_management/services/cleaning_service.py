@@ -0,0 +1,98 @@
+from datetime import datetime
+from psycopg2.extras import execute_values
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.server.client import service
+
+
+class CleaningService:
+    """Операции уборки без GUI (см. BookingService)"""
+
+    def free_rooms(self):
+        """Свободные комнаты (room_id, floor, category_id), которые можно поставить на уборку"""
+        return DatabaseConnector().fetch_prepared('room_get_free')
+
+    def pending_tasks(self):
+        """Комнаты (room_id, floor, category_id) с незавершенной уборкой"""
+        return DatabaseConnector().fetch_prepared('cleaning_get_pending')
+
+    def request_cleaning(self, room_id):
+        """Ставит комнату на уборку: запись уборки и статус "Требует уборки" (2)"""
+        def add_room(cursor):
+            current_time = datetime.now()
+            cursor.execute("""
+                INSERT INTO cleaning
+                (cleaning_id, room_id, status_id, staff_id, cleaning_date, completed, requested_at, cleaned_at)
+                VALUES (
+                    nextval('cleaning_cleaning_id_seq'),
+                    %s,
+                    2,  -- status_id для "Требует уборки"
+                    NULL,
+                    %s,
+                    FALSE,
+                    %s,
+                    NULL
+                )
+            """, (room_id, current_time, current_time))
+            cursor.execute("""
+                UPDATE rooms
+                SET status_id = 2
+                WHERE room_id = %s
+            """, (room_id,))
+        DatabaseConnector().run_in_transaction(add_room)
+
+    def request_cleaning_many(self, room_ids):
+        """
+        Ставит комнаты на уборку одной транзакцией: один пакетный INSERT и один UPDATE
+        :return: Число добавленных записей уборки
+        """
+        room_ids = list(room_ids)
+        if not room_ids:
+            return 0
+
+        def add_rooms(cursor):
+            current_time = datetime.now()
+            # На курсоре транзакции: ошибка вставки откатывает ее и доходит до вызывающего кода
+            # как есть. Номеров в отеле немного - все строки уходят одним INSERT
+            execute_values(cursor, """
+                INSERT INTO cleaning
+                (cleaning_id, room_id, status_id, staff_id, cleaning_date, completed, requested_at, cleaned_at)
+                VALUES %s
+            """, [(room_id, current_time, current_time) for room_id in room_ids],
+                template="(nextval('cleaning_cleaning_id_seq'), %s, 2, NULL, %s, FALSE, %s, NULL)",
+                page_size=len(room_ids))
+
+            cursor.execute("""
+                UPDATE rooms
+                SET status_id = 2
+                WHERE room_id = ANY(%s)
+            """, (room_ids,))
+            return len(room_ids)
+        return DatabaseConnector().run_in_transaction(add_rooms)
+
+    def mark_cleaned(self, room_id):
+        """
+        Завершает уборку комнаты и возвращает ей статус "Свободен" (1)
+        :return: True, если у комнаты была незавершенная уборка
+        """
+        def mark_room(cursor):
+            current_time = datetime.now()
+            cursor.execute("""
+                UPDATE cleaning
+                SET
+                    status_id = 1,  -- status_id для "Свободен"
+                    cleaning_date = %s,
+                    completed = TRUE,
+                    cleaned_at = %s
+                WHERE room_id = %s AND completed = FALSE
+            """, (current_time, current_time, room_id))
+            marked = cursor.rowcount > 0
+            cursor.execute("""
+                UPDATE rooms
+                SET status_id = 1
+                WHERE room_id = %s
+            """, (room_id,))
+            return marked
+        return DatabaseConnector().run_in_transaction(mark_room)
+
+
+cleaning_service = service('cleaning', CleaningService)
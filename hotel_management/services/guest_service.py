@@ -0,0 +1,144 @@
+import csv
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.queries import GuestQueries
+from hotel_management.database.models import ValidationError
+from hotel_management.utils.helpers import like_escape
+from hotel_management.server.client import service
+
+
+class GuestService:
+    """Операции с гостями без GUI (см. BookingService)"""
+    PAGE_SIZE = 200
+    # Более короткие строки триграммный индекс не ускоряет - поиск не выполняется
+    SEARCH_MIN_LENGTH = 3
+    CSV_COLUMNS = ('full_name', 'phone_number', 'age')
+
+    def search_pattern(self, search_text):
+        """Шаблон ILIKE для поиска подстроки или None, если строка слишком короткая"""
+        search_text = search_text.strip()
+        if len(search_text) < self.SEARCH_MIN_LENGTH:
+            return None
+        return f"%{like_escape(search_text)}%"
+
+    def page(self, last_guest=None, search_pattern=None, page_size=PAGE_SIZE):
+        """
+        Страница гостей по ключу (full_name, guest_id)
+        :param last_guest: Последняя запись предыдущей страницы (None - первая страница)
+        :param search_pattern: Шаблон из search_pattern или None - все гости
+        :return: Строки (guest_id, full_name, phone_number, age)
+        """
+        if search_pattern is None:
+            if last_guest is None:
+                name, params = 'guest_page_first', (page_size,)
+            else:
+                name, params = 'guest_page_next', (last_guest[1], last_guest[0], page_size)
+        else:
+            if last_guest is None:
+                name, params = 'guest_search_first', (search_pattern, page_size)
+            else:
+                name, params = 'guest_search_next', (search_pattern, last_guest[1], last_guest[0], page_size)
+        return DatabaseConnector().fetch_prepared(name, params)
+
+    def lookup(self, prefix, limit):
+        """Гости (guest_id, full_name, phone_number), у которых ФИО или телефон начинается с prefix"""
+        return DatabaseConnector().fetch_prepared('guest_lookup', (f"{like_escape(prefix)}%", limit))
+
+    def create_guest(self, full_name, phone, age):
+        """:return: ID нового гостя"""
+        params = self._guest_params(full_name, phone, age)
+
+        def insert(cursor):
+            cursor.execute(
+                "INSERT INTO guests (full_name, phone_number, age) VALUES (%s, %s, %s) RETURNING guest_id",
+                params
+            )
+            return cursor.fetchone()[0]
+        return DatabaseConnector().run_in_transaction(insert)
+
+    def update_guest(self, guest_id, full_name, phone, age):
+        """:return: True, если гость найден и обновлен"""
+        params = self._guest_params(full_name, phone, age) + (guest_id,)
+
+        def update(cursor):
+            cursor.execute("""
+                UPDATE guests
+                SET full_name = %s, phone_number = %s, age = %s
+                WHERE guest_id = %s
+            """, params)
+            return cursor.rowcount > 0
+        return DatabaseConnector().run_in_transaction(update)
+
+    def delete_guest(self, guest_id):
+        """
+        Удаляет гостя без бронирований
+        :raises ValidationError: У гостя есть бронирования
+        """
+        def delete(cursor):
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM occupancy WHERE guest_id = %s)", (guest_id,))
+            if cursor.fetchone()[0]:
+                raise ValidationError("Нельзя удалить гостя с активными бронированиями")
+            cursor.execute("DELETE FROM guests WHERE guest_id = %s", (guest_id,))
+            return cursor.rowcount > 0
+        return DatabaseConnector().run_in_transaction(delete)
+
+    def read_csv(self, path):
+        """
+        Читает гостей из CSV (ФИО; Телефон; Возраст), разделитель и заголовок определяются автоматически
+        :return: Строки для import_guests
+        """
+        with open(path, newline='', encoding='utf-8-sig') as csv_file:
+            sample = csv_file.read(4096)
+            csv_file.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;')
+            reader = csv.reader(csv_file, dialect)
+            if csv.Sniffer().has_header(sample):
+                next(reader, None)
+
+            rows = []
+            for row in reader:
+                if not row or not row[0].strip():
+                    continue
+                phone = row[1] if len(row) > 1 else ''
+                age = row[2] if len(row) > 2 else ''
+                rows.append(self._parse_row(row[0], phone, age))
+        return rows
+
+    def import_guests(self, rows):
+        """
+        Загружает гостей одной операцией COPY
+        :return: Число загруженных гостей
+        """
+        loaded = DatabaseConnector().copy_in('guests', self.CSV_COLUMNS, rows)
+        if loaded is None:
+            raise RuntimeError("Не удалось импортировать гостей")
+        return loaded
+
+    def export_csv(self, path):
+        """
+        Выгружает всех гостей в CSV потоком с серверного курсора
+        :return: Число выгруженных гостей
+        """
+        exported = 0
+        with open(path, 'w', newline='', encoding='utf-8-sig') as csv_file:
+            writer = csv.writer(csv_file, delimiter=';')
+            # Порядок столбцов совместим с импортом, ID - последним
+            writer.writerow(["ФИО", "Телефон", "Возраст", "ID"])
+            for batch in DatabaseConnector().stream(GuestQueries.GET_ALL, batches=True):
+                writer.writerows((name, phone, age, guest_id) for guest_id, name, phone, age in batch)
+                exported += len(batch)
+        return exported
+
+    def _guest_params(self, full_name, phone, age):
+        if not full_name.strip():
+            raise ValidationError("ФИО обязательно для заполнения")
+        return self._parse_row(full_name, phone, age)
+
+    @staticmethod
+    def _parse_row(full_name, phone, age):
+        """(ФИО, телефон или None, возраст или None); нечисловой возраст не сохраняется"""
+        phone = phone.strip()
+        age = age.strip()
+        return full_name.strip(), phone if phone else None, int(age) if age.isdigit() else None
+
+
+guest_service = service('guest', GuestService)
@@ -0,0 +1,22 @@
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.queries import ReportQueries, statements
+from hotel_management.server.client import service
+
+
+class ReportService:
+    """Отчеты по дневным сводкам без GUI (см. BookingService)"""
+
+    def daily_report(self, date_from, date_to):
+        """
+        Дневные сводки периода [date_from, date_to] и число номеров - одним снимком данных
+        :return: (строки report_daily, число номеров)
+        """
+        def read(cursor):
+            statements.execute(cursor, 'report_daily', (date_from, date_to))
+            days = cursor.fetchall()
+            cursor.execute(ReportQueries.COUNT_ROOMS)
+            return days, cursor.fetchone()[0]
+        return DatabaseConnector().run_in_transaction(read)
+
+
+report_service = service('report', ReportService)
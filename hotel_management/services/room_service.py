@@ -0,0 +1,13 @@
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.server.client import service
+
+
+class RoomService:
+    """Номерной фонд без GUI (см. BookingService)"""
+
+    def list_rooms(self):
+        """Номера (room_id, floor, category_id, status_id)"""
+        return DatabaseConnector().fetch_prepared('room_get_all')
+
+
+room_service = service('room', RoomService)
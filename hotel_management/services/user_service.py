@@ -0,0 +1,87 @@
+from hotel_management.database.connector import DatabaseConnector
+from hotel_management.database.models import User, ValidationError
+from hotel_management.database.queries import UserQueries
+from hotel_management.server.client import service
+
+
+class UserService:
+    """Учетные записи сотрудников без GUI (см. BookingService)"""
+    # Срок ручной блокировки учетной записи администратором
+    LOCK_INTERVAL = '30 days'
+
+    def authenticate(self, username, password):
+        """:return: User или None при неверных данных либо заблокированной учетной записи"""
+        return User.authenticate(username, password)
+
+    def list_users(self):
+        """Строки (user_id, username, role_id, статус, блокировка до)"""
+        def read(cursor):
+            cursor.execute(UserQueries.GET_ALL)
+            return cursor.fetchall()
+        return DatabaseConnector().run_in_transaction(read)
+
+    def create_user(self, username, password, role_id):
+        """
+        :return: ID нового пользователя
+        :raises ValidationError: Пустые поля, слабый пароль или занятый логин
+        """
+        username = username.strip()
+        if not username or not password:
+            raise ValidationError("Заполните все поля")
+        self._check_password(password)
+
+        def insert(cursor):
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM app_users WHERE username = %s)", (username,))
+            if cursor.fetchone()[0]:
+                raise ValidationError("Пользователь с таким логином уже существует")
+            cursor.execute("""
+                INSERT INTO app_users (username, password_hash, role_id)
+                VALUES (%s, crypt(%s, gen_salt('bf')), %s)
+                RETURNING user_id
+            """, (username, password, role_id))
+            return cursor.fetchone()[0]
+        return DatabaseConnector().run_in_transaction(insert)
+
+    def change_password(self, user_id, old_password, new_password):
+        """
+        Меняет пароль после проверки текущего
+        :raises ValidationError: Пустые поля, слабый новый или неверный текущий пароль
+        """
+        if not old_password or not new_password:
+            raise ValidationError("Заполните все поля")
+        self._check_password(new_password)
+
+        def update(cursor):
+            cursor.execute("""
+                UPDATE app_users
+                SET password_hash = crypt(%s, gen_salt('bf'))
+                WHERE user_id = %s AND password_hash = crypt(%s, password_hash)
+            """, (new_password, user_id, old_password))
+            if cursor.rowcount == 0:
+                raise ValidationError("Неверный текущий пароль")
+        DatabaseConnector().run_in_transaction(update)
+
+    def set_locked(self, user_id, locked):
+        """
+        Блокирует учетную запись на LOCK_INTERVAL или снимает блокировку
+        :return: True, если пользователь найден
+        """
+        def update(cursor):
+            if locked:
+                cursor.execute(
+                    "UPDATE app_users SET locked_until = NOW() + %s::interval WHERE user_id = %s",
+                    (self.LOCK_INTERVAL, user_id)
+                )
+            else:
+                cursor.execute("UPDATE app_users SET locked_until = NULL WHERE user_id = %s", (user_id,))
+            return cursor.rowcount > 0
+        return DatabaseConnector().run_in_transaction(update)
+
+    @staticmethod
+    def _check_password(password):
+        is_valid, message = User.validate_password(password)
+        if not is_valid:
+            raise ValidationError(message)
+
+
+user_service = service('user', UserService)
@@ -1,77 +1,97 @@
-from PyQt6.QtWidgets import QMainWindow, QTabWidget, QStatusBar
-from PyQt6.QtGui import QIcon
-from hotel_management.ui.rooms.room_manager import RoomManager
-from hotel_management.ui.guests.guest_manager import GuestManager
-from hotel_management.ui.bookings.booking_manager import BookingManager
-from hotel_management.ui.cleaning.cleaning_manager import CleaningManager
-from hotel_management.ui.admin.user_management import UserManagement
-from hotel_management.database.models import Role
-from hotel_management.database.connector import DatabaseConnector
-
-class AdminDashboard(QMainWindow):
-    def __init__(self, user_id, role_id):
-        super().__init__()
-        self.user_id = user_id
-        self.role_id = role_id
-        self.setWindowTitle(f"Отель Grand Plaza - {Role.get_name(role_id)}")
-        self.setMinimumSize(1200, 800)
-        self.setWindowIcon(QIcon('hotel_icon.ico'))
-        self.init_ui()
-        
-    def init_ui(self):
-        tabs = QTabWidget()
-        
-        # Вкладка управления номерами
-        if self.check_permission('all') or self.check_permission('manage_rooms'):
-            self.room_manager = RoomManager(self)
-            tabs.addTab(self.room_manager, "Номера")
-        
-        # Вкладка управления гостями
-        if self.check_permission('all') or self.check_permission('manage_guests'):
-            self.guest_manager = GuestManager(self)
-            tabs.addTab(self.guest_manager, "Гости")
-        
-        # Вкладка управления бронированиями
-        if self.check_permission('all') or self.check_permission('manage_bookings'):
-            self.booking_manager = BookingManager(self)
-            tabs.addTab(self.booking_manager, "Бронирования")
-        
-        # Вкладка управления уборкой
-        if self.check_permission('all') or self.check_permission('manage_cleaning'):
-            self.cleaning_manager = CleaningManager(self)
-            tabs.addTab(self.cleaning_manager, "Уборка")
-        
-        # Вкладка управления пользователями (только для админа)
-        if self.check_permission('all'):
-            self.user_manager = UserManagement(self)
-            tabs.addTab(self.user_manager, "Пользователи")
-        
-        self.setCentralWidget(tabs)
-        
-        # Статус бар с информацией о пользователе
-        status_bar = QStatusBar()
-        status_bar.showMessage(f"Вы вошли как {Role.get_name(self.role_id)} (ID: {self.user_id})")
-        self.setStatusBar(status_bar)
-
-    def check_permission(self, permission):
-        """Проверяет наличие прав у пользователя"""
-        if self.role_id == 1:  # Администратор имеет все права
-            return True
-            
-        db = DatabaseConnector()
-        if not db.connect():
-            return False
-            
-        try:
-            query = """
-            SELECT EXISTS (
-                SELECT 1 FROM roles 
-                WHERE role_id = %s AND %s = ANY(permissions)
-            """
-            result = db.execute_query(query, (self.role_id, permission), fetch=True)
-            return result[0][0] if result else False
-        except Exception as e:
-            print(f"Ошибка проверки прав: {e}")
-            return False
-        finally:
-            db.disconnect()
\ No newline at end of file
+from PyQt6.QtWidgets import QMainWindow, QTabWidget, QStatusBar, QWidget, QVBoxLayout
+from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import QSettings, QTimer
+from hotel_management.ui.rooms.room_manager import RoomManager
+from hotel_management.ui.guests.guest_manager import GuestManager
+from hotel_management.ui.bookings.booking_manager import BookingManager
+from hotel_management.ui.cleaning.cleaning_manager import CleaningManager
+from hotel_management.ui.admin.user_management import UserManagement
+from hotel_management.ui.reports.report_manager import ReportManager
+from hotel_management.database.models import Role
+from hotel_management.utils.permissions import permissions
+from hotel_management.config import DASHBOARD_CONFIG
+
+class AdminDashboard(QMainWindow):
+    # Вкладки: атрибут окна, заголовок, класс виджета, необходимое право
+    TABS = (
+        ('room_manager', "Номера", RoomManager, 'manage_rooms'),
+        ('guest_manager', "Гости", GuestManager, 'manage_guests'),
+        ('booking_manager', "Бронирования", BookingManager, 'manage_bookings'),
+        ('cleaning_manager', "Уборка", CleaningManager, 'manage_cleaning'),
+        ('report_manager', "Отчеты", ReportManager, 'view_reports'),
+        ('user_manager', "Пользователи", UserManagement, 'all')
+    )
+
+    def __init__(self, user_id, role_id):
+        super().__init__()
+        self.user_id = user_id
+        self.role_id = role_id
+        self.settings = QSettings(DASHBOARD_CONFIG['settings_organization'],
+                                  DASHBOARD_CONFIG['settings_application'])
+        self.setWindowTitle(f"Отель Grand Plaza - {Role.get_name(role_id)}")
+        self.setMinimumSize(1200, 800)
+        self.setWindowIcon(QIcon('hotel_icon.ico'))
+        self.init_ui()
+        
+    def init_ui(self):
+        self.tabs = QTabWidget()
+        self.managers = []
+        # Вкладки создаются пустыми; виджет строится и загружает данные при первом открытии
+        self.tab_specs = []
+        
+        for attribute, title, manager_class, permission in self.TABS:
+            setattr(self, attribute, None)
+            if not self.check_permission(permission):
+                continue
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(placeholder, title)
+            self.tab_specs.append((attribute, manager_class, placeholder))
+        
+        self.setCentralWidget(self.tabs)
+        
+        # Статус бар с информацией о пользователе
+        status_bar = QStatusBar()
+        status_bar.showMessage(f"Вы вошли как {Role.get_name(self.role_id)} (ID: {self.user_id})")
+        self.setStatusBar(status_bar)
+
+        self.tabs.currentChanged.connect(self.on_tab_activated)
+        # Текущая вкладка строится после первой отрисовки окна, затем - подгрузка самой используемой
+        QTimer.singleShot(0, lambda: self.on_tab_activated(self.tabs.currentIndex()))
+        if DASHBOARD_CONFIG['prefetch_tab']:
+            QTimer.singleShot(DASHBOARD_CONFIG['prefetch_delay_ms'], self.prefetch_most_used_tab)
+
+    def on_tab_activated(self, index):
+        if index < 0:
+            return
+        usage_key = f"tab_usage/{self.tab_specs[index][0]}"
+        self.settings.setValue(usage_key, int(self.settings.value(usage_key, 0)) + 1)
+        self.ensure_tab(index)
+
+    def ensure_tab(self, index):
+        """Строит виджет вкладки при первом обращении и запускает загрузку его данных"""
+        attribute, manager_class, placeholder = self.tab_specs[index]
+        manager = getattr(self, attribute)
+        if manager is not None:
+            return manager
+
+        # Виджет сам ставит загрузку данных в фоновые запросы через сервисы
+        manager = manager_class(self)
+        setattr(self, attribute, manager)
+        self.managers.append(manager)
+        placeholder.layout().addWidget(manager)
+        return manager
+
+    def prefetch_most_used_tab(self):
+        """Заранее строит вкладку, которую пользователь открывает чаще всего"""
+        if not self.tab_specs:
+            return
+        usage = [int(self.settings.value(f"tab_usage/{attribute}", 0))
+                 for attribute, _, _ in self.tab_specs]
+        if max(usage) > 0:
+            self.ensure_tab(usage.index(max(usage)))
+
+    def check_permission(self, permission):
+        """Проверяет наличие прав у пользователя (права роли загружаются один раз за сессию)"""
+        return permissions.has(self.role_id, permission)
\ No newline at end of file
@@ -1,493 +1,549 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QHeaderView,
-                            QTableWidgetItem, QPushButton, QHBoxLayout,
-                            QMessageBox, QDialog, QFormLayout, QComboBox,
-                            QDateEdit, QDialogButtonBox)
-from PyQt6.QtCore import QDate, Qt
-from hotel_management.database.connector import DatabaseConnector
-
-class BookingManager(QWidget):
-    def __init__(self, parent=None):
-        super().__init__()
-        self.parent = parent
-        self.initialize_user_interface()
-        self.load_active_bookings()
-
-    def initialize_user_interface(self):
-        main_layout = QVBoxLayout()
-
-        self.bookings_table = QTableWidget()
-        self.bookings_table.setColumnCount(6)
-        self.bookings_table.setHorizontalHeaderLabels(
-            ["ID бронирования", "ФИО гостя", "Номер комнаты", 
-             "Дата заезда", "Дата выезда", "Статус бронирования"]
-        )
-        self.bookings_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.bookings_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-
-        buttons_layout = QHBoxLayout()
-        
-        self.new_booking_button = QPushButton("Создать новое бронирование")
-        self.new_booking_button.clicked.connect(self.show_new_booking_dialog)
-        
-        self.cancel_booking_button = QPushButton("Отменить бронирование")
-        self.cancel_booking_button.clicked.connect(self.cancel_current_booking)
-        
-        self.check_in_button = QPushButton("Зарегистрировать заселение")
-        self.check_in_button.clicked.connect(self.register_guest_check_in)
-        
-        self.check_out_button = QPushButton("Оформить выселение")
-        self.check_out_button.clicked.connect(self.process_guest_check_out)
-
-        buttons_layout.addWidget(self.new_booking_button)
-        buttons_layout.addWidget(self.cancel_booking_button)
-        buttons_layout.addWidget(self.check_in_button)
-        buttons_layout.addWidget(self.check_out_button)
-
-        main_layout.addWidget(self.bookings_table)
-        main_layout.addLayout(buttons_layout)
-        self.setLayout(main_layout)
-
-    def load_active_bookings(self):
-        if self.parent and not self.parent.check_permission('manage_bookings'):
-            QMessageBox.warning(
-                self, 
-                "Ограничение доступа", 
-                "У вас недостаточно прав для просмотра информации о бронированиях"
-            )
-            return
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            active_bookings_query = """
-            SELECT 
-                occupancy.occupancy_id, 
-                guests.full_name, 
-                rooms.room_id, 
-                occupancy.check_in_date, 
-                occupancy.check_out_date, 
-                occupancy.status
-            FROM occupancy
-            JOIN guests ON occupancy.guest_id = guests.guest_id
-            JOIN rooms ON occupancy.room_id = rooms.room_id
-            WHERE occupancy.status IN ('booked', 'checked_in')
-            AND occupancy.check_out_date >= CURRENT_DATE
-            ORDER BY occupancy.check_in_date
-            """
-            
-            database_cursor = database_connection.connection.cursor()
-            database_cursor.execute(active_bookings_query)
-            active_bookings_data = database_cursor.fetchall()
-
-            self.bookings_table.setRowCount(len(active_bookings_data))
-            
-            for row_index, booking_record in enumerate(active_bookings_data):
-                for column_index in range(5):
-                    table_item = QTableWidgetItem(str(booking_record[column_index]))
-                    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.bookings_table.setItem(row_index, column_index, table_item)
-                
-                status_display_text = self.translate_booking_status(booking_record[5])
-                status_item = QTableWidgetItem(status_display_text)
-                status_item.setFlags(status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.bookings_table.setItem(row_index, 5, status_item)
-            
-            database_cursor.close()
-        except Exception as database_error:
-            QMessageBox.critical(
-                self, 
-                "Ошибка загрузки данных", 
-                f"Произошла ошибка при загрузке бронирований: {str(database_error)}"
-            )
-        finally:
-            database_connection.disconnect()
-
-    def translate_booking_status(self, status_code):
-        status_translations = {
-            'booked': 'Забронирован',
-            'checked_in': 'Гость заселен',
-            'checked_out': 'Выселен',
-            'cancelled': 'Отменен'
-        }
-        return status_translations.get(status_code, 'Неизвестный статус')
-
-    def show_new_booking_dialog(self):
-        if self.parent and not self.parent.check_permission('manage_bookings'):
-            QMessageBox.warning(
-                self, 
-                "Ограничение доступа", 
-                "У вас недостаточно прав для создания новых бронирований"
-            )
-            return
-
-        booking_creation_dialog = QDialog(self)
-        booking_creation_dialog.setWindowTitle("Создание нового бронирования")
-        booking_creation_dialog.setFixedSize(500, 400)
-
-        dialog_layout = QFormLayout()
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            database_cursor = database_connection.connection.cursor()
-            
-            database_cursor.execute("SELECT guest_id, full_name FROM guests ORDER BY full_name")
-            available_guests = database_cursor.fetchall()
-
-            database_cursor.execute("""
-                SELECT rooms.room_id, rooms.floor, room_categories.name 
-                FROM rooms
-                JOIN room_categories ON rooms.category_id = room_categories.category_id
-                WHERE rooms.room_id NOT IN (
-                    SELECT room_id FROM occupancy 
-                    WHERE status IN ('booked', 'checked_in')
-                    AND check_out_date >= CURRENT_DATE
-                )
-                ORDER BY rooms.room_id
-            """)
-            available_rooms = database_cursor.fetchall()
-
-            if not available_guests or not available_rooms:
-                QMessageBox.warning(
-                    self, 
-                    "Недостаточно данных", 
-                    "В системе нет доступных гостей или свободных номеров"
-                )
-                return
-
-            self.guest_selection = QComboBox()
-            for guest_id, guest_name in available_guests:
-                self.guest_selection.addItem(guest_name, guest_id)
-
-            self.room_selection = QComboBox()
-            for room_id, floor_number, room_category in available_rooms:
-                self.room_selection.addItem(
-                    f"Номер {room_id} (Этаж {floor_number}, {room_category})", 
-                    room_id
-                )
-
-            self.check_in_date_input = QDateEdit(QDate.currentDate())
-            self.check_out_date_input = QDateEdit(QDate.currentDate().addDays(1))
-
-            dialog_layout.addRow("Выберите гостя:", self.guest_selection)
-            dialog_layout.addRow("Выберите номер:", self.room_selection)
-            dialog_layout.addRow("Дата заезда:", self.check_in_date_input)
-            dialog_layout.addRow("Дата выезда:", self.check_out_date_input)
-
-            confirmation_buttons = QDialogButtonBox(
-                QDialogButtonBox.StandardButton.Ok | 
-                QDialogButtonBox.StandardButton.Cancel
-            )
-            confirmation_buttons.accepted.connect(
-                lambda: self.create_new_booking(booking_creation_dialog)
-            )
-            confirmation_buttons.rejected.connect(booking_creation_dialog.reject)
-
-            dialog_layout.addRow(confirmation_buttons)
-            booking_creation_dialog.setLayout(dialog_layout)
-            booking_creation_dialog.exec()
-        except Exception as dialog_error:
-            QMessageBox.critical(
-                self, 
-                "Ошибка диалога", 
-                f"Ошибка при отображении диалога: {str(dialog_error)}"
-            )
-        finally:
-            database_cursor.close()
-            database_connection.disconnect()
-
-    def create_new_booking(self, dialog_window):
-        selected_guest_id = self.guest_selection.currentData()
-        selected_room_id = self.room_selection.currentData()
-        check_in_date = self.check_in_date_input.date().toString("yyyy-MM-dd")
-        check_out_date = self.check_out_date_input.date().toString("yyyy-MM-dd")
-
-        if check_in_date >= check_out_date:
-            QMessageBox.warning(
-                self, 
-                "Некорректные даты", 
-                "Дата выезда должна быть позже даты заезда"
-            )
-            return
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            database_cursor = database_connection.connection.cursor()
-            
-            database_cursor.execute("""
-                SELECT COUNT(*) 
-                FROM occupancy 
-                WHERE room_id = %s 
-                AND status IN ('booked', 'checked_in')
-                AND (
-                    (check_in_date <= %s AND check_out_date >= %s) OR
-                    (check_in_date <= %s AND check_out_date >= %s) OR
-                    (check_in_date >= %s AND check_out_date <= %s)
-                )
-            """, (
-                selected_room_id, 
-                check_in_date, check_in_date,
-                check_out_date, check_out_date,
-                check_in_date, check_out_date
-            ))
-            
-            if database_cursor.fetchone()[0] > 0:
-                QMessageBox.warning(
-                    self, 
-                    "Номер занят", 
-                    "Выбранный номер уже забронирован на указанные даты"
-                )
-                return
-
-            database_cursor.execute("""
-                INSERT INTO occupancy 
-                (guest_id, room_id, check_in_date, check_out_date, status)
-                VALUES (%s, %s, %s, %s, 'booked')
-            """, (selected_guest_id, selected_room_id, check_in_date, check_out_date))
-
-            database_connection.connection.commit()
-            QMessageBox.information(
-                self, 
-                "Бронирование создано", 
-                "Новое бронирование успешно зарегистрировано"
-            )
-            self.load_active_bookings()
-            dialog_window.close()
-        except Exception as creation_error:
-            database_connection.connection.rollback()
-            QMessageBox.critical(
-                self, 
-                "Ошибка создания", 
-                f"Ошибка при создании бронирования: {str(creation_error)}"
-            )
-        finally:
-            database_cursor.close()
-            database_connection.disconnect()
-
-    def cancel_current_booking(self):
-        if self.parent and not self.parent.check_permission('manage_bookings'):
-            QMessageBox.warning(
-                self, 
-                "Ограничение доступа", 
-                "У вас недостаточно прав для отмены бронирований"
-            )
-            return
-
-        selected_booking_row = self.bookings_table.currentRow()
-        if selected_booking_row == -1:
-            QMessageBox.warning(
-                self, 
-                "Не выбрано бронирование", 
-                "Пожалуйста, выберите бронирование для отмены"
-            )
-            return
-
-        booking_id = self.bookings_table.item(selected_booking_row, 0).text()
-        guest_name = self.bookings_table.item(selected_booking_row, 1).text()
-
-        confirmation_result = QMessageBox.question(
-            self,
-            "Подтверждение отмены",
-            f"Вы действительно хотите отменить бронирование для {guest_name}?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-
-        if confirmation_result == QMessageBox.StandardButton.No:
-            return
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            database_cursor = database_connection.connection.cursor()
-            
-            database_cursor.execute("""
-                UPDATE occupancy 
-                SET status = 'cancelled'
-                WHERE occupancy_id = %s
-                AND status IN ('booked', 'checked_in')
-            """, (booking_id,))
-            
-            database_connection.connection.commit()
-            QMessageBox.information(
-                self, 
-                "Бронирование отменено", 
-                "Выбранное бронирование успешно отменено"
-            )
-            self.load_active_bookings()
-        except Exception as cancellation_error:
-            database_connection.connection.rollback()
-            QMessageBox.critical(
-                self, 
-                "Ошибка отмены", 
-                f"Ошибка при отмене бронирования: {str(cancellation_error)}"
-            )
-        finally:
-            database_cursor.close()
-            database_connection.disconnect()
-
-    def register_guest_check_in(self):
-        if self.parent and not self.parent.check_permission('manage_bookings'):
-            QMessageBox.warning(
-                self, 
-                "Ограничение доступа", 
-                "У вас недостаточно прав для регистрации заселений"
-            )
-            return
-
-        selected_booking_row = self.bookings_table.currentRow()
-        if selected_booking_row == -1:
-            QMessageBox.warning(
-                self, 
-                "Не выбрано бронирование", 
-                "Пожалуйста, выберите бронирование для регистрации заселения"
-            )
-            return
-
-        booking_id = self.bookings_table.item(selected_booking_row, 0).text()
-        guest_name = self.bookings_table.item(selected_booking_row, 1).text()
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            database_cursor = database_connection.connection.cursor()
-            
-            database_cursor.execute("""
-                UPDATE occupancy 
-                SET status = 'checked_in'
-                WHERE occupancy_id = %s
-                AND status = 'booked'
-            """, (booking_id,))
-            
-            database_connection.connection.commit()
-            QMessageBox.information(
-                self, 
-                "Заселение зарегистрировано", 
-                f"Гость {guest_name} успешно зарегистрирован в системе"
-            )
-            self.load_active_bookings()
-        except Exception as check_in_error:
-            database_connection.connection.rollback()
-            QMessageBox.critical(
-                self, 
-                "Ошибка регистрации", 
-                f"Ошибка при регистрации заселения: {str(check_in_error)}"
-            )
-        finally:
-            database_cursor.close()
-            database_connection.disconnect()
-
-    def process_guest_check_out(self):
-        if self.parent and not self.parent.check_permission('manage_bookings'):
-            QMessageBox.warning(
-                self, 
-                "Ограничение доступа", 
-                "У вас недостаточно прав для оформления выселений"
-            )
-            return
-
-        selected_booking_row = self.bookings_table.currentRow()
-        if selected_booking_row == -1:
-            QMessageBox.warning(
-                self, 
-                "Не выбрано бронирование", 
-                "Пожалуйста, выберите бронирование для оформления выселения"
-            )
-            return
-
-        booking_id = self.bookings_table.item(selected_booking_row, 0).text()
-        room_id = self.bookings_table.item(selected_booking_row, 2).text()
-        guest_name = self.bookings_table.item(selected_booking_row, 1).text()
-
-        database_connection = DatabaseConnector()
-        if not database_connection.connect():
-            QMessageBox.warning(
-                self, 
-                "Ошибка подключения", 
-                "Не удалось установить соединение с базой данных"
-            )
-            return
-
-        try:
-            database_cursor = database_connection.connection.cursor()
-            
-            database_cursor.execute("""
-                SELECT check_in_date 
-                FROM occupancy 
-                WHERE occupancy_id = %s
-            """, (booking_id,))
-            check_in_date = database_cursor.fetchone()[0]
-            
-            current_date = QDate.currentDate()
-            check_out_date = current_date.toString("yyyy-MM-dd")
-            
-            if check_out_date <= check_in_date.strftime("%Y-%m-%d"):
-                check_out_date = current_date.addDays(1).toString("yyyy-MM-dd")
-            
-            database_cursor.execute("""
-                UPDATE occupancy 
-                SET 
-                    status = 'checked_out',
-                    check_out_date = %s
-                WHERE occupancy_id = %s
-                AND status = 'checked_in'
-            """, (check_out_date, booking_id))
-            
-            database_cursor.execute("""
-                INSERT INTO cleaning 
-                (room_id, cleaning_date, completed)
-                VALUES (%s, NOW(), FALSE)
-            """, (room_id,))
-            
-            database_connection.connection.commit()
-            QMessageBox.information(
-                self, 
-                "Выселение оформлено", 
-                f"Гость {guest_name} успешно выселен из номера"
-            )
-            self.load_active_bookings()
-        except Exception as check_out_error:
-            database_connection.connection.rollback()
-            QMessageBox.critical(
-                self, 
-                "Ошибка выселения", 
-                f"Ошибка при оформлении выселения: {str(check_out_error)}"
-            )
-        finally:
-            database_cursor.close()
-            database_connection.disconnect()
\ No newline at end of file
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QHBoxLayout,
+                            QMessageBox, QDialog, QFormLayout,
+                            QDateEdit, QDialogButtonBox, QTabWidget)
+from PyQt6.QtCore import QDate
+from bisect import bisect_left
+from datetime import date, timedelta
+from hotel_management.database.reference_data import reference_data
+from hotel_management.database.notifications import change_bus
+from hotel_management.database.background import query_executor
+from hotel_management.database.models import BookingConflictError, ValidationError
+from hotel_management.services.booking_service import booking_service
+from hotel_management.services.guest_service import guest_service
+from hotel_management.ui.table_model import RecordTableModel, create_table_view, current_record
+from hotel_management.ui.lookup_picker import LookupPicker, PrefixCache
+try:
+    from hotel_management.ui.bookings.tape_chart import TapeChartPanel
+except ImportError:  # Без numpy шахматка недоступна
+    TapeChartPanel = None
+
+class BookingManager(QWidget):
+    # Перекрытие при дочитывании: транзакция могла изменить строку раньше,
+    # а зафиксироваться позже уже увиденной отметки
+    WATERMARK_OVERLAP = timedelta(seconds=5)
+    # Сколько подсказок запрашивать при выборе гостя и номера
+    LOOKUP_LIMIT = 20
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+        # Ключи сортировки строк таблицы (дата заезда, id) в порядке строк
+        self.booking_order = []
+        self.booking_keys = {}
+        self.bookings_watermark = None
+        self.bookings_loaded_on = None
+        self.tape_chart = None
+        self.initialize_user_interface()
+        change_bus().subscribe(['occupancy', 'guests'], self.on_data_changed, self)
+        self.load_active_bookings()
+
+    def on_data_changed(self, events):
+        """Обновление по уведомлениям об изменениях (с этого или другого клиента)"""
+        if self.tape_chart is not None and self.tape_chart.isVisible():
+            self.tape_chart.load()
+        if any(event.table != 'occupancy' for event in events):
+            # Изменились гости или требуется пересинхронизация - полная загрузка
+            self.load_active_bookings()
+            return
+
+        for event in events:
+            if event.op == 'D' and event.row_id in self.booking_keys:
+                self.remove_booking_row(event.row_id)
+        self.load_booking_changes()
+
+    def refresh_after_change(self):
+        """После собственного изменения: при активной шине обновление придет уведомлением"""
+        if not change_bus().active:
+            self.load_booking_changes()
+            if self.tape_chart is not None and self.tape_chart.isVisible():
+                self.tape_chart.load()
+
+    def initialize_user_interface(self):
+        main_layout = QVBoxLayout()
+
+        # Записи: occupancy_id, full_name, room_id, check_in_date, check_out_date, status, updated_at
+        self.bookings_model = RecordTableModel([
+            ("ID бронирования", 0),
+            ("ФИО гостя", 1),
+            ("Номер комнаты", 2),
+            ("Дата заезда", 3),
+            ("Дата выезда", 4),
+            ("Статус бронирования", lambda booking: self.translate_booking_status(booking[5]))
+        ], self)
+        self.bookings_table = create_table_view(self.bookings_model)
+
+        buttons_layout = QHBoxLayout()
+        
+        self.new_booking_button = QPushButton("Создать новое бронирование")
+        self.new_booking_button.clicked.connect(self.show_new_booking_dialog)
+        
+        self.cancel_booking_button = QPushButton("Отменить бронирование")
+        self.cancel_booking_button.clicked.connect(self.cancel_current_booking)
+        
+        self.check_in_button = QPushButton("Зарегистрировать заселение")
+        self.check_in_button.clicked.connect(self.register_guest_check_in)
+        
+        self.check_out_button = QPushButton("Оформить выселение")
+        self.check_out_button.clicked.connect(self.process_guest_check_out)
+
+        self.night_audit_button = QPushButton("Ночной аудит")
+        self.night_audit_button.setToolTip(
+            "Выселить всех гостей с наступившей датой выезда и поставить номера на уборку"
+        )
+        self.night_audit_button.clicked.connect(self.run_night_audit)
+
+        buttons_layout.addWidget(self.new_booking_button)
+        buttons_layout.addWidget(self.cancel_booking_button)
+        buttons_layout.addWidget(self.check_in_button)
+        buttons_layout.addWidget(self.check_out_button)
+        buttons_layout.addWidget(self.night_audit_button)
+
+        bookings_list = QWidget()
+        list_layout = QVBoxLayout(bookings_list)
+        list_layout.setContentsMargins(0, 0, 0, 0)
+        list_layout.addWidget(self.bookings_table)
+        list_layout.addLayout(buttons_layout)
+
+        # Шахматка создается и загружается при первом открытии вкладки
+        self.views = QTabWidget()
+        self.views.addTab(bookings_list, "Список")
+        if TapeChartPanel is not None:
+            self.views.addTab(QWidget(), "Шахматка")
+            self.views.currentChanged.connect(self.on_view_changed)
+
+        main_layout.addWidget(self.views)
+        self.setLayout(main_layout)
+
+    def on_view_changed(self, index):
+        if index != 1:
+            return
+        if self.tape_chart is None:
+            self.tape_chart = TapeChartPanel()
+            self.views.blockSignals(True)
+            self.views.removeTab(1)
+            self.views.insertTab(1, self.tape_chart, "Шахматка")
+            self.views.setCurrentIndex(1)
+            self.views.blockSignals(False)
+        self.tape_chart.load()
+
+    def load_active_bookings(self):
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для просмотра информации о бронированиях"
+            )
+            return
+
+        query_executor().submit(
+            booking_service.active_bookings,
+            on_result=self.fill_bookings_table, on_error=self.show_load_error,
+            owner=self, key=(id(self), 'bookings')
+        )
+
+    def show_load_error(self, database_error):
+        QMessageBox.critical(
+            self, 
+            "Ошибка загрузки данных", 
+            f"Произошла ошибка при загрузке бронирований: {str(database_error)}"
+        )
+
+    def fill_bookings_table(self, active_bookings_data):
+        self.bookings_model.set_records(active_bookings_data)
+        self.booking_order = []
+        self.booking_keys = {}
+        self.bookings_watermark = None
+        self.bookings_loaded_on = date.today()
+        
+        for booking_record in active_bookings_data:
+            booking_key = (booking_record[3], booking_record[0])
+            self.booking_order.append(booking_key)
+            self.booking_keys[booking_record[0]] = booking_key
+            self.advance_watermark(booking_record[6])
+
+    def advance_watermark(self, updated_at):
+        if updated_at is not None and (self.bookings_watermark is None or updated_at > self.bookings_watermark):
+            self.bookings_watermark = updated_at
+
+    def load_booking_changes(self):
+        """Дочитывает только брони, измененные после последней отметки, и правит таблицу на месте"""
+        if self.bookings_watermark is None or self.bookings_loaded_on != date.today():
+            # Нет отметки или сменился день (часть броней вышла из окна) - полная загрузка
+            self.load_active_bookings()
+            return
+
+        query_executor().submit(
+            booking_service.changed_bookings, self.bookings_watermark - self.WATERMARK_OVERLAP,
+            on_result=self.apply_booking_changes,
+            on_error=lambda _: QMessageBox.warning(
+                self, 
+                "Ошибка загрузки данных", 
+                "Не удалось обновить список бронирований"
+            ),
+            owner=self, key=(id(self), 'booking_changes')
+        )
+
+    def apply_booking_changes(self, changed_bookings):
+        """Вставляет, обновляет и удаляет строки, сохраняя выделение и прокрутку"""
+        scroll_bar = self.bookings_table.verticalScrollBar()
+        scroll_position = scroll_bar.value()
+        today = date.today()
+
+        for booking_record in changed_bookings:
+            occupancy_id = booking_record[0]
+            is_active = booking_record[5] in booking_service.ACTIVE_STATUSES and booking_record[4] >= today
+            new_key = (booking_record[3], occupancy_id)
+            old_key = self.booking_keys.get(occupancy_id)
+
+            if old_key is not None and (not is_active or old_key != new_key):
+                self.remove_booking_row(occupancy_id)
+                old_key = None
+
+            if is_active:
+                row_index = bisect_left(self.booking_order, new_key)
+                if old_key is None:
+                    self.bookings_model.insert_record(row_index, booking_record)
+                    self.booking_order.insert(row_index, new_key)
+                    self.booking_keys[occupancy_id] = new_key
+                else:
+                    self.bookings_model.update_record(row_index, booking_record)
+            self.advance_watermark(booking_record[6])
+
+        # Выделение модель сохраняет сама, прокрутку возвращаем на прежнее место
+        scroll_bar.setValue(scroll_position)
+
+    def remove_booking_row(self, occupancy_id):
+        booking_key = self.booking_keys.pop(occupancy_id)
+        row_index = bisect_left(self.booking_order, booking_key)
+        del self.booking_order[row_index]
+        self.bookings_model.remove_record(row_index)
+
+    def translate_booking_status(self, status_code):
+        status_translations = {
+            'booked': 'Забронирован',
+            'checked_in': 'Гость заселен',
+            'checked_out': 'Выселен',
+            'cancelled': 'Отменен'
+        }
+        return status_translations.get(status_code, 'Неизвестный статус')
+
+    def show_new_booking_dialog(self):
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для создания новых бронирований"
+            )
+            return
+
+        booking_creation_dialog = QDialog(self)
+        booking_creation_dialog.setWindowTitle("Создание нового бронирования")
+        booking_creation_dialog.setFixedSize(500, 400)
+
+        dialog_layout = QFormLayout()
+
+        # Гость и номер выбираются по подсказкам: форма открывается без загрузки таблиц
+        self.guest_selection = LookupPicker(
+            self.lookup_guests, self.describe_guest,
+            PrefixCache(self.LOOKUP_LIMIT, self.guest_matches), min_length=2
+        )
+        self.guest_selection.setPlaceholderText("Начните вводить ФИО или телефон")
+
+        # Свободные на выбранные даты номера считаются в памяти (database/availability.py)
+        self.stay_dates = (date.today(), date.today() + timedelta(days=1))
+        room_cache = PrefixCache(self.LOOKUP_LIMIT, lambda room, prefix: str(room[0]).startswith(prefix))
+        self.room_selection = LookupPicker(
+            lambda prefix, limit: self.lookup_rooms(prefix, limit, *self.stay_dates),
+            self.describe_room, room_cache, min_length=0
+        )
+        self.room_selection.setPlaceholderText("Номер комнаты (стрелка вниз - список свободных)")
+
+        self.check_in_date_input = QDateEdit(QDate.currentDate())
+        self.check_out_date_input = QDateEdit(QDate.currentDate().addDays(1))
+
+        def on_dates_changed():
+            # Другие даты - другой список свободных номеров
+            self.stay_dates = (self.check_in_date_input.date().toPyDate(),
+                               self.check_out_date_input.date().toPyDate())
+            room_cache.clear()
+
+        self.check_in_date_input.dateChanged.connect(on_dates_changed)
+        self.check_out_date_input.dateChanged.connect(on_dates_changed)
+
+        dialog_layout.addRow("Выберите гостя:", self.guest_selection)
+        dialog_layout.addRow("Выберите номер:", self.room_selection)
+        dialog_layout.addRow("Дата заезда:", self.check_in_date_input)
+        dialog_layout.addRow("Дата выезда:", self.check_out_date_input)
+
+        confirmation_buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | 
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        confirmation_buttons.accepted.connect(
+            lambda: self.create_new_booking(booking_creation_dialog)
+        )
+        confirmation_buttons.rejected.connect(booking_creation_dialog.reject)
+
+        dialog_layout.addRow(confirmation_buttons)
+        booking_creation_dialog.setLayout(dialog_layout)
+        booking_creation_dialog.exec()
+
+    @staticmethod
+    def lookup_guests(prefix, limit):
+        """Гости, у которых ФИО или телефон начинается с prefix (выполняется в рабочем потоке)"""
+        return guest_service.lookup(prefix, limit)
+
+    @staticmethod
+    def lookup_rooms(prefix, limit, check_in, check_out):
+        """Номера, начинающиеся с prefix и свободные весь период [check_in, check_out)"""
+        return booking_service.free_rooms(check_in, check_out, prefix, limit)
+
+    @staticmethod
+    def describe_guest(guest):
+        guest_id, guest_name, phone_number = guest
+        if phone_number:
+            return guest_id, f"{guest_name}, {phone_number} (ID {guest_id})"
+        return guest_id, f"{guest_name} (ID {guest_id})"
+
+    @staticmethod
+    def guest_matches(guest, prefix):
+        return guest[1].lower().startswith(prefix) or (guest[2] or "").startswith(prefix)
+
+    @staticmethod
+    def describe_room(room):
+        room_id, floor_number, category_id = room
+        room_category = reference_data.name('room_categories', category_id)
+        return room_id, f"Номер {room_id} (Этаж {floor_number}, {room_category})"
+
+    def create_new_booking(self, dialog_window):
+        selected_guest_id = self.guest_selection.currentData()
+        selected_room_id = self.room_selection.currentData()
+        if selected_guest_id is None or selected_room_id is None:
+            QMessageBox.warning(
+                self, 
+                "Не выбраны данные", 
+                "Выберите гостя и номер из списка подсказок"
+            )
+            return
+
+        check_in_date = self.check_in_date_input.date().toPyDate()
+        check_out_date = self.check_out_date_input.date().toPyDate()
+
+        def on_created(_):
+            QMessageBox.information(
+                self, 
+                "Бронирование создано", 
+                "Новое бронирование успешно зарегистрировано"
+            )
+            self.refresh_after_change()
+            dialog_window.close()
+
+        def on_failed(creation_error):
+            if isinstance(creation_error, ValidationError):
+                QMessageBox.warning(self, "Некорректные даты", str(creation_error))
+                return
+            if isinstance(creation_error, BookingConflictError):
+                # Номер занят (в том числе успели занять с другого рабочего места)
+                QMessageBox.warning(self, "Номер занят", str(creation_error))
+                return
+            QMessageBox.critical(
+                self, 
+                "Ошибка создания", 
+                f"Ошибка при создании бронирования: {str(creation_error)}"
+            )
+
+        query_executor().submit(
+            booking_service.create_booking, selected_guest_id, selected_room_id, check_in_date, check_out_date,
+            on_result=on_created, on_error=on_failed,
+            owner=self, key=(id(self), 'create_booking'), rerun=False
+        )
+
+    def cancel_current_booking(self):
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для отмены бронирований"
+            )
+            return
+
+        selected_booking = current_record(self.bookings_table)
+        if selected_booking is None:
+            QMessageBox.warning(
+                self, 
+                "Не выбрано бронирование", 
+                "Пожалуйста, выберите бронирование для отмены"
+            )
+            return
+
+        booking_id, guest_name = selected_booking[0], selected_booking[1]
+
+        confirmation_result = QMessageBox.question(
+            self,
+            "Подтверждение отмены",
+            f"Вы действительно хотите отменить бронирование для {guest_name}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if confirmation_result == QMessageBox.StandardButton.No:
+            return
+
+        def on_cancelled(cancelled):
+            if not cancelled:
+                QMessageBox.warning(
+                    self, 
+                    "Бронирование не отменено", 
+                    "Бронирование уже завершено или отменено"
+                )
+                return
+            QMessageBox.information(
+                self, 
+                "Бронирование отменено", 
+                "Выбранное бронирование успешно отменено"
+            )
+            self.refresh_after_change()
+
+        query_executor().submit(
+            booking_service.cancel_booking, booking_id,
+            on_result=on_cancelled,
+            on_error=lambda cancellation_error: QMessageBox.critical(
+                self, 
+                "Ошибка отмены", 
+                f"Ошибка при отмене бронирования: {str(cancellation_error)}"
+            ),
+            owner=self, key=(id(self), 'booking', booking_id), rerun=False
+        )
+
+    def register_guest_check_in(self):
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для регистрации заселений"
+            )
+            return
+
+        selected_booking = current_record(self.bookings_table)
+        if selected_booking is None:
+            QMessageBox.warning(
+                self, 
+                "Не выбрано бронирование", 
+                "Пожалуйста, выберите бронирование для регистрации заселения"
+            )
+            return
+
+        booking_id, guest_name = selected_booking[0], selected_booking[1]
+
+        def on_checked_in(checked_in):
+            if not checked_in:
+                QMessageBox.warning(
+                    self, 
+                    "Заселение не зарегистрировано", 
+                    "Заселить можно только забронированного гостя"
+                )
+                return
+            QMessageBox.information(
+                self, 
+                "Заселение зарегистрировано", 
+                f"Гость {guest_name} успешно зарегистрирован в системе"
+            )
+            self.refresh_after_change()
+
+        query_executor().submit(
+            booking_service.check_in, booking_id,
+            on_result=on_checked_in,
+            on_error=lambda check_in_error: QMessageBox.critical(
+                self, 
+                "Ошибка регистрации", 
+                f"Ошибка при регистрации заселения: {str(check_in_error)}"
+            ),
+            owner=self, key=(id(self), 'booking', booking_id), rerun=False
+        )
+
+    def process_guest_check_out(self):
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для оформления выселений"
+            )
+            return
+
+        selected_booking = current_record(self.bookings_table)
+        if selected_booking is None:
+            QMessageBox.warning(
+                self, 
+                "Не выбрано бронирование", 
+                "Пожалуйста, выберите бронирование для оформления выселения"
+            )
+            return
+
+        booking_id, guest_name = selected_booking[0], selected_booking[1]
+
+        def on_checked_out(checked_out):
+            if not checked_out:
+                QMessageBox.warning(
+                    self, 
+                    "Выселение не оформлено", 
+                    "Выселить можно только заселенного гостя"
+                )
+                return
+            QMessageBox.information(
+                self, 
+                "Выселение оформлено", 
+                f"Гость {guest_name} успешно выселен из номера"
+            )
+            self.refresh_after_change()
+
+        query_executor().submit(
+            booking_service.check_out, booking_id,
+            on_result=on_checked_out,
+            on_error=lambda check_out_error: QMessageBox.critical(
+                self, 
+                "Ошибка выселения", 
+                f"Ошибка при оформлении выселения: {str(check_out_error)}"
+            ),
+            owner=self, key=(id(self), 'booking', booking_id), rerun=False
+        )
+
+    def run_night_audit(self):
+        """Массовое выселение всех гостей, у которых наступила дата выезда, одной транзакцией"""
+        if self.parent and not self.parent.check_permission('manage_bookings'):
+            QMessageBox.warning(
+                self, 
+                "Ограничение доступа", 
+                "У вас недостаточно прав для оформления выселений"
+            )
+            return
+
+        confirmation_result = QMessageBox.question(
+            self,
+            "Ночной аудит",
+            "Выселить всех заселенных гостей с датой выезда не позже сегодняшней "
+            "и поставить их номера на уборку?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirmation_result == QMessageBox.StandardButton.No:
+            return
+
+        def on_audited(summary):
+            checked_out, cleaning_requested, rooms_updated = summary
+            QMessageBox.information(
+                self, 
+                "Ночной аудит завершен", 
+                f"Выселено гостей: {checked_out}\n"
+                f"Создано задач уборки: {cleaning_requested}\n"
+                f"Номеров ожидают уборки: {rooms_updated}"
+            )
+            self.refresh_after_change()
+
+        query_executor().submit(
+            booking_service.night_audit,
+            on_result=on_audited,
+            on_error=lambda audit_error: QMessageBox.critical(
+                self, 
+                "Ошибка аудита", 
+                f"Ошибка при выполнении ночного аудита: {str(audit_error)}"
+            ),
+            owner=self, key=(id(self), 'night_audit'), rerun=False
+        )
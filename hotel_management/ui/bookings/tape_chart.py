@@ -0,0 +1,263 @@
+from datetime import date, timedelta
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QAbstractScrollArea,
+                            QLabel, QDateEdit, QSpinBox, QPushButton, QToolTip, QMessageBox)
+from PyQt6.QtGui import QPainter, QColor, QPen
+from PyQt6.QtCore import QDate, QEvent, QRect, Qt
+from hotel_management.database.background import query_executor
+from hotel_management.services.booking_service import booking_service
+
+# Коды статусов в матрице занятости (0 - номер свободен)
+STATUS_CODES = {'booked': 1, 'checked_in': 2}
+STATUS_NAMES = {1: 'Забронирован', 2: 'Гость заселен'}
+
+
+def build_occupancy_matrix(room_ids, stays, start_date, days):
+    """
+    Матрица занятости номер × ночь, заполняемая одним векторным проходом
+    :param room_ids: Отсортированные id номеров (порядок строк)
+    :param stays: Список (room_id, check_in_date, check_out_date, status)
+    :param start_date: Первая ночь окна
+    :param days: Число ночей в окне
+    :return: (status, booking) - int8 код статуса и int32 номер брони в stays + 1 (0 - свободно)
+    """
+    status = np.zeros((len(room_ids), days), dtype=np.int8)
+    booking = np.zeros((len(room_ids), days), dtype=np.int32)
+    if not stays or not room_ids:
+        return status, booking
+
+    rooms = np.asarray(room_ids)
+    stay_rooms = np.fromiter((stay[0] for stay in stays), dtype=rooms.dtype, count=len(stays))
+    check_ins = np.array([stay[1] for stay in stays], dtype='datetime64[D]')
+    check_outs = np.array([stay[2] for stay in stays], dtype='datetime64[D]')
+    codes = np.fromiter((STATUS_CODES.get(stay[3], 0) for stay in stays), dtype=np.int8, count=len(stays))
+
+    # Строка номера и границы проживания в колонках окна [start, end)
+    rows = np.searchsorted(rooms, stay_rooms)
+    known = rows < len(rooms)
+    known[known] = rooms[rows[known]] == stay_rooms[known]
+    window_start = np.datetime64(start_date, 'D')
+    starts = np.clip((check_ins - window_start).astype(np.int64), 0, days)
+    ends = np.clip((check_outs - window_start).astype(np.int64), 0, days)
+    lengths = np.where(known, ends - starts, 0).clip(min=0)
+
+    total = int(lengths.sum())
+    if not total:
+        return status, booking
+    # Каждой занятой ночи - строка, колонка, код статуса и номер брони
+    cell_rows = np.repeat(rows, lengths)
+    run_offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    cell_columns = np.repeat(starts, lengths) + run_offsets
+    status[cell_rows, cell_columns] = np.repeat(codes, lengths)
+    booking[cell_rows, cell_columns] = np.repeat(np.arange(1, len(stays) + 1, dtype=np.int32), lengths)
+    return status, booking
+
+
+class TapeChart(QAbstractScrollArea):
+    """
+    Шахматка: номера по строкам, ночи по колонкам.
+    Рисуется только видимая часть матрицы; проживание в строке выводится
+    одним прямоугольником на каждый непрерывный отрезок.
+    """
+    CELL_WIDTH = 28
+    ROW_HEIGHT = 22
+    ROOM_COLUMN_WIDTH = 90
+    HEADER_HEIGHT = 36
+    COLORS = {1: QColor('#f6c26b'), 2: QColor('#e06c75')}
+    WEEKEND_COLOR = QColor('#f2f2f2')
+    GRID_COLOR = QColor('#dddddd')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rooms = []
+        self.stays = []
+        self.start_date = date.today()
+        self.status = np.zeros((0, 0), dtype=np.int8)
+        self.booking = np.zeros((0, 0), dtype=np.int32)
+        self.weekends = np.zeros(0, dtype=bool)
+        self.horizontalScrollBar().setSingleStep(self.CELL_WIDTH)
+        self.verticalScrollBar().setSingleStep(self.ROW_HEIGHT)
+        self.viewport().setMouseTracking(True)
+
+    def set_data(self, rooms, stays, start_date, status, booking):
+        """
+        :param rooms: Номера (room_id, floor, category_id) в порядке строк
+        :param stays: Брони (room_id, check_in, check_out, status, full_name); номера из booking указывают сюда
+        """
+        self.rooms = rooms
+        self.stays = stays
+        self.start_date = start_date
+        self.status = status
+        self.booking = booking
+        first_day = np.datetime64(start_date, 'D')
+        weekdays = (np.arange(status.shape[1]) + (first_day.astype(np.int64) + 3)) % 7
+        self.weekends = weekdays >= 5
+        self.update_scroll_ranges()
+        self.viewport().update()
+
+    def update_scroll_ranges(self):
+        body_width = self.viewport().width() - self.ROOM_COLUMN_WIDTH
+        body_height = self.viewport().height() - self.HEADER_HEIGHT
+        content_width = self.status.shape[1] * self.CELL_WIDTH
+        content_height = self.status.shape[0] * self.ROW_HEIGHT
+        self.horizontalScrollBar().setRange(0, max(0, content_width - body_width))
+        self.horizontalScrollBar().setPageStep(max(body_width, self.CELL_WIDTH))
+        self.verticalScrollBar().setRange(0, max(0, content_height - body_height))
+        self.verticalScrollBar().setPageStep(max(body_height, self.ROW_HEIGHT))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_ranges()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def visible_range(self):
+        """Видимые строки и колонки: (первая строка, после последней, первая колонка, после последней)"""
+        rows, days = self.status.shape
+        offset_x = self.horizontalScrollBar().value()
+        offset_y = self.verticalScrollBar().value()
+        body_width = self.viewport().width() - self.ROOM_COLUMN_WIDTH
+        body_height = self.viewport().height() - self.HEADER_HEIGHT
+        first_column = offset_x // self.CELL_WIDTH
+        last_column = min(days, (offset_x + body_width) // self.CELL_WIDTH + 1)
+        first_row = offset_y // self.ROW_HEIGHT
+        last_row = min(rows, (offset_y + body_height) // self.ROW_HEIGHT + 1)
+        return first_row, last_row, first_column, last_column
+
+    def cell_rect(self, row, column):
+        x = self.ROOM_COLUMN_WIDTH + column * self.CELL_WIDTH - self.horizontalScrollBar().value()
+        y = self.HEADER_HEIGHT + row * self.ROW_HEIGHT - self.verticalScrollBar().value()
+        return QRect(x, y, self.CELL_WIDTH, self.ROW_HEIGHT)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        width, height = self.viewport().width(), self.viewport().height()
+        painter.fillRect(0, 0, width, height, self.palette().base())
+        first_row, last_row, first_column, last_column = self.visible_range()
+
+        # Тело таблицы: выходные, сетка, отрезки проживаний
+        painter.setClipRect(self.ROOM_COLUMN_WIDTH, self.HEADER_HEIGHT, width, height)
+        for column in range(first_column, last_column):
+            if self.weekends[column]:
+                column_rect = self.cell_rect(first_row, column)
+                painter.fillRect(column_rect.x(), self.HEADER_HEIGHT, self.CELL_WIDTH, height, self.WEEKEND_COLOR)
+        painter.setPen(QPen(self.GRID_COLOR))
+        for column in range(first_column, last_column + 1):
+            x = self.cell_rect(0, column).x()
+            painter.drawLine(x, self.HEADER_HEIGHT, x, height)
+        for row in range(first_row, last_row + 1):
+            y = self.cell_rect(row, 0).y()
+            painter.drawLine(self.ROOM_COLUMN_WIDTH, y, width, y)
+
+        for row in range(first_row, last_row):
+            segment = self.booking[row, first_column:last_column]
+            if not segment.any():
+                continue
+            boundaries = np.flatnonzero(np.diff(segment)) + 1
+            for start, end in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(segment)]))):
+                booking_number = segment[start]
+                if not booking_number:
+                    continue
+                left = self.cell_rect(row, first_column + start)
+                bar = QRect(left.x() + 1, left.y() + 3, (end - start) * self.CELL_WIDTH - 2, self.ROW_HEIGHT - 6)
+                painter.fillRect(bar, self.COLORS.get(int(self.status[row, first_column + start]), self.GRID_COLOR))
+                if bar.width() > 40:
+                    painter.setPen(self.palette().text().color())
+                    guest_name = self.stays[booking_number - 1][4]
+                    painter.drawText(bar.adjusted(4, 0, -2, 0), Qt.AlignmentFlag.AlignVCenter,
+                                     painter.fontMetrics().elidedText(guest_name, Qt.TextElideMode.ElideRight,
+                                                                      bar.width() - 6))
+
+        # Закрепленные заголовки: даты сверху, номера слева
+        painter.setClipping(False)
+        painter.fillRect(0, 0, width, self.HEADER_HEIGHT, self.palette().button())
+        painter.fillRect(0, 0, self.ROOM_COLUMN_WIDTH, height, self.palette().button())
+        painter.setPen(self.palette().buttonText().color())
+        painter.setClipRect(self.ROOM_COLUMN_WIDTH, 0, width, self.HEADER_HEIGHT)
+        for column in range(first_column, last_column):
+            night = self.start_date + timedelta(days=int(column))
+            x = self.cell_rect(0, column).x()
+            if night.day == 1 or column == first_column:
+                painter.drawText(x + 2, 14, night.strftime('%m.%Y'))
+            painter.drawText(QRect(x, 18, self.CELL_WIDTH, 18), Qt.AlignmentFlag.AlignCenter, str(night.day))
+        painter.setClipRect(0, self.HEADER_HEIGHT, self.ROOM_COLUMN_WIDTH, height)
+        for row in range(first_row, last_row):
+            y = self.cell_rect(row, 0).y()
+            room_id, floor, _ = self.rooms[row]
+            painter.drawText(QRect(6, y, self.ROOM_COLUMN_WIDTH - 6, self.ROW_HEIGHT),
+                             Qt.AlignmentFlag.AlignVCenter, f"№{room_id} ({floor} эт.)")
+        painter.end()
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            self.show_cell_tooltip(event)
+            return True
+        return super().viewportEvent(event)
+
+    def show_cell_tooltip(self, event):
+        position = event.pos()
+        column = (position.x() - self.ROOM_COLUMN_WIDTH + self.horizontalScrollBar().value()) // self.CELL_WIDTH
+        row = (position.y() - self.HEADER_HEIGHT + self.verticalScrollBar().value()) // self.ROW_HEIGHT
+        rows, days = self.booking.shape
+        if (position.x() < self.ROOM_COLUMN_WIDTH or position.y() < self.HEADER_HEIGHT
+                or not (0 <= row < rows and 0 <= column < days) or not self.booking[row, column]):
+            QToolTip.hideText()
+            return
+        _, check_in, check_out, _, guest_name = self.stays[self.booking[row, column] - 1]
+        QToolTip.showText(
+            event.globalPos(),
+            f"{guest_name}\n{check_in:%d.%m.%Y} - {check_out:%d.%m.%Y}\n"
+            f"{STATUS_NAMES.get(int(self.status[row, column]), '')}",
+            self.viewport()
+        )
+
+
+class TapeChartPanel(QWidget):
+    """Шахматка занятости с выбором окна дат (от 30 до 365 ночей)"""
+    MIN_DAYS = 30
+    MAX_DAYS = 365
+    DEFAULT_DAYS = 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.start_input = QDateEdit(QDate.currentDate())
+        self.start_input.setCalendarPopup(True)
+        self.days_input = QSpinBox()
+        self.days_input.setRange(self.MIN_DAYS, self.MAX_DAYS)
+        self.days_input.setValue(self.DEFAULT_DAYS)
+        self.days_input.setSuffix(" ночей")
+        self.refresh_button = QPushButton("Обновить")
+        self.refresh_button.clicked.connect(self.load)
+        self.start_input.dateChanged.connect(self.load)
+        self.days_input.editingFinished.connect(self.load)
+
+        controls.addWidget(QLabel("С даты:"))
+        controls.addWidget(self.start_input)
+        controls.addWidget(QLabel("Период:"))
+        controls.addWidget(self.days_input)
+        controls.addWidget(self.refresh_button)
+        controls.addStretch()
+
+        self.chart = TapeChart()
+        layout.addLayout(controls)
+        layout.addWidget(self.chart)
+
+    def load(self):
+        """Загружает брони окна в фоне и перестраивает матрицу"""
+        query_executor().submit(
+            self.fetch_matrix, self.start_input.date().toPyDate(), self.days_input.value(),
+            on_result=lambda result: self.chart.set_data(*result),
+            on_error=lambda e: QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки шахматки: {str(e)}"),
+            owner=self, key=(id(self), 'tape_chart')
+        )
+
+    @staticmethod
+    def fetch_matrix(start_date, days):
+        """Чтение номеров и броней окна и построение матрицы (выполняется в рабочем потоке)"""
+        rooms, stays = booking_service.stays_in_range(start_date, start_date + timedelta(days=days))
+        status, booking = build_occupancy_matrix([room[0] for room in rooms], stays, start_date, days)
+        return rooms, stays, start_date, status, booking
@@ -1,265 +1,289 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QHeaderView,
-                            QTableWidgetItem, QPushButton, QHBoxLayout,
-                            QMessageBox, QDialog, QFormLayout, QLineEdit,
-                            QDialogButtonBox)
-from PyQt6.QtCore import Qt
-from hotel_management.database.connector import DatabaseConnector
-
-class GuestManager(QWidget):
-    def __init__(self, parent=None):
-        super().__init__()
-        self.parent = parent
-        self.init_ui()
-        self.load_guests()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Таблица гостей с запретом редактирования
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["ID", "ФИО", "Телефон", "Возраст"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-
-        # Кнопки управления
-        btn_layout = QHBoxLayout()
-        self.btn_add = QPushButton("Добавить гостя")
-        self.btn_add.clicked.connect(self.show_add_dialog)
-        self.btn_edit = QPushButton("Редактировать")
-        self.btn_edit.clicked.connect(self.show_edit_dialog)
-        self.btn_delete = QPushButton("Удалить")
-        self.btn_delete.clicked.connect(self.delete_guest)
-
-        btn_layout.addWidget(self.btn_add)
-        btn_layout.addWidget(self.btn_edit)
-        btn_layout.addWidget(self.btn_delete)
-
-        layout.addWidget(self.table)
-        layout.addLayout(btn_layout)
-        self.setLayout(layout)
-
-    def load_guests(self):
-        """Загрузка списка гостей с проверкой прав"""
-        if self.parent and not self.parent.check_permission('manage_guests'):
-            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра гостей")
-            return
-
-        db = DatabaseConnector()
-        if not db.connect():
-            QMessageBox.warning(self, "Ошибка", "Не удалось подключиться к базе данных")
-            return
-
-        try:
-            query = "SELECT guest_id, full_name, phone_number, age FROM guests ORDER BY full_name"
-            result = db.execute_query(query, fetch=True)
-
-            if result:
-                self.table.setRowCount(len(result))
-                for row_idx, row in enumerate(result):
-                    for col_idx, cell in enumerate(row):
-                        item = QTableWidgetItem(str(cell) if cell else "")
-                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        self.table.setItem(row_idx, col_idx, item)
-            else:
-                self.table.setRowCount(0)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке гостей: {str(e)}")
-        finally:
-            db.disconnect()
-
-    def show_add_dialog(self):
-        """Диалог добавления гостя"""
-        if self.parent and not self.parent.check_permission('manage_guests'):
-            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для добавления гостей")
-            return
-
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Добавить гостя")
-        dialog.setFixedSize(400, 300)
-
-        layout = QFormLayout()
-
-        self.full_name_input = QLineEdit()
-        self.phone_input = QLineEdit()
-        self.age_input = QLineEdit()
-
-        layout.addRow("ФИО:", self.full_name_input)
-        layout.addRow("Телефон:", self.phone_input)
-        layout.addRow("Возраст:", self.age_input)
-
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        buttons.accepted.connect(lambda: self.add_guest(dialog))
-        buttons.rejected.connect(dialog.reject)
-
-        layout.addRow(buttons)
-        dialog.setLayout(layout)
-        dialog.exec()
-
-    def add_guest(self, dialog):
-        """Добавление нового гостя через форму"""
-        full_name = self.full_name_input.text().strip()
-        phone = self.phone_input.text().strip()
-        age = self.age_input.text().strip()
-
-        if not full_name:
-            QMessageBox.warning(self, "Ошибка", "ФИО обязательно для заполнения")
-            return
-
-        db = DatabaseConnector()
-        if not db.connect():
-            QMessageBox.warning(self, "Ошибка", "Не удалось подключиться к базе данных")
-            return
-
-        try:
-            query = "INSERT INTO guests (full_name, phone_number, age) VALUES (%s, %s, %s)"
-            params = (
-                full_name,
-                phone if phone else None,
-                int(age) if age.isdigit() else None
-            )
-            success = db.execute_query(query, params)
-
-            if success:
-                QMessageBox.information(self, "Успех", "Гость успешно добавлен")
-                self.load_guests()
-                dialog.close()
-            else:
-                QMessageBox.warning(self, "Ошибка", "Не удалось добавить гостя")
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Возраст должен быть числом")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при добавлении гостя: {str(e)}")
-        finally:
-            db.disconnect()
-
-    def show_edit_dialog(self):
-        """Диалог редактирования гостя"""
-        if self.parent and not self.parent.check_permission('manage_guests'):
-            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для редактирования гостей")
-            return
-
-        selected_row = self.table.currentRow()
-        if selected_row == -1:
-            QMessageBox.warning(self, "Ошибка", "Выберите гостя для редактирования")
-            return
-
-        guest_id = self.table.item(selected_row, 0).text()
-        full_name = self.table.item(selected_row, 1).text()
-        phone = self.table.item(selected_row, 2).text()
-        age = self.table.item(selected_row, 3).text()
-
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Редактировать гостя")
-        dialog.setFixedSize(400, 300)
-
-        layout = QFormLayout()
-
-        self.edit_full_name = QLineEdit(full_name)
-        self.edit_phone = QLineEdit(phone)
-        self.edit_age = QLineEdit(age)
-
-        layout.addRow("ФИО:", self.edit_full_name)
-        layout.addRow("Телефон:", self.edit_phone)
-        layout.addRow("Возраст:", self.edit_age)
-
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        buttons.accepted.connect(lambda: self.update_guest(dialog, guest_id))
-        buttons.rejected.connect(dialog.reject)
-
-        layout.addRow(buttons)
-        dialog.setLayout(layout)
-        dialog.exec()
-
-    def update_guest(self, dialog, guest_id):
-        """Обновление данных гостя через форму"""
-        full_name = self.edit_full_name.text().strip()
-        phone = self.edit_phone.text().strip()
-        age = self.edit_age.text().strip()
-
-        if not full_name:
-            QMessageBox.warning(self, "Ошибка", "ФИО обязательно для заполнения")
-            return
-
-        db = DatabaseConnector()
-        if not db.connect():
-            QMessageBox.warning(self, "Ошибка", "Не удалось подключиться к базе данных")
-            return
-
-        try:
-            query = """
-            UPDATE guests 
-            SET full_name = %s, phone_number = %s, age = %s 
-            WHERE guest_id = %s
-            """
-            params = (
-                full_name,
-                phone if phone else None,
-                int(age) if age.isdigit() else None,
-                guest_id
-            )
-            success = db.execute_query(query, params)
-
-            if success:
-                QMessageBox.information(self, "Успех", "Данные гостя обновлены")
-                self.load_guests()
-                dialog.close()
-            else:
-                QMessageBox.warning(self, "Ошибка", "Не удалось обновить данные гостя")
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Возраст должен быть числом")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при обновлении гостя: {str(e)}")
-        finally:
-            db.disconnect()
-
-    def delete_guest(self):
-        """Удаление гостя с подтверждением"""
-        if self.parent and not self.parent.check_permission('manage_guests'):
-            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для удаления гостей")
-            return
-
-        selected_row = self.table.currentRow()
-        if selected_row == -1:
-            QMessageBox.warning(self, "Ошибка", "Выберите гостя для удаления")
-            return
-
-        guest_id = self.table.item(selected_row, 0).text()
-        full_name = self.table.item(selected_row, 1).text()
-
-        reply = QMessageBox.question(
-            self, 
-            "Подтверждение", 
-            f"Вы уверены, что хотите удалить гостя {full_name}?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-
-        if reply == QMessageBox.StandardButton.No:
-            return
-
-        db = DatabaseConnector()
-        if not db.connect():
-            QMessageBox.warning(self, "Ошибка", "Не удалось подключиться к базе данных")
-            return
-
-        try:
-            # Проверка на связанные бронирования
-            check_query = "SELECT COUNT(*) FROM occupancy WHERE guest_id = %s"
-            check_result = db.execute_query(check_query, (guest_id,), fetch=True)
-
-            if check_result and check_result[0][0] > 0:
-                QMessageBox.warning(self, "Ошибка", "Нельзя удалить гостя с активными бронированиями")
-                return
-
-            query = "DELETE FROM guests WHERE guest_id = %s"
-            success = db.execute_query(query, (guest_id,))
-
-            if success:
-                QMessageBox.information(self, "Успех", "Гость успешно удален")
-                self.load_guests()
-            else:
-                QMessageBox.warning(self, "Ошибка", "Не удалось удалить гостя")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении гостя: {str(e)}")
-        finally:
-            db.disconnect()
\ No newline at end of file
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QHBoxLayout,
+                            QMessageBox, QDialog, QFormLayout, QLineEdit,
+                            QDialogButtonBox, QFileDialog)
+from PyQt6.QtCore import QTimer
+import csv
+from hotel_management.database.models import ValidationError
+from hotel_management.database.notifications import change_bus
+from hotel_management.database.background import query_executor
+from hotel_management.services.guest_service import guest_service
+from hotel_management.ui.table_model import RecordTableModel, create_table_view, current_record
+
+class GuestManager(QWidget):
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+        self.search_pattern = None
+        # Номер загрузки: страницы, запрошенные до новой загрузки или поиска, отбрасываются
+        self.load_generation = 0
+        self.init_ui()
+        change_bus().subscribe(['guests'], self.on_data_changed, self)
+        self.load_guests()
+
+    def on_data_changed(self, events):
+        """Обновление по уведомлениям об изменениях (с этого или другого клиента)"""
+        self.load_guests()
+
+    def refresh_after_change(self):
+        """После собственного изменения: при активной шине обновление придет уведомлением"""
+        if not change_bus().active:
+            self.load_guests()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Поиск по ФИО или телефону: запрос уходит после паузы в наборе
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Поиск по ФИО или телефону (от 3 символов)")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.load_guests)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+
+        # Таблица гостей (только чтение); записи: guest_id, full_name, phone_number, age
+        self.model = RecordTableModel([("ID", 0), ("ФИО", 1), ("Телефон", 2), ("Возраст", 3)], self)
+        self.table = create_table_view(self.model)
+
+        # Кнопки управления
+        btn_layout = QHBoxLayout()
+        self.btn_add = QPushButton("Добавить гостя")
+        self.btn_add.clicked.connect(self.show_add_dialog)
+        self.btn_edit = QPushButton("Редактировать")
+        self.btn_edit.clicked.connect(self.show_edit_dialog)
+        self.btn_delete = QPushButton("Удалить")
+        self.btn_delete.clicked.connect(self.delete_guest)
+        self.btn_import = QPushButton("Импорт из CSV")
+        self.btn_import.clicked.connect(self.import_guests)
+        self.btn_export = QPushButton("Экспорт в CSV")
+        self.btn_export.clicked.connect(self.export_guests)
+
+        btn_layout.addWidget(self.btn_add)
+        btn_layout.addWidget(self.btn_edit)
+        btn_layout.addWidget(self.btn_delete)
+        btn_layout.addWidget(self.btn_import)
+        btn_layout.addWidget(self.btn_export)
+
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.table)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def load_guests(self):
+        """Загрузка первой страницы гостей (с учетом строки поиска) с проверкой прав"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра гостей")
+            return
+
+        self.search_pattern = guest_service.search_pattern(self.search_input.text())
+        self.load_generation += 1
+        # Следующие страницы модель запросит сама, когда прокрутка дойдет до конца
+        self.model.set_pager(self.request_page, guest_service.PAGE_SIZE)
+
+    def request_page(self, last_guest):
+        """Запрашивает в фоне страницу гостей после last_guest (None - первую)"""
+        generation = self.load_generation
+        query_executor().submit(
+            guest_service.page, last_guest, self.search_pattern,
+            on_result=lambda guests: self.on_page_loaded(generation, guests),
+            on_error=lambda error: self.on_page_failed(generation, error),
+            owner=self
+        )
+
+    def on_page_loaded(self, generation, guests):
+        if generation == self.load_generation:
+            self.model.append_page(guests)
+
+    def on_page_failed(self, generation, error):
+        if generation != self.load_generation:
+            return
+        self.model.append_page(None)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке гостей: {str(error)}")
+
+    def run_change(self, operation, args, on_done, error_title):
+        """
+        Выполняет операцию сервиса гостей в фоне.
+        Ошибки проверки ввода показываются предупреждением, прочие - как критические.
+        """
+        def on_error(error):
+            if isinstance(error, ValidationError):
+                QMessageBox.warning(self, "Ошибка", str(error))
+            else:
+                QMessageBox.critical(self, "Ошибка", f"{error_title}: {str(error)}")
+
+        query_executor().submit(
+            operation, *args,
+            on_result=on_done, on_error=on_error,
+            owner=self, key=(id(self), 'change'), rerun=False
+        )
+
+    def show_add_dialog(self):
+        """Диалог добавления гостя"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для добавления гостей")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Добавить гостя")
+        dialog.setFixedSize(400, 300)
+
+        layout = QFormLayout()
+
+        self.full_name_input = QLineEdit()
+        self.phone_input = QLineEdit()
+        self.age_input = QLineEdit()
+
+        layout.addRow("ФИО:", self.full_name_input)
+        layout.addRow("Телефон:", self.phone_input)
+        layout.addRow("Возраст:", self.age_input)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(lambda: self.add_guest(dialog))
+        buttons.rejected.connect(dialog.reject)
+
+        layout.addRow(buttons)
+        dialog.setLayout(layout)
+        dialog.exec()
+
+    def add_guest(self, dialog):
+        """Добавление нового гостя через форму"""
+        def on_added(_):
+            QMessageBox.information(self, "Успех", "Гость успешно добавлен")
+            self.refresh_after_change()
+            dialog.close()
+
+        self.run_change(
+            guest_service.create_guest,
+            (self.full_name_input.text(), self.phone_input.text(), self.age_input.text()),
+            on_added, "Ошибка при добавлении гостя"
+        )
+
+    def show_edit_dialog(self):
+        """Диалог редактирования гостя"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для редактирования гостей")
+            return
+
+        guest = current_record(self.table)
+        if guest is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите гостя для редактирования")
+            return
+
+        guest_id, full_name, phone, age = guest
+        phone = phone or ""
+        age = str(age) if age is not None else ""
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Редактировать гостя")
+        dialog.setFixedSize(400, 300)
+
+        layout = QFormLayout()
+
+        self.edit_full_name = QLineEdit(full_name)
+        self.edit_phone = QLineEdit(phone)
+        self.edit_age = QLineEdit(age)
+
+        layout.addRow("ФИО:", self.edit_full_name)
+        layout.addRow("Телефон:", self.edit_phone)
+        layout.addRow("Возраст:", self.edit_age)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(lambda: self.update_guest(dialog, guest_id))
+        buttons.rejected.connect(dialog.reject)
+
+        layout.addRow(buttons)
+        dialog.setLayout(layout)
+        dialog.exec()
+
+    def update_guest(self, dialog, guest_id):
+        """Обновление данных гостя через форму"""
+        def on_updated(found):
+            if not found:
+                QMessageBox.warning(self, "Ошибка", "Не удалось обновить данные гостя")
+                return
+            QMessageBox.information(self, "Успех", "Данные гостя обновлены")
+            self.refresh_after_change()
+            dialog.close()
+
+        self.run_change(
+            guest_service.update_guest,
+            (guest_id, self.edit_full_name.text(), self.edit_phone.text(), self.edit_age.text()),
+            on_updated, "Ошибка при обновлении гостя"
+        )
+
+    def delete_guest(self):
+        """Удаление гостя с подтверждением"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для удаления гостей")
+            return
+
+        guest = current_record(self.table)
+        if guest is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите гостя для удаления")
+            return
+
+        guest_id, full_name = guest[0], guest[1]
+
+        reply = QMessageBox.question(
+            self, 
+            "Подтверждение", 
+            f"Вы уверены, что хотите удалить гостя {full_name}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        def on_deleted(found):
+            if not found:
+                QMessageBox.warning(self, "Ошибка", "Не удалось удалить гостя")
+                return
+            QMessageBox.information(self, "Успех", "Гость успешно удален")
+            self.refresh_after_change()
+
+        self.run_change(guest_service.delete_guest, (guest_id,), on_deleted, "Ошибка при удалении гостя")
+
+    def import_guests(self):
+        """Массовый импорт гостей из CSV (ФИО; Телефон; Возраст) одной операцией COPY"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для добавления гостей")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(self, "Импорт гостей", "", "CSV (*.csv)")
+        if not path:
+            return
+
+        try:
+            rows = guest_service.read_csv(path)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось прочитать файл: {str(e)}")
+            return
+
+        if not rows:
+            QMessageBox.information(self, "Информация", "В файле нет гостей для импорта")
+            return
+
+        def on_imported(loaded):
+            QMessageBox.information(self, "Успех", f"Импортировано гостей: {loaded}")
+            self.refresh_after_change()
+
+        self.run_change(guest_service.import_guests, (rows,), on_imported, "Ошибка при импорте гостей")
+
+    def export_guests(self):
+        """Экспорт всех гостей в CSV потоком с серверного курсора"""
+        if self.parent and not self.parent.check_permission('manage_guests'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра гостей")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Экспорт гостей", "guests.csv", "CSV (*.csv)")
+        if not path:
+            return
+
+        query_executor().submit(
+            guest_service.export_csv, path,
+            on_result=lambda exported: QMessageBox.information(
+                self, "Успех", f"Экспортировано гостей: {exported}"),
+            on_error=lambda e: QMessageBox.critical(self, "Ошибка", f"Ошибка при экспорте гостей: {str(e)}"),
+            owner=self, key=(id(self), 'export'), rerun=False
+        )
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QStringListModel, Qt, QTimer
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+from hotel_management.database.background import query_executor
+
+
+class PrefixCache:
+    """
+    Кэш результатов поиска по префиксу.
+    Если для более короткого префикса сервер вернул меньше limit строк,
+    это полный список совпадений - результат для более длинного префикса
+    получается фильтрацией без запроса к БД.
+    """
+
+    def __init__(self, limit, matches, max_entries=64):
+        """
+        :param limit: Максимум строк в ответе сервера
+        :param matches: Функция (строка, префикс) -> подходит ли строка под префикс
+        :param max_entries: Сколько префиксов хранить (вытесняются давно использованные)
+        """
+        self.limit = limit
+        self._matches = matches
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, prefix):
+        """Строки для префикса или None, если нужен запрос к БД"""
+        if prefix in self._entries:
+            self._entries.move_to_end(prefix)
+            return self._entries[prefix]
+        for length in range(len(prefix) - 1, -1, -1):
+            rows = self._entries.get(prefix[:length])
+            if rows is not None and len(rows) < self.limit:
+                rows = [row for row in rows if self._matches(row, prefix)]
+                self.put(prefix, rows)
+                return rows
+        return None
+
+    def put(self, prefix, rows):
+        self._entries[prefix] = rows
+        self._entries.move_to_end(prefix)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class LookupPicker(QLineEdit):
+    """
+    Поле выбора записи с подсказками по мере набора.
+    Подсказки запрашиваются в фоне по префиксу (не больше cache.limit строк)
+    и кэшируются, поэтому открытие формы не требует загрузки всей таблицы.
+    """
+    DEBOUNCE_MS = 200
+
+    def __init__(self, fetch, describe, cache, min_length=1, parent=None):
+        """
+        :param fetch: Функция (префикс, лимит) -> строки; выполняется в рабочем потоке
+        :param describe: Функция строка -> (id, текст подсказки)
+        :param cache: PrefixCache для этого поля
+        :param min_length: Минимальная длина префикса для запроса
+        """
+        super().__init__(parent)
+        self._fetch = fetch
+        self._describe = describe
+        self._cache = cache
+        self._min_length = min_length
+        self._choices = {}
+        self._selected_id = None
+        self._generation = 0
+
+        self._model = QStringListModel(self)
+        self._completer = QCompleter(self._model, self)
+        # Список уже отфильтрован сервером - комплитер показывает его целиком
+        self._completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self._completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._completer.activated[str].connect(self._on_activated)
+        self.setCompleter(self._completer)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self.lookup)
+        self.textEdited.connect(self._on_edited)
+
+    def currentData(self):
+        """id выбранной записи или None, если запись не выбрана из подсказок"""
+        return self._selected_id
+
+    def lookup(self):
+        """Запрашивает подсказки для текущего текста"""
+        prefix = self.text().strip().lower()
+        if len(prefix) < self._min_length:
+            self._show([])
+            return
+
+        rows = self._cache.get(prefix)
+        if rows is not None:
+            self._show(rows)
+            return
+
+        self._generation += 1
+        generation = self._generation
+        query_executor().submit(
+            self._fetch, prefix, self._cache.limit,
+            on_result=lambda rows: self._on_loaded(generation, prefix, rows),
+            owner=self
+        )
+
+    def keyPressEvent(self, event):
+        # Стрелка вниз открывает подсказки без ввода текста
+        if event.key() == Qt.Key.Key_Down and not self._completer.popup().isVisible():
+            self.lookup()
+            return
+        super().keyPressEvent(event)
+
+    def _on_edited(self, text):
+        self._selected_id = self._choices.get(text)
+        self._timer.start()
+
+    def _on_loaded(self, generation, prefix, rows):
+        if rows is None or generation != self._generation:
+            return
+        self._cache.put(prefix, rows)
+        if self.text().strip().lower() == prefix:
+            self._show(rows)
+
+    def _show(self, rows):
+        self._choices = {label: row_id for row_id, label in map(self._describe, rows)}
+        self._model.setStringList(list(self._choices))
+        if self._choices and self.hasFocus():
+            self._completer.complete()
+
+    def _on_activated(self, text):
+        self._selected_id = self._choices.get(text)
@@ -0,0 +1,145 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                            QDateEdit, QMessageBox)
+from PyQt6.QtCore import QDate
+from hotel_management.database.notifications import change_bus
+from hotel_management.database.background import query_executor
+from hotel_management.services.report_service import report_service
+from hotel_management.ui.table_model import RecordTableModel, create_table_view
+
+class ReportManager(QWidget):
+    """
+    Отчеты по загрузке, заездам и выездам, отменам и уборке.
+    Читаются дневные сводки report_daily_*, которые триггеры БД обновляют
+    при каждом изменении броней и уборок, - отчет за год это 365 строк.
+    """
+    # Период длиннее этого числа дней выводится по месяцам
+    MONTHLY_THRESHOLD_DAYS = 62
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+        self.init_ui()
+        change_bus().subscribe(['occupancy', 'cleaning', 'rooms'], self.on_data_changed, self)
+        self.load_report()
+
+    def on_data_changed(self, events):
+        """Сводки уже обновлены триггерами - перечитываем открытый отчет"""
+        if self.isVisible():
+            self.load_report()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        period_layout = QHBoxLayout()
+        today = QDate.currentDate()
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.date_from.setCalendarPopup(True)
+        self.date_to = QDateEdit(QDate(today.year(), today.month(), today.daysInMonth()))
+        self.date_to.setCalendarPopup(True)
+
+        self.btn_month = QPushButton("Текущий месяц")
+        self.btn_month.clicked.connect(self.select_current_month)
+        self.btn_year = QPushButton("Текущий год")
+        self.btn_year.clicked.connect(self.select_current_year)
+        self.btn_build = QPushButton("Сформировать")
+        self.btn_build.clicked.connect(self.load_report)
+
+        period_layout.addWidget(QLabel("С:"))
+        period_layout.addWidget(self.date_from)
+        period_layout.addWidget(QLabel("По:"))
+        period_layout.addWidget(self.date_to)
+        period_layout.addWidget(self.btn_month)
+        period_layout.addWidget(self.btn_year)
+        period_layout.addWidget(self.btn_build)
+        period_layout.addStretch()
+
+        # Записи: период, ночей занято, загрузка %, заезды, выезды, отмены,
+        # уборок запрошено, уборок выполнено, среднее время уборки (ч)
+        self.model = RecordTableModel([
+            ("Период", 0),
+            ("Занято номеро-ночей", 1),
+            ("Загрузка, %", 2),
+            ("Заезды", 3),
+            ("Выезды", 4),
+            ("Отмены", 5),
+            ("Уборок запрошено", 6),
+            ("Уборок выполнено", 7),
+            ("Среднее время уборки, ч", 8)
+        ], self)
+        self.table = create_table_view(self.model)
+
+        layout.addLayout(period_layout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def select_current_month(self):
+        today = QDate.currentDate()
+        self.date_from.setDate(QDate(today.year(), today.month(), 1))
+        self.date_to.setDate(QDate(today.year(), today.month(), today.daysInMonth()))
+        self.load_report()
+
+    def select_current_year(self):
+        today = QDate.currentDate()
+        self.date_from.setDate(QDate(today.year(), 1, 1))
+        self.date_to.setDate(QDate(today.year(), 12, 31))
+        self.load_report()
+
+    def selected_period(self):
+        """Период отчета (дата начала, дата окончания) или None при неверном периоде"""
+        date_from = self.date_from.date().toPyDate()
+        date_to = self.date_to.date().toPyDate()
+        if date_to < date_from:
+            QMessageBox.warning(self, "Ошибка", "Дата окончания периода раньше даты начала")
+            return None
+        return date_from, date_to
+
+    def load_report(self):
+        """Загрузка отчета за выбранный период с проверкой прав"""
+        if self.parent and not self.parent.check_permission('view_reports'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра отчетов")
+            return
+
+        period = self.selected_period()
+        if period is None:
+            return
+        query_executor().submit(
+            report_service.daily_report, *period,
+            on_result=self.fill_table, on_error=self.show_load_error,
+            owner=self, key=(id(self), 'report', period)
+        )
+
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при формировании отчета: {str(error)}")
+
+    def fill_table(self, result):
+        days, rooms_count = result
+        self.model.set_records(self.summarize(days, rooms_count, len(days) > self.MONTHLY_THRESHOLD_DAYS))
+
+    @staticmethod
+    def summarize(days, rooms_count, by_month=False):
+        """
+        Строки отчета из дневных сводок: по дням или по месяцам и итоговая строка
+        :param days: Строки report_daily (день, ночи, заезды, выезды, отмены,
+            запрошено, выполнено, число замеров времени уборки, сумма секунд)
+        """
+        groups = {}
+        for day, *values in days:
+            label = day.strftime('%m.%Y') if by_month else day.strftime('%d.%m.%Y')
+            group = groups.setdefault(label, [0] * (len(values) + 1))
+            group[0] += 1
+            for index, value in enumerate(values, 1):
+                group[index] += value
+
+        if groups:
+            totals = [sum(column) for column in zip(*groups.values())]
+            groups["Итого"] = totals
+
+        records = []
+        for label, (day_count, occupied, arrivals, departures, cancellations,
+                    requested, completed, turnaround_count, turnaround_seconds) in groups.items():
+            capacity = rooms_count * day_count
+            occupancy = f"{100 * occupied / capacity:.1f}" if capacity else "-"
+            turnaround = f"{turnaround_seconds / turnaround_count / 3600:.1f}" if turnaround_count else "-"
+            records.append((label, occupied, occupancy, arrivals, departures, cancellations,
+                            requested, completed, turnaround))
+        return records
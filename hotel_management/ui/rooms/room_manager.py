@@ -1,65 +1,60 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QHeaderView,
-                            QTableWidgetItem, QPushButton, QMessageBox)
-from PyQt6.QtCore import Qt
-from hotel_management.database.connector import DatabaseConnector
-
-class RoomManager(QWidget):
-    def __init__(self, parent=None):
-        super().__init__()
-        self.parent = parent
-        self.init_ui()
-        self.load_rooms()
-
-    def init_ui(self):
-        layout = QVBoxLayout()
-
-        # Таблица номеров с запретом редактирования
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["ID", "Этаж", "Категория", "Статус"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-
-        # Кнопка обновления
-        self.btn_refresh = QPushButton("Обновить список")
-        self.btn_refresh.clicked.connect(self.load_rooms)
-
-        layout.addWidget(self.table)
-        layout.addWidget(self.btn_refresh)
-        self.setLayout(layout)
-
-    def load_rooms(self):
-        """Загрузка данных о номерах из БД с проверкой прав"""
-        if self.parent and not self.parent.check_permission('manage_rooms'):
-            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра номеров")
-            return
-
-        db = DatabaseConnector()
-        if not db.connect():
-            QMessageBox.warning(self, "Ошибка", "Не удалось подключиться к базе данных")
-            return
-
-        try:
-            query = """
-            SELECT r.room_id, r.floor, c.name, s.name
-            FROM rooms r
-            JOIN room_categories c ON r.category_id = c.category_id
-            JOIN statuses s ON r.status_id = s.status_id
-            ORDER BY r.room_id
-            """
-            result = db.execute_query(query, fetch=True)
-
-            if result:
-                self.table.setRowCount(len(result))
-                for row_idx, row in enumerate(result):
-                    for col_idx, cell in enumerate(row):
-                        item = QTableWidgetItem(str(cell) if cell else "")
-                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        self.table.setItem(row_idx, col_idx, item)
-            else:
-                self.table.setRowCount(0)
-                QMessageBox.information(self, "Информация", "Нет данных о номерах")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке данных: {str(e)}")
-        finally:
-            db.disconnect()
\ No newline at end of file
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QMessageBox
+from hotel_management.database.reference_data import reference_data
+from hotel_management.database.notifications import change_bus
+from hotel_management.database.background import query_executor
+from hotel_management.services.room_service import room_service
+from hotel_management.ui.table_model import RecordTableModel, create_table_view
+
+class RoomManager(QWidget):
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+        self.init_ui()
+        change_bus().subscribe(['rooms'], self.on_data_changed, self)
+        self.load_rooms()
+
+    def on_data_changed(self, events):
+        """Обновление по уведомлениям об изменениях (с этого или другого клиента)"""
+        self.load_rooms()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Таблица номеров (только чтение); записи: room_id, floor, category_id, status_id
+        self.model = RecordTableModel([
+            ("ID", 0),
+            ("Этаж", 1),
+            ("Категория", lambda room: reference_data.name('room_categories', room[2])),
+            ("Статус", lambda room: reference_data.name('statuses', room[3]))
+        ], self)
+        self.table = create_table_view(self.model)
+
+        # Кнопка обновления
+        self.btn_refresh = QPushButton("Обновить список")
+        self.btn_refresh.clicked.connect(self.load_rooms)
+
+        layout.addWidget(self.table)
+        layout.addWidget(self.btn_refresh)
+        self.setLayout(layout)
+
+    def load_rooms(self):
+        """Загрузка данных о номерах из БД с проверкой прав"""
+        if self.parent and not self.parent.check_permission('manage_rooms'):
+            QMessageBox.warning(self, "Ошибка доступа", "Недостаточно прав для просмотра номеров")
+            return
+
+        # Запрос выполняется в фоне; повторное нажатие, пока он идет, не ставит второй
+        query_executor().submit(
+            room_service.list_rooms,
+            on_result=self.fill_table, on_error=self.show_load_error,
+            owner=self, key=(id(self), 'rooms')
+        )
+
+    def show_load_error(self, error):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке данных: {str(error)}")
+
+    def fill_table(self, result):
+        """Заполнение таблицы номеров"""
+        self.model.set_records(result or [])
+        if not result:
+            QMessageBox.information(self, "Информация", "Нет данных о номерах")
\ No newline at end of file
@@ -0,0 +1,161 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Модель таблицы только для чтения. Строки хранятся кортежами из БД,
+    текст ячейки вычисляется при отрисовке (data), а представлению строки
+    выдаются порциями по мере прокрутки (fetchMore) - объекты Qt на каждую
+    ячейку не создаются. С загрузчиком страниц (set_pager) следующие строки
+    запрашиваются из БД, когда прокрутка доходит до конца уже полученных.
+    """
+    FETCH_BATCH = 200
+
+    def __init__(self, columns, parent=None):
+        """
+        :param columns: Список (заголовок, значение), где значение - индекс поля
+            записи или функция, получающая запись и возвращающая значение ячейки
+        """
+        super().__init__(parent)
+        self._headers = [title for title, _ in columns]
+        self._getters = [
+            (lambda record, field=value: record[field]) if isinstance(value, int) else value
+            for _, value in columns
+        ]
+        self._records = []
+        self._visible = 0
+        self._pager = None
+        self._page_size = 0
+        self._has_more_pages = False
+        self._page_requested = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._getters[index.column()](self._records[index.row()])
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._visible < len(self._records) or (self._has_more_pages and not self._page_requested)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._visible == len(self._records) and self._has_more_pages and not self._page_requested:
+            self._page_requested = True
+            self._pager(self._records[-1] if self._records else None)
+            return
+        count = min(self.FETCH_BATCH, len(self._records) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def __len__(self):
+        return len(self._records)
+
+    def record(self, row):
+        return self._records[row]
+
+    def records(self):
+        return self._records
+
+    def set_records(self, records):
+        """Заменяет все строки; представление получит первую порцию"""
+        self.beginResetModel()
+        self._records = list(records)
+        self._visible = min(self.FETCH_BATCH, len(self._records))
+        self._has_more_pages = False
+        self._page_requested = False
+        self.endResetModel()
+
+    def set_pager(self, pager, page_size):
+        """
+        Очищает модель и переходит на постраничную загрузку
+        :param pager: Функция, получающая последнюю запись (None для первой страницы)
+            и запрашивающая следующую страницу; ответ передается в append_page
+        :param page_size: Размер страницы; страница короче него - последняя
+        """
+        self.set_records([])
+        self._pager = pager
+        self._page_size = page_size
+        self._has_more_pages = True
+        self.fetchMore()
+
+    def append_page(self, records):
+        """Добавляет полученную страницу (None - ошибка загрузки, страниц больше не будет)"""
+        records = records or []
+        self._page_requested = False
+        self._has_more_pages = self._pager is not None and len(records) >= self._page_size
+        if not records:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._records), len(self._records) + len(records) - 1)
+        self._records.extend(records)
+        self._visible = len(self._records)
+        self.endInsertRows()
+
+    def append_records(self, records):
+        """Добавляет строки в конец (например, очередной пакет серверного курсора)"""
+        self._records.extend(records)
+        if self._visible < self.FETCH_BATCH:
+            self.fetchMore()
+
+    def insert_record(self, row, record):
+        if row > self._visible:
+            # Строка еще не выдана представлению - сигналы не нужны
+            self._records.insert(row, record)
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._records.insert(row, record)
+        self._visible += 1
+        self.endInsertRows()
+
+    def update_record(self, row, record):
+        self._records[row] = record
+        if row < self._visible:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._headers) - 1))
+
+    def remove_record(self, row):
+        if row >= self._visible:
+            del self._records[row]
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._records[row]
+        self._visible -= 1
+        self.endRemoveRows()
+
+
+def create_table_view(model):
+    """Таблица только для чтения с выделением строк целиком"""
+    view = QTableView()
+    view.setModel(model)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    return view
+
+
+def current_record(view):
+    """Запись текущей строки таблицы или None, если строка не выбрана"""
+    index = view.currentIndex()
+    if not index.isValid():
+        return None
+    return view.model().record(index.row())
@@ -1,4 +1,8 @@
-from datetime import datetime
-
-def format_date(value):
-    return value.strftime('%d.%m.%Y') if value else ""
\ No newline at end of file
+from datetime import datetime
+
+def format_date(value):
+    return value.strftime('%d.%m.%Y') if value else ""
+
+def like_escape(text):
+    """Экранирует спецсимволы шаблона LIKE/ILIKE (%, _ и \\)"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
\ No newline at end of file
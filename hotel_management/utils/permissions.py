@@ -0,0 +1,88 @@
+import threading
+from psycopg2 import Error as DatabaseError
+from psycopg2.errors import UndefinedColumn
+from hotel_management.config import PERMISSIONS, ROLE_KEYS
+from hotel_management.database.connector import DatabaseConnector
+
+
+class PermissionEngine:
+    """
+    Права ролей, разрешенные один раз за сессию.
+    Источник - столбец roles.permissions (пустой массив - роль без прав);
+    если роли нет, столбец не заполнен (NULL) или его нет в схеме,
+    используются права по умолчанию из config.PERMISSIONS.
+    Если права прочитать не удалось, роль на время сбоя не получает прав
+    и результат не запоминается: следующая проверка повторит запрос.
+    Проверка права - поиск в frozenset, без обращений к БД. Кэш роли
+    сбрасывается по уведомлению об изменении roles (см. track).
+    """
+    # Администратор имеет все права независимо от roles.permissions
+    ADMIN_ROLE_ID = 1
+
+    def __init__(self):
+        self._roles = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, role_id):
+        """:return: Права роли из БД или по умолчанию; None - БД недоступна"""
+        def read(cursor):
+            cursor.execute("SELECT permissions FROM roles WHERE role_id = %s", (role_id,))
+            return cursor.fetchone()
+
+        try:
+            row = DatabaseConnector().run_in_transaction(read)
+        except UndefinedColumn:
+            row = None
+        except DatabaseError as e:
+            print(f"Ошибка загрузки прав роли {role_id}: {e}")
+            return None
+        if row is None or row[0] is None:
+            return frozenset(PERMISSIONS.get(ROLE_KEYS.get(role_id, ''), []))
+        return frozenset(row[0])
+
+    def for_role(self, role_id):
+        """Набор прав роли (загружается при первом обращении)"""
+        with self._lock:
+            permissions = self._roles.get(role_id)
+        if permissions is None:
+            permissions = self._resolve(role_id)
+            if permissions is None:
+                return frozenset()
+            with self._lock:
+                self._roles[role_id] = permissions
+        return permissions
+
+    def preload(self, role_id, permissions):
+        """Права роли, полученные не из БД (клиент сервера приложения получает их при входе)"""
+        with self._lock:
+            self._roles[role_id] = frozenset(permissions)
+
+    def has(self, role_id, permission):
+        """Есть ли у роли право (право 'all' включает все остальные)"""
+        if role_id == self.ADMIN_ROLE_ID:
+            return True
+        permissions = self.for_role(role_id)
+        return 'all' in permissions or permission in permissions
+
+    def track(self, bus):
+        """Подписывается на изменения ролей (шина изменений клиента или ChangeFeed сервера)"""
+        bus.subscribe(['roles'], self.apply_events, bus)
+
+    def apply_events(self, events):
+        """Обработчик шины изменений: права измененных ролей перечитываются при следующей проверке"""
+        if any(event.table == '*' for event in events):
+            self.invalidate()
+            return
+        for event in events:
+            self.invalidate(event.row_id)
+
+    def invalidate(self, role_id=None):
+        """Сбрасывает права роли (или всех ролей) после их изменения"""
+        with self._lock:
+            if role_id is None:
+                self._roles.clear()
+            else:
+                self._roles.pop(role_id, None)
+
+
+permissions = PermissionEngine()
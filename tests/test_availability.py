@@ -0,0 +1,101 @@
+from datetime import date, datetime
+import pytest
+from hotel_management.database import availability as availability_module
+from hotel_management.database.availability import AvailabilityEngine, _RoomStays
+from hotel_management.database.notifications import ChangeEvent
+from hotel_management.database.queries import AvailabilityQueries
+
+UPDATED = datetime(2026, 1, 1, 12, 0)
+
+
+class FakeConnector:
+    """Вместо БД: номера, проживания и измененные брони из списков теста"""
+    rooms = []
+    stays = []
+    changed = []
+
+    def execute_query(self, query, params=None, fetch=False):
+        return list(self.rooms if query == AvailabilityQueries.GET_ROOMS else self.stays)
+
+    def execute_prepared(self, name, params=None, fetch=True):
+        changed, FakeConnector.changed = FakeConnector.changed, []
+        return changed
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(availability_module, 'DatabaseConnector', FakeConnector)
+    FakeConnector.rooms = [(101, 1, 1), (102, 1, 1), (201, 2, 2)]
+    FakeConnector.stays = [
+        (1, 101, date(2026, 3, 1), date(2026, 3, 5), UPDATED),
+        (2, 101, date(2026, 3, 10), date(2026, 3, 12), UPDATED),
+        (3, 102, date(2026, 3, 3), date(2026, 3, 4), UPDATED)
+    ]
+    FakeConnector.changed = []
+    engine = AvailabilityEngine()
+    assert engine.load()
+    return engine
+
+
+def test_conflicts_overlapping_stays(engine):
+    assert sorted(engine.conflicts(101, date(2026, 3, 4), date(2026, 3, 11))) == [1, 2]
+    assert engine.conflicts(101, date(2026, 3, 2), date(2026, 3, 3)) == [1]
+    assert engine.conflicts(201, date(2026, 3, 1), date(2026, 3, 31)) == []
+
+
+def test_check_out_day_is_free_for_next_check_in(engine):
+    # Период [заезд, выезд): выезд 5-го не мешает заезду 5-го и наоборот
+    assert engine.is_free(101, date(2026, 3, 5), date(2026, 3, 10))
+    assert engine.is_free(101, date(2026, 2, 25), date(2026, 3, 1))
+    assert not engine.is_free(101, date(2026, 3, 4), date(2026, 3, 6))
+
+
+def test_conflicts_exclude_edited_booking(engine):
+    assert engine.conflicts(101, date(2026, 3, 2), date(2026, 3, 6), exclude_id=1) == []
+
+
+def test_free_rooms(engine):
+    free = engine.free_rooms(date(2026, 3, 3), date(2026, 3, 10))
+    assert [room[0] for room in free] == [201]
+    # Номер 102 освобождается 4-го, номер 101 - 5-го
+    free = engine.free_rooms(date(2026, 3, 4), date(2026, 3, 10))
+    assert [room[0] for room in free] == [102, 201]
+    free = engine.free_rooms(date(2026, 3, 5), date(2026, 3, 10))
+    assert [room[0] for room in free] == [101, 102, 201]
+
+
+def test_cancelled_booking_frees_room(engine):
+    FakeConnector.changed = [(1, 'Иванов', 101, date(2026, 3, 1), date(2026, 3, 5), 'cancelled', UPDATED)]
+    engine.apply_events([ChangeEvent('occupancy', 'U', 1, 101)])
+    assert engine.is_free(101, date(2026, 3, 1), date(2026, 3, 5))
+    assert not engine.is_free(101, date(2026, 3, 10), date(2026, 3, 11))
+
+
+def test_deleted_booking_is_not_restored(engine):
+    engine.apply_events([ChangeEvent('occupancy', 'D', 3, 102)])
+    assert engine.is_free(102, date(2026, 3, 3), date(2026, 3, 4))
+    # Полная загрузка, прочитанная до удаления, не возвращает бронь
+    engine.load()
+    assert engine.is_free(102, date(2026, 3, 3), date(2026, 3, 4))
+
+
+def test_removal_shrinks_max_ends():
+    stays = _RoomStays()
+    long_stay = (date(2026, 3, 1), date(2026, 3, 31), 1)
+    stays.set([long_stay, (date(2026, 3, 2), date(2026, 3, 3), 2), (date(2026, 3, 20), date(2026, 3, 21), 3)])
+    assert stays.max_ends == [date(2026, 3, 31)] * 3
+    assert stays.overlapping(date(2026, 3, 10), date(2026, 3, 12)) == [1]
+
+    stays.remove(long_stay)
+    assert stays.max_ends == [date(2026, 3, 3), date(2026, 3, 21)]
+    assert stays.overlapping(date(2026, 3, 10), date(2026, 3, 12)) == []
+    assert stays.overlapping(date(2026, 3, 2), date(2026, 3, 21)) == [3, 2]
+
+
+def test_add_keeps_stays_sorted():
+    stays = _RoomStays()
+    stays.add((date(2026, 3, 10), date(2026, 3, 12), 2))
+    stays.add((date(2026, 3, 1), date(2026, 3, 15), 1))
+    assert [stay[2] for stay in stays.stays] == [1, 2]
+    assert stays.max_ends == [date(2026, 3, 15), date(2026, 3, 15)]
+    assert stays.overlapping(date(2026, 3, 12), date(2026, 3, 13)) == [1]
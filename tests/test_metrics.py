@@ -0,0 +1,29 @@
+from hotel_management.database.metrics import FINGERPRINT_CACHE_CHARS, QueryMetrics, fingerprint
+
+
+def test_literals_and_whitespace_are_normalized():
+    assert fingerprint("SELECT *  FROM guests\n WHERE full_name = 'O''Brien' AND age > 30") == \
+        "SELECT * FROM guests WHERE full_name = ? AND age > ?"
+
+
+def test_prepared_statements_group_by_name():
+    assert fingerprint("EXECUTE booking_get_changed ('2026-01-01')") == "EXECUTE booking_get_changed"
+
+
+def test_multi_row_values_collapse_to_one_row():
+    two = fingerprint("INSERT INTO cleaning (room_id, completed) VALUES (101, FALSE), (102, FALSE)")
+    many = fingerprint("INSERT INTO cleaning (room_id, completed) VALUES "
+                       + ", ".join(f"(nextval('seq'), {room}, NULL)" for room in range(500)))
+    assert two == "INSERT INTO cleaning (room_id, completed) VALUES (?, ?), ..."
+    assert many == "INSERT INTO cleaning (room_id, completed) VALUES (nextval(?), ?, ?), ..."
+
+
+def test_long_queries_share_stats_entry():
+    stats = QueryMetrics()
+    for rows in (10, 5000):
+        query = "INSERT INTO guests (full_name) VALUES " + ", ".join(["('guest')"] * rows)
+        stats.record_execute(query, 0.0, 0.001, rows)
+    assert len(query) > FINGERPRINT_CACHE_CHARS
+    [entry] = stats.snapshot()
+    assert entry['query'] == "INSERT INTO guests (full_name) VALUES (?), ..."
+    assert entry['calls'] == 2 and entry['rows'] == 5010
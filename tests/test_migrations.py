@@ -0,0 +1,88 @@
+import pytest
+from hotel_management.database.migrations import Migrator, SchemaDriftError, migrator
+
+
+class FakeCursor:
+    """Отвечает на запросы проверки объектов: существуют все имена, кроме missing"""
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.rows = []
+
+    def execute(self, query, params):
+        self.rows = [(name,) for name in params[0] if name not in self.missing]
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def directory(tmp_path):
+    (tmp_path / '0001_rooms.sql').write_text(
+        "CREATE TABLE IF NOT EXISTS rooms (room_id SERIAL PRIMARY KEY);\n"
+        "CREATE INDEX IF NOT EXISTS idx_rooms_old ON rooms (room_id);\n", encoding='utf-8')
+    (tmp_path / '0002_rooms_floor.sql').write_text(
+        "-- CREATE TABLE commented_out (id INT);\n"
+        "ALTER TABLE rooms ADD COLUMN IF NOT EXISTS floor INTEGER;\n"
+        "DROP INDEX IF EXISTS idx_rooms_old;\n"
+        "CREATE INDEX IF NOT EXISTS idx_rooms_floor ON rooms (floor);\n", encoding='utf-8')
+    return tmp_path
+
+
+def applied_from(migrations):
+    return {migration.version: (migration.name, migration.checksum) for migration in migrations}
+
+
+def test_discover_orders_versions(directory):
+    migrations = Migrator(directory).discover()
+    assert [(migration.version, migration.name) for migration in migrations] == [(1, 'rooms'), (2, 'rooms_floor')]
+
+
+def test_checksum_ignores_line_endings(directory):
+    before = Migrator(directory).discover()
+    path = directory / '0001_rooms.sql'
+    path.write_bytes(path.read_bytes().replace(b'\n', b'\r\n'))
+    assert Migrator(directory).discover()[0].checksum == before[0].checksum
+
+
+def test_applied_migrations_match(directory):
+    migrations = Migrator(directory).discover()
+    Migrator(directory)._check_applied(applied_from(migrations), migrations)
+
+
+def test_changed_migration_is_drift(directory):
+    applied = applied_from(Migrator(directory).discover())
+    path = directory / '0001_rooms.sql'
+    path.write_text(path.read_text(encoding='utf-8') + "ALTER TABLE rooms ADD COLUMN note TEXT;\n", encoding='utf-8')
+    migrations = Migrator(directory).discover()
+    with pytest.raises(SchemaDriftError, match='0001_rooms изменена'):
+        Migrator(directory)._check_applied(applied, migrations)
+
+
+def test_unknown_applied_version_is_drift(directory):
+    migrations = Migrator(directory).discover()
+    applied = applied_from(migrations)
+    applied[3] = ('future', 'checksum')
+    with pytest.raises(SchemaDriftError, match=r'неизвестные приложению: \[3\]'):
+        Migrator(directory)._check_applied(applied, migrations)
+
+
+def test_missing_version_file(directory):
+    (directory / '0002_rooms_floor.sql').rename(directory / '0003_rooms_floor.sql')
+    with pytest.raises(SchemaDriftError, match='0002'):
+        Migrator(directory).discover()
+
+
+def test_check_objects_expects_created_and_not_dropped(directory):
+    migrations = Migrator(directory).discover()
+    Migrator(directory)._check_objects(FakeCursor(), migrations)
+
+    with pytest.raises(SchemaDriftError) as error:
+        Migrator(directory)._check_objects(FakeCursor(missing={'rooms.floor', 'idx_rooms_floor'}), migrations)
+    message = str(error.value)
+    assert 'rooms.floor' in message and 'idx_rooms_floor' in message
+    assert 'idx_rooms_old' not in message and 'commented_out' not in message
+
+
+def test_repository_migrations_are_consistent():
+    migrations = migrator.discover()
+    migrator._check_applied(applied_from(migrations), migrations)
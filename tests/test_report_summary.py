@@ -0,0 +1,28 @@
+from datetime import date
+from hotel_management.ui.reports.report_manager import ReportManager
+
+# День, ночи, заезды, выезды, отмены, запрошено уборок, выполнено, замеров времени уборки, сумма секунд
+DAYS = [
+    (date(2026, 1, 30), 5, 2, 1, 0, 3, 2, 2, 7200),
+    (date(2026, 1, 31), 10, 1, 0, 1, 1, 1, 0, 0),
+    (date(2026, 2, 1), 0, 0, 0, 0, 0, 0, 0, 0)
+]
+
+
+def test_daily_rows_and_total():
+    records = ReportManager.summarize(DAYS, 10)
+    assert [record[0] for record in records] == ['30.01.2026', '31.01.2026', '01.02.2026', 'Итого']
+    assert records[0] == ('30.01.2026', 5, '50.0', 2, 1, 0, 3, 2, '1.0')
+    assert records[2][8] == '-'
+    assert records[-1] == ('Итого', 15, '50.0', 3, 1, 1, 4, 3, '1.0')
+
+
+def test_monthly_rows():
+    records = ReportManager.summarize(DAYS, 10, by_month=True)
+    assert [(record[0], record[1], record[2]) for record in records] == [
+        ('01.2026', 15, '75.0'), ('02.2026', 0, '0.0'), ('Итого', 15, '50.0')]
+
+
+def test_no_rooms_and_no_days():
+    assert ReportManager.summarize(DAYS[:1], 0)[0][2] == '-'
+    assert ReportManager.summarize([], 10) == []